@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Benchmark compressed transfer against a local compressing stub server.
+
+Starts a stub on localhost that serves a synthetic feed page honouring
+`Accept-Encoding`, optionally throttled to a given bandwidth, then fetches
+it with each encoding through the scripts' own read path (chunked,
+incremental decompression). Reports bytes on the wire and latency.
+
+Usage:
+    python scripts/benchmark_compression.py
+    python scripts/benchmark_compression.py --posts 500 --bandwidth 20 --requests 10
+"""
+
+import argparse
+import gzip
+import json
+import random
+import statistics
+import threading
+import time
+import urllib.request
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import compression
+from profiling import add_profile_arguments, start_profiling
+
+WORDS = ("agent skill moltbook hunt feed post karma submolt openclaw build share launch "
+         "puzzle backend worker python node source clue solve register endpoint").split()
+
+
+def synthetic_feed(posts: int) -> bytes:
+    """A feed page shaped like the API's, with varied but realistic text."""
+    rng = random.Random(posts)
+    # Mix in made-up words so the text is not unrealistically repetitive
+    vocabulary = WORDS + ["".join(rng.choice("etaoinshrdlucmfwyp") for _ in range(rng.randint(3, 9)))
+                          for _ in range(2000)]
+    items = []
+    for i in range(posts):
+        words = [rng.choice(vocabulary) for _ in range(rng.randint(40, 120))]
+        items.append({
+            "id": f"post{i:06d}",
+            "title": " ".join(words[:8]).capitalize(),
+            "content": " ".join(words),
+            "author": {"id": f"agent{i % 97}", "username": f"Agent{i % 97}"},
+            "submolt": "m/general",
+            "upvotes": rng.randint(0, 500),
+            "comment_count": rng.randint(0, 40),
+            "url": f"https://moltbook.com/post/post{i:06d}",
+            "created_at": f"2026-10-{1 + i % 28:02d}T{i % 24:02d}:{i % 60:02d}:00Z",
+        })
+    return json.dumps({"posts": items, "pagination": {"next": "cursor"}}).encode('utf-8')
+
+
+def encode_variants(body: bytes) -> dict:
+    variants = {
+        "identity": body,
+        "gzip": gzip.compress(body, compresslevel=6),
+        "deflate": zlib.compress(body, 6),
+    }
+    if compression.brotli is not None:
+        variants["br"] = compression.brotli.compress(body, quality=5)
+    return variants
+
+
+def make_server(variants: dict, bandwidth_mbit: float):
+    wire = {"bytes": 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            accepted = [part.split(";")[0].strip() for part in self.headers.get("Accept-Encoding", "").split(",")]
+            encoding = next((name for name in accepted if name in variants and name != "identity"), "identity")
+            payload = variants[encoding]
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            if encoding != "identity":
+                self.send_header("Content-Encoding", encoding)
+            self.end_headers()
+            with lock:
+                wire["bytes"] += len(payload)
+
+            # Emulate a slower link by pacing 16KB writes
+            chunk = 16 * 1024
+            per_chunk = chunk * 8 / (bandwidth_mbit * 1e6) if bandwidth_mbit else 0
+            for start in range(0, len(payload), chunk):
+                self.wfile.write(payload[start:start + chunk])
+                if per_chunk:
+                    time.sleep(per_chunk)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, wire
+
+
+def measure(url: str, accept: str, requests: int, wire: dict) -> dict:
+    before = wire["bytes"]
+    timings = []
+    for _ in range(requests):
+        req = urllib.request.Request(url, headers={"Accept-Encoding": accept})
+        start = time.perf_counter()
+        body = compression.fetch(req, timeout=60)
+        json.loads(body)
+        timings.append(time.perf_counter() - start)
+    return {
+        "wire_bytes": (wire["bytes"] - before) // requests,
+        "decoded_bytes": len(body),
+        "median_ms": statistics.median(timings) * 1000,
+        "min_ms": min(timings) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark compressed vs uncompressed API reads")
+    parser.add_argument("--posts", type=int, default=200, help="Posts in the served feed page (default: 200)")
+    parser.add_argument("--requests", type=int, default=20, help="Fetches per encoding (default: 20)")
+    parser.add_argument("--bandwidth", type=float, default=50,
+                        help="Simulated link speed in Mbit/s, 0 for unthrottled (default: 50)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    start_profiling(args)
+
+    variants = encode_variants(synthetic_feed(args.posts))
+    server, wire = make_server(variants, args.bandwidth)
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1/feed"
+
+    results = {}
+    try:
+        for encoding in variants:
+            results[encoding] = measure(url, encoding, args.requests, wire)
+    finally:
+        server.shutdown()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    link = f"{args.bandwidth:g} Mbit/s" if args.bandwidth else "unthrottled"
+    print(f"Feed page of {args.posts} posts, {args.requests} fetches per encoding, {link}\n")
+    print(f"{'encoding':<10} {'wire bytes':>11} {'saved':>7} {'median ms':>10} {'min ms':>8}")
+    identity = results["identity"]
+    for encoding, r in results.items():
+        saved = 1 - r["wire_bytes"] / identity["wire_bytes"]
+        print(f"{encoding:<10} {r['wire_bytes']:11,d} {saved:7.0%} {r['median_ms']:10.1f} {r['min_ms']:8.1f}")
+    if compression.brotli is None:
+        print("\n  brotli: skipped (pip install brotli to enable)")
+    print(f"\nRequests from the scripts send: Accept-Encoding: {compression.ACCEPT_ENCODING}")
+
+
+if __name__ == "__main__":
+    main()
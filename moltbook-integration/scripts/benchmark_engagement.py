@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark the engagement store against JSON Lines snapshots.
+
+Snapshots the same synthetic posts (see synthetic_data.py) repeatedly as
+their counts grow, writing each snapshot both to an EngagementStore and as
+JSON Lines. Reports bytes per observation, append time per snapshot, and
+the time to read every post's curve over the whole window, decoded with
+numpy and in pure Python when numpy is installed.
+
+Usage:
+    python scripts/benchmark_engagement.py
+    python scripts/benchmark_engagement.py --posts 10000 --hours 24 --interval 15
+"""
+
+import argparse
+import gzip
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import engagement
+from engagement import EngagementStore
+from profiling import add_profile_arguments, start_profiling
+from synthetic_data import SyntheticCorpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the engagement time-series store")
+    parser.add_argument("--posts", type=int, default=10000, help="Posts per snapshot (default: 10000)")
+    parser.add_argument("--hours", type=float, default=24, help="Window covered (default: 24)")
+    parser.add_argument("--interval", type=float, default=15, help="Minutes between snapshots (default: 15)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (default: 42)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    start_profiling(args)
+
+    rng = random.Random(args.seed)
+    posts = list(SyntheticCorpus(args.posts, seed=args.seed).iter_posts())
+    snapshots = int(args.hours * 60 / args.interval)
+    start_at = time.time() - args.hours * 3600
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = EngagementStore(Path(tmp) / "store")
+        jsonl_path = Path(tmp) / "snapshots.jsonl"
+        append_time = 0.0
+        with open(jsonl_path, 'w') as jsonl:
+            for i in range(snapshots):
+                at = start_at + i * args.interval * 60
+                for post in posts:
+                    # Popular posts keep gaining; most barely move between snapshots
+                    if rng.random() < 0.3:
+                        gain = int(rng.expovariate(1.0) * (1 + post['upvotes'] / 50))
+                        post['upvotes'] += gain
+                        post['comment_count'] += int(gain * rng.uniform(0, 0.3))
+                started = time.perf_counter()
+                store.append(posts, at=at)
+                append_time += time.perf_counter() - started
+                jsonl.write("".join(json.dumps({"id": post['id'], "upvotes": post['upvotes'],
+                                                "comment_count": post['comment_count'], "at": at}) + "\n"
+                                    for post in posts))
+
+        observations = snapshots * len(posts)
+        store_bytes = store.stats()["bytes"] + (store.path / "keys.txt").stat().st_size
+        jsonl_bytes = jsonl_path.stat().st_size
+        gzip_bytes = len(gzip.compress(jsonl_path.read_bytes(), 6))
+
+        reads = {}
+        modes = [("numpy", engagement.numpy), ("python", None)] if engagement.numpy is not None else [("python", None)]
+        numpy_module = engagement.numpy
+        for name, module in modes:
+            engagement.numpy = module
+            started = time.perf_counter()
+            series = EngagementStore(store.path).read(since=start_at)
+            reads[name] = time.perf_counter() - started
+            assert len(series) == len(posts)
+        engagement.numpy = numpy_module
+
+        started = time.perf_counter()
+        with open(jsonl_path, 'r') as f:
+            curves = {}
+            for line in f:
+                record = json.loads(line)
+                curves.setdefault(record['id'], []).append((record['at'], record['upvotes'], record['comment_count']))
+        reads["jsonl"] = time.perf_counter() - started
+
+    result = {
+        "posts": len(posts),
+        "snapshots": snapshots,
+        "observations": observations,
+        "store_bytes_per_observation": store_bytes / observations,
+        "jsonl_bytes_per_observation": jsonl_bytes / observations,
+        "jsonl_gzip_bytes_per_observation": gzip_bytes / observations,
+        "append_ms_per_snapshot": append_time / snapshots * 1000,
+        "read_all_seconds": reads,
+    }
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    print(f"{len(posts):,} posts × {snapshots} snapshots = {observations:,} observations\n")
+    print(f"{'format':<14} {'bytes/obs':>10} {'total MB':>9}")
+    for name, per in (("store", result["store_bytes_per_observation"]),
+                      ("jsonl", result["jsonl_bytes_per_observation"]),
+                      ("jsonl.gz", result["jsonl_gzip_bytes_per_observation"])):
+        print(f"{name:<14} {per:10.2f} {per * observations / 1e6:9.1f}")
+    print(f"\nAppend: {result['append_ms_per_snapshot']:.1f}ms per {len(posts):,}-post snapshot")
+    print(f"Read every curve over {args.hours:g}h: " +
+          ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in reads.items()))
+
+
+if __name__ == "__main__":
+    main()
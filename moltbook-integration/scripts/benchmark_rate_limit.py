@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark many agent processes sharing one API key's rate limit.
+
+Starts a local stub that enforces a requests/minute limit with 429s, then
+runs N processes that each make the same number of requests, first with
+per-process pacing and then drawing from the shared host-wide bucket.
+Reports completed requests, 429 responses, failed requests and throughput.
+
+Usage:
+    python scripts/benchmark_rate_limit.py
+    python scripts/benchmark_rate_limit.py --processes 10 --requests 30 --server-limit 1200
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+import urllib.error
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from profiling import add_profile_arguments, start_profiling
+from rate_store import RATE_STORE_ENV
+from scheduler import DEFAULT_BURST, RATE_LIMIT_ENV, TokenBucket
+
+MODES = ("per-process", "shared")
+
+
+def make_server(per_minute: float):
+    """Stub API enforcing `per_minute` like the real one: 429 once the budget is spent."""
+    bucket = TokenBucket(per_minute, DEFAULT_BURST)
+    lock = threading.Lock()
+    counts = {"ok": 0, "limited": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            with lock:
+                allowed = bucket.try_take() <= 0
+                counts["ok" if allowed else "limited"] += 1
+            body = b'{"posts": []}' if allowed else b'{"error": "Rate limit exceeded"}'
+            self.send_response(200 if allowed else 429)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, counts
+
+
+def worker(api_url: str, env: dict, requests: int, results):
+    os.environ.update(env)
+    # Import after the environment is set: the scheduler reads it on first use
+    import moltbook_api
+    moltbook_api.MOLTBOOK_API = api_url
+    failed = 0
+    for _ in range(requests):
+        try:
+            moltbook_api.api_request("GET", "/feed", "benchmark-key")
+        except urllib.error.HTTPError:
+            failed += 1
+    results.put(failed)
+
+
+def run(mode: str, api_url: str, processes: int, requests: int, client_limit: float, counts: dict) -> dict:
+    env = {RATE_LIMIT_ENV: str(client_limit)}
+    with tempfile.TemporaryDirectory() as tmp:
+        env[RATE_STORE_ENV] = os.path.join(tmp, "ratelimit.sqlite") if mode == "shared" else "none"
+        before = dict(counts)
+        results = multiprocessing.Queue()
+        start = time.perf_counter()
+        procs = [multiprocessing.Process(target=worker, args=(api_url, env, requests, results))
+                 for _ in range(processes)]
+        for proc in procs:
+            proc.start()
+        failed = sum(results.get() for _ in procs)
+        for proc in procs:
+            proc.join()
+        elapsed = time.perf_counter() - start
+
+    ok = counts["ok"] - before["ok"]
+    return {
+        "mode": mode,
+        "seconds": elapsed,
+        "completed": ok,
+        "responses_429": counts["limited"] - before["limited"],
+        "failed": failed,
+        "requests_per_minute": ok / elapsed * 60 if elapsed else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-process vs shared rate limiting")
+    parser.add_argument("--processes", type=int, default=8, help="Agent processes (default: 8)")
+    parser.add_argument("--requests", type=int, default=25, help="Requests per process (default: 25)")
+    parser.add_argument("--server-limit", type=float, default=1200,
+                        help="Stub's requests/minute limit (default: 1200, scaled up from 100 to keep runs short)")
+    parser.add_argument("--modes", default="per-process,shared", help="Comma-separated: per-process, shared")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    start_profiling(args)
+
+    server, counts = make_server(args.server_limit)
+    api_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    # The same 90% margin the scripts keep below the real 100/minute
+    client_limit = args.server_limit * 0.9
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip() in MODES]
+    try:
+        results = [run(mode, api_url, args.processes, args.requests, client_limit, counts) for mode in modes]
+    finally:
+        server.shutdown()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{args.processes} processes × {args.requests} requests, server limit {args.server_limit:g}/min, "
+          f"clients pace at {client_limit:g}/min\n")
+    print(f"{'mode':<12} {'seconds':>8} {'completed':>10} {'429s':>6} {'failed':>7} {'req/min':>8}")
+    for r in results:
+        print(f"{r['mode']:<12} {r['seconds']:8.1f} {r['completed']:10d} {r['responses_429']:6d} "
+              f"{r['failed']:7d} {r['requests_per_minute']:8.0f}")
+
+
+if __name__ == "__main__":
+    main()
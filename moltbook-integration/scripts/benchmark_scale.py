@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Benchmark local handling of `posts` payloads at 10k/100k/1M posts.
+
+Generates a synthetic corpus (see synthetic_data.py) as API-shaped feed
+pages, then runs each read path over it in a fresh process:
+
+    decode       json.loads of each page, keeping every post (as the scripts do)
+    text         read_feed text listing (render + batched writes)
+    ndjson       read_feed --format ndjson
+    json         read_feed --format json
+    search       search.py result rendering
+    merge        multi-submolt heap merge by created_at (merge_feeds)
+    rules        keyword rules over title + content (1,000+ patterns)
+    profiles     author profile enrichment from a warm cache
+    index        related-post TF-IDF indexing
+
+For each it reports throughput, per-page latency (p50/p99) and memory:
+`data` is the loaded posts' footprint and `peak` the process high-water
+mark, both above the interpreter baseline. Output goes to /dev/null.
+
+Usage:
+    python scripts/benchmark_scale.py
+    python scripts/benchmark_scale.py --sizes 10k,100k --stages decode,text,rules
+    python scripts/benchmark_scale.py --sizes 1m --page-size 50 --json
+"""
+
+import argparse
+import heapq
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from profiling import add_profile_arguments, start_profiling
+from synthetic_data import TOPICS, SyntheticCorpus
+
+STAGES = ("decode", "text", "ndjson", "json", "search", "merge", "rules", "profiles", "index")
+DEFAULT_SIZES = "10k,100k,1m"
+
+
+def parse_size(text: str) -> int:
+    text = text.strip().lower()
+    scale = {"k": 1000, "m": 1000000}.get(text[-1:], 1)
+    return int(float(text.rstrip("km")) * scale)
+
+
+def rss_mb() -> float:
+    """Current resident set size (Linux), else the high-water mark."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError, AttributeError):
+        return peak_mb()
+
+
+def peak_mb() -> float:
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # KiB on Linux, bytes on macOS
+    return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+
+def write_pages(path: Path, size: int, page_size: int, seed: int):
+    """Write the corpus as one API feed page per line."""
+    corpus = SyntheticCorpus(size, seed=seed)
+    with open(path, "w") as f:
+        for page in corpus.iter_pages(page_size):
+            f.write(json.dumps(page) + "\n")
+
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+def build_stage(stage: str, posts: list):
+    """Per-page function for a stage (or None for whole-corpus stages)."""
+    from output import write_json, write_text
+    from profile_cache import ProfileCache
+    from read_feed import print_posts
+    from related import TfidfIndex
+    from rules import RuleEngine, RuleRunner, apply_rules
+    from search import render_result
+
+    if stage == "text":
+        return lambda page: print_posts("Feed", page)
+    if stage == "ndjson":
+        return lambda page: print_posts("Feed", page, fmt="ndjson")
+    if stage == "json":
+        return lambda page: write_json({"posts": page})
+    if stage == "search":
+        return lambda page: write_text(render_result(i, post) for i, post in enumerate(page, 1))
+    if stage == "rules":
+        words = list(dict.fromkeys(word for post in posts[:5000] for word in post["content"].split()))
+        engine = RuleEngine([
+            {"name": "topics", "patterns": list(TOPICS), "action": "upvote"},
+            {"name": "vocabulary", "patterns": words[:1000], "action": "comment", "template": "Nice {keyword}!"},
+            {"name": "spam", "patterns": ["airdrop", "giveaway"], "action": "ignore"},
+        ])
+        runner = RuleRunner(engine, apply=False)
+        return lambda page: apply_rules(runner, page)
+    if stage == "profiles":
+        cache = ProfileCache("benchmark", path=None)
+        expires = time.time() + 3600
+        for post in posts:
+            username = post["author"]["username"]
+            cache.entries[username] = (expires, {"username": username, "karma": len(username)})
+        return cache.enrich
+    if stage == "index":
+        index = TfidfIndex()
+        return lambda page: [index.add(post["id"], f"{post.get('title', '')}\n{post['content']}") for post in page]
+    return None
+
+
+def run_stage(pages_path: str, stage: str, page_size: int, results):
+    """Run one stage in this (fresh) process and put its measurements on `results`."""
+    baseline = rss_mb()
+    sys.stdout = open(os.devnull, "w")
+
+    decode_times = []
+    posts = []
+    with open(pages_path) as f:
+        for line in f:
+            start = time.perf_counter()
+            page = json.loads(line)
+            decode_times.append(time.perf_counter() - start)
+            posts.extend(page["posts"])
+    data = rss_mb() - baseline
+
+    if stage == "decode":
+        times = decode_times
+    elif stage == "merge":
+        by_submolt = {}
+        for post in posts:
+            by_submolt.setdefault(post["submolt"], []).append(post)
+        from moltbook_api import created_at_key
+        start = time.perf_counter()
+        merged = heapq.merge(*by_submolt.values(), key=created_at_key, reverse=True)
+        seen = set()
+        count = sum(1 for post in merged if not (post["id"] in seen or seen.add(post["id"])))
+        times = [time.perf_counter() - start]
+        assert count == len(posts)
+    else:
+        handle = build_stage(stage, posts)
+        times = []
+        for offset in range(0, len(posts), page_size):
+            page = posts[offset:offset + page_size]
+            start = time.perf_counter()
+            handle(page)
+            times.append(time.perf_counter() - start)
+    sys.stdout.flush()
+
+    total = sum(times)
+    per_page = stage != "merge"
+    results.put({
+        "stage": stage,
+        "posts": len(posts),
+        "seconds": total,
+        "posts_per_second": len(posts) / total if total else 0.0,
+        "p50_ms": percentile(times, 0.5) * 1000 if per_page else None,
+        "p99_ms": percentile(times, 0.99) * 1000 if per_page else None,
+        "data_mb": data,
+        "peak_mb": peak_mb() - baseline,
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark read paths over synthetic corpora at scale")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"Comma-separated corpus sizes (default: {DEFAULT_SIZES})")
+    parser.add_argument("--stages", default=",".join(STAGES), help="Comma-separated stages (default: all)")
+    parser.add_argument("--page-size", type=int, default=50, help="Posts per API page (default: 50)")
+    parser.add_argument("--seed", type=int, default=42, help="Corpus seed (default: 42)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    start_profiling(args)
+
+    sizes = [parse_size(size) for size in args.sizes.split(",") if size.strip()]
+    stages = [stage.strip() for stage in args.stages.split(",") if stage.strip()]
+    unknown = [stage for stage in stages if stage not in STAGES]
+    if unknown:
+        print(f"Error: Unknown stage(s): {', '.join(unknown)}", file=sys.stderr)
+        sys.exit(1)
+
+    # Fresh interpreters, so each stage's memory is its own
+    context = multiprocessing.get_context("spawn")
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            pages_path = Path(tmp) / f"pages-{size}.ndjson"
+            start = time.perf_counter()
+            write_pages(pages_path, size, args.page_size, args.seed)
+            print(f"✓ Generated {size:,} posts in {time.perf_counter() - start:.1f}s "
+                  f"({pages_path.stat().st_size / 1e6:.0f} MB of JSON)", file=sys.stderr)
+            for stage in stages:
+                queue = context.Queue()
+                proc = context.Process(target=run_stage, args=(str(pages_path), stage, args.page_size, queue))
+                proc.start()
+                result = queue.get()
+                proc.join()
+                result["size"] = size
+                results.append(result)
+                if not args.json:
+                    print(f"  {stage}: {result['posts_per_second']:,.0f} posts/s", file=sys.stderr)
+            pages_path.unlink()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    def ms(value):
+        return f"{value:8.2f}" if value is not None else f"{'-':>8}"
+
+    print(f"\n{'size':>9} {'stage':<9} {'posts/s':>11} {'p50 ms':>8} {'p99 ms':>8} {'data MB':>8} {'peak MB':>8}")
+    for r in results:
+        print(f"{r['size']:9,d} {r['stage']:<9} {r['posts_per_second']:11,.0f} {ms(r['p50_ms'])} {ms(r['p99_ms'])} "
+              f"{r['data_mb']:8.0f} {r['peak_mb']:8.0f}")
+    print(f"\nLatency is per {args.page_size}-post page; merge is one pass over the whole corpus.")
+
+
+if __name__ == "__main__":
+    main()
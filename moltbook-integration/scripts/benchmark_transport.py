@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Compare HTTP/1.1 (urllib) and HTTP/2 (httpx) under concurrent requests.
+
+Fires the same batch of concurrent GETs through each transport and reports
+wall time, throughput, latency percentiles, the number of TCP connections
+opened and the protocol the server actually spoke.
+
+Usage:
+    python scripts/benchmark_transport.py
+    python scripts/benchmark_transport.py --path /feed --requests 200 --concurrency 50
+    python scripts/benchmark_transport.py --path /users/SomeAgent --transports http2 --json
+"""
+
+import argparse
+import json
+import socket
+import sys
+import threading
+import time
+import urllib.error
+from concurrent.futures import ThreadPoolExecutor
+
+import h2_transport
+import moltbook_api
+from moltbook_api import api_request, resolve_api_key
+from profiling import add_profile_arguments, start_profiling
+
+TRANSPORTS = ("http1", "http2")
+
+
+class ConnectionCounter:
+    """Count TCP connections opened (urllib and httpx both use socket.create_connection)."""
+
+    def __init__(self):
+        self.count = 0
+        self.lock = threading.Lock()
+        self.original = socket.create_connection
+
+    def __enter__(self):
+        def counting(*args, **kwargs):
+            with self.lock:
+                self.count += 1
+            return self.original(*args, **kwargs)
+        socket.create_connection = counting
+        return self
+
+    def __exit__(self, *exc):
+        socket.create_connection = self.original
+
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+def run(transport_name: str, path: str, api_key: str, requests: int, concurrency: int) -> dict:
+    transport = h2_transport.Http2Transport() if transport_name == "http2" else None
+    moltbook_api.use_transport(transport)
+    latencies = []
+    errors = []
+
+    def one(_):
+        start = time.perf_counter()
+        try:
+            api_request("GET", path, api_key, max_retries=1)
+        except (urllib.error.URLError, ValueError) as e:
+            errors.append(str(e))
+            return
+        latencies.append(time.perf_counter() - start)
+
+    try:
+        with ConnectionCounter() as connections:
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                list(pool.map(one, range(requests)))
+            elapsed = time.perf_counter() - start
+    finally:
+        if transport is not None:
+            transport.close()
+        moltbook_api.use_transport(None)
+
+    return {
+        "transport": transport_name,
+        "protocols": transport.versions if transport is not None else {"HTTP/1.1": len(latencies)},
+        "requests": requests,
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+        "seconds": elapsed,
+        "requests_per_second": requests / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 0.5) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "connections": connections.count,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTTP/1.1 vs HTTP/2 for the Moltbook API")
+    parser.add_argument("--path", default="/feed", help="API path to GET (default: /feed)")
+    parser.add_argument("--requests", type=int, default=100, help="Requests per transport (default: 100)")
+    parser.add_argument("--concurrency", type=int, default=25, help="Concurrent requests (default: 25)")
+    parser.add_argument("--transports", default="http1,http2", help="Comma-separated: http1, http2")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--api-key", help="API key (defaults to credentials.json)")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    start_profiling(args)
+
+    names = [name.strip() for name in args.transports.split(",") if name.strip()]
+    unknown = [name for name in names if name not in TRANSPORTS]
+    if unknown:
+        print(f"Error: Unknown transport(s): {', '.join(unknown)}", file=sys.stderr)
+        sys.exit(1)
+    if "http2" in names and not h2_transport.http2_available():
+        print('⚠ httpx[http2] is not installed; skipping http2 (pip install "httpx[http2]")', file=sys.stderr)
+        names.remove("http2")
+    if not names:
+        sys.exit(1)
+
+    api_key = resolve_api_key(args.api_key)
+    # Measure the transports, not the request budget
+    moltbook_api.use_scheduler(None)
+    results = [run(name, args.path, api_key, args.requests, args.concurrency) for name in names]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"GET {args.path} × {args.requests}, {args.concurrency} concurrent\n")
+    print(f"{'transport':<10} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'conns':>6} {'errors':>7}  protocol")
+    for r in results:
+        protocols = ", ".join(f"{name} ×{count}" for name, count in r["protocols"].items())
+        print(f"{r['transport']:<10} {r['requests_per_second']:8.1f} {r['p50_ms']:8.0f} {r['p95_ms']:8.0f} "
+              f"{r['connections']:6d} {r['errors']:7d}  {protocols}")
+    for r in results:
+        if r["first_error"]:
+            print(f"⚠ {r['transport']}: {r['first_error']}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Record and replay Moltbook API traffic.
+
+Every script talks to the API through `moltbook_api`, which consults
+these environment variables:
+
+    MOLTBOOK_CASSETTE=session.jsonl.gz   cassette file
+    MOLTBOOK_CASSETTE_MODE=record        record (default) or replay
+    MOLTBOOK_REPLAY_SPEED=1              replay latency: 1 = as recorded,
+                                         10 = ten times faster, 0 = instant
+
+A cassette is JSON Lines (gzip-compressed when the name ends in .gz), one
+request/response pair per line with the recorded latency. Authorization
+headers and `api_key` fields in responses are redacted before anything
+is written. In replay mode requests are matched by method, path and body,
+repeated requests are served in recorded order, and nothing touches the
+network.
+
+Usage:
+    MOLTBOOK_CASSETTE=feed.jsonl.gz python scripts/read_feed.py --submolt general,agentskills
+    python scripts/cassette.py show feed.jsonl.gz
+    python scripts/cassette.py replay feed.jsonl.gz --speed 0 -- python scripts/read_feed.py --submolt general,agentskills
+"""
+
+import argparse
+import atexit
+import gzip
+import io
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import deque
+from datetime import datetime, timezone
+from email.message import Message
+
+from compression import read_body
+from profiling import add_profile_arguments, start_profiling
+
+CASSETTE_ENV = "MOLTBOOK_CASSETTE"
+MODE_ENV = "MOLTBOOK_CASSETTE_MODE"
+SPEED_ENV = "MOLTBOOK_REPLAY_SPEED"
+REDACTED = "[redacted]"
+# Response headers worth keeping: the rest is per-request noise
+KEPT_HEADERS = ("Content-Type", "Retry-After", "X-RateLimit-Remaining", "X-RateLimit-Reset")
+# Collapse per-post and per-user paths when summarizing
+ROUTE_PATTERNS = [
+    (re.compile(r"/users/(?!me/)[^/?]+"), "/users/{name}"),
+    (re.compile(r"/posts/[^/?]+"), "/posts/{id}"),
+]
+
+
+class CassetteMiss(urllib.error.URLError):
+    """A replayed request that the cassette has no answer for (never retried)."""
+
+
+def open_cassette(path: str, mode: str):
+    if str(path).endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def read_entries(path: str):
+    """Every line of a cassette, decoded, including the header."""
+    with open_cassette(path, "r") as f:
+        try:
+            for line in f:
+                yield json.loads(line)
+        except EOFError:
+            # A recording cut short has no gzip trailer; everything flushed is intact
+            pass
+
+
+def redact(value):
+    """Copy of a decoded JSON value with every `api_key` field blanked."""
+    if isinstance(value, dict):
+        return {k: REDACTED if k == "api_key" else redact(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [redact(v) for v in value]
+    return value
+
+
+def request_key(method: str, url: str, data: bytes = None) -> tuple:
+    """What replay matches on: method, path with query, and body."""
+    parts = urllib.parse.urlsplit(url)
+    path = parts.path + (f"?{parts.query}" if parts.query else "")
+    return method.upper(), path, (data or b"").decode("utf-8", "replace")
+
+
+def http_error(url: str, status: int, reason: str, headers: dict, body: bytes) -> urllib.error.HTTPError:
+    message = Message()
+    for name, value in (headers or {}).items():
+        message[name] = value
+    return urllib.error.HTTPError(url, status, reason or f"HTTP {status}", message, io.BytesIO(body))
+
+
+class Recorder:
+    """Transport that performs real requests and appends each exchange to a cassette."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self.count = 0
+        # One stream for the whole session: a .gz cassette is a single gzip
+        # member whose dictionary spans every exchange
+        self.file = open_cassette(path, "w")
+        self.file.write(json.dumps({
+            "cassette": 1,
+            "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }) + "\n")
+        self.file.flush()
+        atexit.register(self.close)
+
+    def _write(self, entry: dict):
+        with self.lock:
+            self.file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            # Flush per exchange (a gzip sync flush) so an interrupted session
+            # (watch mode) keeps its traffic
+            self.file.flush()
+            self.count += 1
+
+    def close(self):
+        with self.lock:
+            if not self.file.closed:
+                self.file.close()
+
+    def open(self, req: urllib.request.Request, timeout: float) -> bytes:
+        method, path, body = request_key(req.get_method(), req.full_url, req.data)
+        headers = {name: value for name, value in req.header_items()}
+        if "Authorization" in headers:
+            headers["Authorization"] = f"Bearer {REDACTED}"
+        entry = {"method": method, "path": path, "body": body or None, "headers": headers}
+
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as response:
+                status, response_headers, payload = response.status, response.headers, read_body(response)
+            error = None
+        except urllib.error.HTTPError as e:
+            status, response_headers, payload = e.code, e.headers, read_body(e)
+            error = e
+            entry["reason"] = str(e.reason)
+        except urllib.error.URLError as e:
+            entry.update(elapsed=round(time.perf_counter() - start, 4), error=str(e.reason))
+            self._write(entry)
+            raise
+
+        kept = {name: response_headers[name] for name in KEPT_HEADERS
+                if response_headers and response_headers.get(name)}
+        text = payload.decode("utf-8", "replace")
+        try:
+            text = json.dumps(redact(json.loads(text)), separators=(",", ":"))
+        except ValueError:
+            pass
+        entry.update(elapsed=round(time.perf_counter() - start, 4), status=status,
+                     response_headers=kept, response=text)
+        self._write(entry)
+
+        if error is not None:
+            # The body was consumed for the cassette; hand callers a readable copy
+            raise http_error(req.full_url, status, entry["reason"], kept, payload)
+        return payload
+
+
+class Replayer:
+    """Transport that answers requests from a cassette without touching the network."""
+
+    def __init__(self, path: str, speed: float = 1.0, sleep=time.sleep):
+        self.speed = speed
+        self.sleep = sleep
+        self.lock = threading.Lock()
+        self.queues = {}
+        self.served = 0
+        for entry in read_entries(path):
+            if "method" not in entry:
+                continue
+            key = (entry["method"], entry["path"], entry.get("body") or "")
+            self.queues.setdefault(key, deque()).append(entry)
+
+    def open(self, req: urllib.request.Request, timeout: float) -> bytes:
+        key = request_key(req.get_method(), req.full_url, req.data)
+        with self.lock:
+            queue = self.queues.get(key)
+            if not queue:
+                raise CassetteMiss(f"no recorded response for {key[0]} {key[1]}")
+            # Repeats (polling) replay in recorded order; the last answer sticks
+            entry = queue.popleft() if len(queue) > 1 else queue[0]
+            self.served += 1
+
+        if self.speed > 0:
+            self.sleep(entry.get("elapsed", 0) / self.speed)
+        if "error" in entry:
+            raise urllib.error.URLError(entry["error"])
+        payload = entry.get("response", "").encode("utf-8")
+        if entry["status"] >= 400:
+            raise http_error(req.full_url, entry["status"], entry.get("reason"),
+                             entry.get("response_headers"), payload)
+        return payload
+
+
+def transport_from_env():
+    """Recorder, Replayer or None according to the cassette environment variables."""
+    path = os.environ.get(CASSETTE_ENV)
+    if not path:
+        return None
+    mode = os.environ.get(MODE_ENV, "record").lower()
+    if mode == "replay":
+        return Replayer(path, float(os.environ.get(SPEED_ENV, "1")))
+    if mode == "record":
+        return Recorder(path)
+    raise ValueError(f"{MODE_ENV} must be 'record' or 'replay', not {mode!r}")
+
+
+def show(path: str):
+    """Print a summary of a cassette's traffic by endpoint."""
+    entries = []
+    header = {}
+    for entry in read_entries(path):
+        if "method" in entry:
+            entries.append(entry)
+        else:
+            header = entry
+
+    print(f"Cassette: {path} (recorded {header.get('recorded_at', 'unknown')})")
+    print(f"  {len(entries)} requests, {sum(e.get('elapsed', 0) for e in entries):.2f}s of recorded latency\n")
+
+    by_endpoint = {}
+    for entry in entries:
+        route = entry["path"].split("?", 1)[0]
+        for pattern, replacement in ROUTE_PATTERNS:
+            route = pattern.sub(replacement, route)
+        by_endpoint.setdefault(f"{entry['method']} {route}", []).append(entry)
+    for route, group in sorted(by_endpoint.items(), key=lambda item: -len(item[1])):
+        latencies = sorted(e.get("elapsed", 0) for e in group)
+        failed = sum(1 for e in group if "error" in e or e.get("status", 200) >= 400)
+        print(f"  {len(group):4d} × {route:<40s} median {latencies[len(latencies) // 2] * 1000:6.0f}ms  "
+              f"max {latencies[-1] * 1000:6.0f}ms{f'  ({failed} failed)' if failed else ''}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record and replay Moltbook API traffic")
+    commands = parser.add_subparsers(dest="command")
+
+    show_cmd = commands.add_parser("show", help="Summarize a cassette")
+    show_cmd.add_argument("cassette")
+
+    for name, help_text in (("record", "Run a command, recording its API traffic"),
+                            ("replay", "Run a command against a cassette, offline")):
+        cmd = commands.add_parser(name, help=help_text)
+        cmd.add_argument("cassette")
+        if name == "replay":
+            cmd.add_argument("--speed", type=float, default=1.0,
+                             help="Latency speed-up: 1 = as recorded, 0 = instant (default: 1)")
+
+    add_profile_arguments(parser)
+
+    # Everything after "--" is the command to run, options included
+    argv = sys.argv[1:]
+    cmd = argv[argv.index("--") + 1:] if "--" in argv else []
+    args = parser.parse_args(argv[:argv.index("--")] if "--" in argv else argv)
+    start_profiling(args)
+    if args.command == "show":
+        show(args.cassette)
+        return
+    if not args.command:
+        parser.print_help()
+        sys.exit(1)
+
+    if not cmd:
+        print("Error: Give the command to run after --", file=sys.stderr)
+        sys.exit(1)
+    if args.command == "replay" and not os.path.exists(args.cassette):
+        print(f"✗ Cassette not found: {args.cassette}", file=sys.stderr)
+        sys.exit(1)
+
+    env = dict(os.environ, **{CASSETTE_ENV: args.cassette, MODE_ENV: args.command})
+    if args.command == "replay":
+        env[SPEED_ENV] = str(args.speed)
+
+    start = time.perf_counter()
+    code = subprocess.call(cmd, env=env)
+    elapsed = time.perf_counter() - start
+    print(f"{'✓' if code == 0 else '✗'} {args.command.capitalize()}ed in {elapsed:.2f}s "
+          f"(exit {code})", file=sys.stderr)
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
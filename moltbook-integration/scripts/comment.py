@@ -5,59 +5,20 @@ Comment on a post on Moltbook.
 Usage:
     python scripts/comment.py POST_ID "Your comment here"
     python scripts/comment.py --url https://moltbook.com/post/abc123 "Great post!"
+    python scripts/comment.py POST_ID "Your comment" --force    # send even if a near-duplicate or a repeat
     
 Environment:
     MOLTBOOK_API_KEY: Your Moltbook API key (from credentials.json)
 """
 
 import argparse
-import json
 import sys
-from pathlib import Path
-import urllib.request
 import urllib.error
-import time
 
-MOLTBOOK_API = "https://moltbook-api.simeon-garratt.workers.dev/v1"
-CREDENTIALS_PATH = Path.home() / ".config" / "moltbook" / "credentials.json"
-
-
-def load_credentials() -> dict:
-    """Load Moltbook credentials."""
-    if not CREDENTIALS_PATH.exists():
-        print(f"✗ Credentials not found at {CREDENTIALS_PATH}", file=sys.stderr)
-        print("Run register.py first to create an account", file=sys.stderr)
-        sys.exit(1)
-    
-    with open(CREDENTIALS_PATH, 'r') as f:
-        return json.load(f)
-
-
-def retry_request(func, max_retries=3, backoff=2):
-    """Retry request with exponential backoff."""
-    for attempt in range(max_retries):
-        try:
-            return func()
-        except urllib.error.HTTPError as e:
-            if e.code == 429:  # Rate limit
-                if attempt < max_retries - 1:
-                    wait = backoff ** attempt
-                    print(f"⏳ Rate limited. Waiting {wait}s before retry...", file=sys.stderr)
-                    time.sleep(wait)
-                    continue
-                else:
-                    raise
-            else:
-                raise
-        except urllib.error.URLError as e:
-            if attempt < max_retries - 1:
-                wait = backoff ** attempt
-                print(f"⏳ Connection error. Retrying in {wait}s...", file=sys.stderr)
-                time.sleep(wait)
-                continue
-            else:
-                raise
-    raise Exception("Max retries exceeded")
+from journal import ActionJournal, already_done
+from moltbook_api import api_request, resolve_api_key
+from post_store import PostStore, check_duplicate
+from profiling import add_profile_arguments, start_profiling
 
 
 def extract_post_id(url_or_id: str) -> str:
@@ -68,39 +29,27 @@ def extract_post_id(url_or_id: str) -> str:
     return url_or_id
 
 
-def comment_on_post(post_id: str, content: str, api_key: str = None) -> dict:
+def comment_on_post(post_id: str, content: str, api_key: str = None, force: bool = False) -> dict:
     """Comment on a post on Moltbook."""
     
-    if not api_key:
-        creds = load_credentials()
-        api_key = creds.get('api_key')
-    
-    if not api_key:
-        print("✗ No API key found. Register first with register.py", file=sys.stderr)
-        sys.exit(1)
+    api_key = resolve_api_key(api_key)
     
     # Extract post ID from URL if needed
     post_id = extract_post_id(post_id)
     
-    # Prepare payload
-    payload = {"content": content}
-    
-    def make_request():
-        req = urllib.request.Request(
-            f"{MOLTBOOK_API}/posts/{post_id}/comments",
-            data=json.dumps(payload).encode('utf-8'),
-            headers={
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {api_key}",
-                "User-Agent": "moltbook-skill"
-            }
-        )
-        
-        with urllib.request.urlopen(req, timeout=10) as response:
-            return json.loads(response.read().decode('utf-8'))
+    # Don't spend the 30 comments/hour on something we (or others) already said
+    store = PostStore()
+    if check_duplicate(store, content, force):
+        sys.exit(1)
+    # ...or come back to a thread we already answered
+    journal = ActionJournal()
+    if already_done(journal, "comment", post_id, force):
+        sys.exit(1)
     
+    # No retries: a retried comment could be published twice
     try:
-        result = retry_request(make_request)
+        result = api_request("POST", f"/posts/{post_id}/comments", api_key, payload={"content": content},
+                             max_retries=1)
         
         comment_id = result.get('id', 'unknown')
         print(f"✓ Comment posted!")
@@ -108,6 +57,10 @@ def comment_on_post(post_id: str, content: str, api_key: str = None) -> dict:
         print(f"  Comment ID: {comment_id}")
         print(f"  Content: {content[:100]}{'...' if len(content) > 100 else ''}")
         
+        store.add("comment", content, result.get('id'), post_id=post_id,
+                  author=(result.get('author') or {}).get('username'))
+        journal.record("comment", post_id, result.get('id'))
+        
         return result
         
     except urllib.error.HTTPError as e:
@@ -130,7 +83,10 @@ def main():
     parser.add_argument("content", nargs='?', help="Comment content")
     parser.add_argument("--url", help="Post URL (alternative to post_id)")
     parser.add_argument("--api-key", help="API key (defaults to credentials.json)")
+    parser.add_argument("--force", action="store_true", help="Comment even if it is a near-duplicate or we already commented on the post")
+    add_profile_arguments(parser)
     args = parser.parse_args()
+    start_profiling(args)
     
     post_id = args.post_id or args.url
     content = args.content
@@ -140,7 +96,7 @@ def main():
         print("Example: python comment.py POST_ID \"Your comment\"", file=sys.stderr)
         sys.exit(1)
     
-    comment_on_post(post_id, content, args.api_key)
+    comment_on_post(post_id, content, args.api_key, args.force)
 
 
 if __name__ == "__main__":
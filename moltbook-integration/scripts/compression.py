@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Compressed transfer for API responses.
+
+Requests advertise `Accept-Encoding: gzip, deflate` (plus `br` when the
+optional `brotli` package is installed). Responses are read in chunks
+and each chunk is decompressed straight into the body buffer as it
+arrives (uncompressed bodies of known length are read into a buffer
+allocated up front), so a large feed page never sits in memory twice and
+decoding overlaps the transfer.
+"""
+
+import io
+import urllib.error
+import urllib.request
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ACCEPT_ENCODING = "br, gzip, deflate" if brotli is not None else "gzip, deflate"
+CHUNK_SIZE = 64 * 1024
+
+
+class _Deflate:
+    """`deflate` is meant to be zlib-wrapped, but some servers send raw deflate."""
+
+    def __init__(self):
+        self.obj = zlib.decompressobj(zlib.MAX_WBITS)
+        self.started = False
+
+    @property
+    def unconsumed_tail(self) -> bytes:
+        return self.obj.unconsumed_tail
+
+    def decompress(self, data: bytes, max_length: int = 0) -> bytes:
+        if not self.started:
+            self.started = True
+            try:
+                return self.obj.decompress(data, max_length)
+            except zlib.error:
+                self.obj = zlib.decompressobj(-zlib.MAX_WBITS)
+        return self.obj.decompress(data, max_length)
+
+    def flush(self) -> bytes:
+        return self.obj.flush()
+
+
+class _Brotli:
+    # brotli has no output limit; a chunk is always consumed whole
+    unconsumed_tail = b""
+
+    def __init__(self):
+        self.obj = brotli.Decompressor()
+
+    def decompress(self, data: bytes, max_length: int = 0) -> bytes:
+        return self.obj.process(data)
+
+    def flush(self) -> bytes:
+        return b""
+
+
+def decompressor(encoding: str):
+    """Incremental decompressor for a Content-Encoding (None for identity)."""
+    encoding = (encoding or "identity").strip().lower()
+    if encoding == "identity":
+        return None
+    if encoding in ("gzip", "x-gzip"):
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if encoding == "deflate":
+        return _Deflate()
+    if encoding == "br" and brotli is not None:
+        return _Brotli()
+    raise ValueError(f"Unsupported Content-Encoding: {encoding}")
+
+
+def read_body(response) -> bytearray:
+    """Read a urllib response (or HTTPError) into one buffer, decompressing chunk by chunk."""
+    encoding = response.headers.get("Content-Encoding") if response.headers else None
+    decoder = decompressor(encoding)
+    length = response.headers.get("Content-Length") if response.headers else None
+    if decoder is None and length and length.isdigit():
+        # Size known up front: read straight into the final buffer
+        body = bytearray(int(length))
+        with memoryview(body) as view:
+            filled = 0
+            while filled < len(body):
+                read = response.readinto(view[filled:])
+                if not read:
+                    break
+                filled += read
+        del body[filled:]
+        return body
+
+    body = bytearray()
+    try:
+        while True:
+            chunk = response.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            if decoder is None:
+                body += chunk
+                continue
+            # Bounded output: a highly compressed chunk never expands into one big temporary
+            while chunk:
+                body += decoder.decompress(chunk, CHUNK_SIZE)
+                chunk = decoder.unconsumed_tail
+        if decoder:
+            body += decoder.flush()
+    except zlib.error as e:
+        raise ValueError(f"Corrupt {encoding} response: {e}")
+    return body
+
+
+def decoded_http_error(error: urllib.error.HTTPError) -> urllib.error.HTTPError:
+    """The same HTTPError with a decompressed, re-readable body."""
+    try:
+        body = read_body(error)
+    except ValueError:
+        return error
+    return urllib.error.HTTPError(error.url, error.code, error.reason, error.headers, io.BytesIO(body))
+
+
+def fetch(req: urllib.request.Request, timeout: float) -> bytearray:
+    """Send a request with urllib and return the decompressed body."""
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            return read_body(response)
+    except urllib.error.HTTPError as e:
+        raise decoded_http_error(e) from None
@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+Engagement time series: upvote and comment counts of posts over time.
+
+Every snapshot of a set of posts (from `--track` on read_feed.py or
+search.py, or `--snapshot` here) is appended to a segment file in
+`~/.cache/moltbook/engagement/` as one block:
+
+    header      timestamp (float64), posts (uint32), body bytes (uint32)
+    body        per post, by ascending key: key gap, upvote change,
+                comment change - each a zigzag varint
+
+Post IDs map to small integer keys (`keys.txt`, one ID per line), and
+counts are stored as the change since the post's previous observation in
+the same segment, so an unchanged post costs three bytes instead of a
+JSON record. Segments are append-only and roll over at 4MB; each starts
+from absolute values, so a range query only decodes the segments its
+window overlaps. Segments are read through mmap and decoded a whole
+segment at a time, vectorized with numpy when it is installed.
+
+Appends hold an exclusive lock on the store (`flock` on `.lock`), so a
+long-running `read_feed.py --watch --track` and a `search.py --track`
+can write side by side: under the lock each process folds in post IDs
+the others added and, if the active segment changed since it last
+wrote, re-reads it for the counts the next deltas are taken against.
+
+Usage:
+    python scripts/engagement.py --snapshot --submolt general,agentskills --limit 100
+    python scripts/read_feed.py --submolt general --limit 50 --track
+    python scripts/engagement.py --rising --hours 24 --top 20
+    python scripts/engagement.py --curve POST_ID --hours 48
+    python scripts/engagement.py --stats
+"""
+
+import argparse
+import mmap
+import struct
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: appends are not locked, so run one tracking process at a time
+    fcntl = None
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from output import add_format_argument, status, write_json, write_ndjson, write_text
+from profiling import add_profile_arguments, start_profiling
+
+ENGAGEMENT_DIR = Path.home() / ".cache" / "moltbook" / "engagement"
+SEGMENT_BYTES = 4 << 20
+BLOCK_HEADER = struct.Struct("<dII")
+FIELDS = 3
+
+
+def zigzag(value: int) -> int:
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def encode_varints(values, out: bytearray):
+    for value in values:
+        while value >= 0x80:
+            out.append((value & 0x7f) | 0x80)
+            value >>= 7
+        out.append(value)
+
+
+def decode_varints(data) -> list:
+    """Unsigned LEB128 varints from a bytes-like object."""
+    if numpy is not None:
+        raw = numpy.frombuffer(data, dtype=numpy.uint8)
+        if not len(raw):
+            return numpy.zeros(0, dtype=numpy.int64)
+        ends = numpy.flatnonzero(raw < 0x80)
+        starts = numpy.concatenate(([0], ends[:-1] + 1))
+        shifts = (numpy.arange(len(raw)) - numpy.repeat(starts, ends - starts + 1)) * 7
+        return numpy.add.reduceat((raw & 0x7f).astype(numpy.int64) << shifts, starts)
+    values = []
+    value = shift = 0
+    for byte in bytes(data):
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            values.append(value)
+            value = shift = 0
+        else:
+            shift += 7
+    return values
+
+
+class EngagementStore:
+    """Append-only, delta/varint-encoded snapshots of post counters."""
+
+    def __init__(self, path: Path = ENGAGEMENT_DIR):
+        self.path = Path(path)
+        self.ids = []
+        self.keys = {}
+        # Bytes of keys.txt read so far
+        self.keys_read = 0
+        self._load_keys()
+        # key -> (upvotes, comments) as last written to the active segment
+        self.last = None
+        # (segment, size) right after our last write; anything else means another process wrote
+        self.written = None
+
+    def _load_keys(self):
+        """Fold in post IDs added to keys.txt (by any process) since the last look."""
+        keys_path = self.path / "keys.txt"
+        if not keys_path.exists():
+            return
+        with open(keys_path, 'rb') as f:
+            f.seek(self.keys_read)
+            data = f.read()
+        # Only whole lines: one being appended right now is picked up next time
+        end = data.rfind(b"\n") + 1
+        for post_id in data[:end].decode('utf-8').splitlines():
+            self.keys[post_id] = len(self.ids)
+            self.ids.append(post_id)
+        self.keys_read += end
+
+    def segments(self) -> list:
+        return sorted(self.path.glob("*.seg"))
+
+    def _blocks(self, data) -> list:
+        """(timestamp, posts, body offset, body bytes) of every complete block."""
+        blocks = []
+        offset = 0
+        while offset + BLOCK_HEADER.size <= len(data):
+            timestamp, count, size = BLOCK_HEADER.unpack_from(data, offset)
+            if offset + BLOCK_HEADER.size + size > len(data):
+                # Torn write at the end of the segment
+                break
+            blocks.append((timestamp, count, offset + BLOCK_HEADER.size, size))
+            offset += BLOCK_HEADER.size + size
+        return blocks
+
+    def _decode(self, segment: Path) -> tuple:
+        """All observations of a segment as parallel (keys, times, upvotes, comments)."""
+        if segment.stat().st_size == 0:
+            return [], [], [], []
+        with open(segment, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            blocks = self._blocks(data)
+            if not blocks:
+                return [], [], [], []
+            if numpy is not None:
+                view = numpy.frombuffer(data, dtype=numpy.uint8)
+                body = numpy.concatenate([view[start:start + size] for _, _, start, size in blocks])
+                del view
+            else:
+                body = b"".join(data[start:start + size] for _, _, start, size in blocks)
+        values = decode_varints(body)
+        counts = [count for _, count, _, _ in blocks]
+        times = [timestamp for timestamp, _, _, _ in blocks]
+
+        if numpy is not None:
+            rows = values.reshape(-1, FIELDS)
+            block = numpy.repeat(numpy.arange(len(blocks)), counts)
+            # Keys are gaps within each block: cumulative sum, minus the sum before the block
+            gaps = numpy.cumsum(rows[:, 0])
+            before = numpy.concatenate(([0], gaps))[numpy.cumsum(counts) - counts]
+            keys = gaps - before[block]
+            # Counters are changes since the key's previous row in this segment
+            order = numpy.argsort(keys, kind='stable')
+            sorted_keys = keys[order]
+            first = numpy.flatnonzero(numpy.concatenate(([True], sorted_keys[1:] != sorted_keys[:-1])))
+            group = numpy.repeat(numpy.arange(len(first)), numpy.diff(numpy.append(first, len(order))))
+            columns = []
+            for field in (1, 2):
+                changes = (rows[:, field] >> 1) ^ -(rows[:, field] & 1)
+                running = numpy.cumsum(changes[order])
+                totals = numpy.empty_like(running)
+                totals[order] = running - (running[first] - changes[order][first])[group]
+                columns.append(totals)
+            return keys, numpy.asarray(times)[block], columns[0], columns[1]
+
+        keys, stamps, upvotes, comments = [], [], [], []
+        last = {}
+        position = 0
+        for timestamp, count in zip(times, counts):
+            key = 0
+            for _ in range(count):
+                gap, up, comment = values[position:position + FIELDS]
+                position += FIELDS
+                key += gap
+                previous = last.get(key, (0, 0))
+                current = (previous[0] + ((up >> 1) ^ -(up & 1)), previous[1] + ((comment >> 1) ^ -(comment & 1)))
+                last[key] = current
+                keys.append(key)
+                stamps.append(timestamp)
+                upvotes.append(current[0])
+                comments.append(current[1])
+        return keys, stamps, upvotes, comments
+
+    def _active(self) -> Path:
+        segments = self.segments()
+        if segments and segments[-1].stat().st_size < SEGMENT_BYTES:
+            active = segments[-1]
+        else:
+            number = int(segments[-1].stem) + 1 if segments else 1
+            active = self.path / f"{number:06d}.seg"
+        size = active.stat().st_size if active.exists() else 0
+        if self.last is None or self.written != (active, size):
+            # First write, a new segment, or another process wrote since:
+            # pick up where the active segment left off
+            self.last = {}
+            if size:
+                for key, _, up, comment in zip(*self._decode(active)):
+                    self.last[int(key)] = (int(up), int(comment))
+        return active
+
+    def append(self, posts: list, at: float = None) -> int:
+        """Record the current counts of `posts`; returns how many were recorded."""
+        counts = {}
+        for post in posts:
+            if post.get('id'):
+                counts[post['id']] = (int(post.get('upvotes') or 0), int(post.get('comment_count') or 0))
+        if not counts:
+            return 0
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        # Released when the file closes
+        with open(self.path / ".lock", 'a') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            self._load_keys()
+            new = [post_id for post_id in counts if post_id not in self.keys]
+            if new:
+                keys_path = self.path / "keys.txt"
+                # A torn line left by a crashed writer would swallow the first new ID
+                torn = keys_path.exists() and keys_path.stat().st_size > self.keys_read
+                with open(keys_path, 'a') as f:
+                    f.write(("\n" if torn else "") + "".join(f"{post_id}\n" for post_id in new))
+                # Keys are line numbers, so read them back rather than assume them
+                self._load_keys()
+
+            active = self._active()
+            body = bytearray()
+            previous_key = 0
+            for key, (up, comment) in sorted((self.keys[post_id], value) for post_id, value in counts.items()):
+                last_up, last_comment = self.last.get(key, (0, 0))
+                encode_varints((key - previous_key, zigzag(up - last_up), zigzag(comment - last_comment)), body)
+                self.last[key] = (up, comment)
+                previous_key = key
+            with open(active, 'ab') as f:
+                f.write(BLOCK_HEADER.pack(at or time.time(), len(counts), len(body)) + body)
+            # A full segment is never written again, so the next append starts a new one
+            self.written = (active, active.stat().st_size)
+        return len(counts)
+
+    def _first_time(self, segment: Path):
+        with open(segment, 'rb') as f:
+            header = f.read(BLOCK_HEADER.size)
+        return BLOCK_HEADER.unpack(header)[0] if len(header) == BLOCK_HEADER.size else None
+
+    def read(self, post_ids=None, since: float = None, until: float = None) -> dict:
+        """{post_id: (times, upvotes, comments)} for observations in [since, until]."""
+        self._load_keys()
+        segments = self.segments()
+        firsts = [self._first_time(segment) for segment in segments]
+        wanted = None
+        if post_ids is not None:
+            wanted = sorted({self.keys[post_id] for post_id in post_ids if post_id in self.keys})
+
+        series = {}
+        for i, segment in enumerate(segments):
+            if firsts[i] is None or (until is not None and firsts[i] > until):
+                continue
+            following = firsts[i + 1] if i + 1 < len(firsts) else None
+            if since is not None and following is not None and following < since:
+                continue
+            keys, times, upvotes, comments = self._decode(segment)
+            if numpy is not None:
+                mask = numpy.ones(len(keys), dtype=bool)
+                if since is not None:
+                    mask &= times >= since
+                if until is not None:
+                    mask &= times <= until
+                if wanted is not None:
+                    mask &= numpy.isin(keys, wanted)
+                # Group rows by post with one stable sort, then hand out slices
+                order = numpy.argsort(keys[mask], kind='stable')
+                keys = keys[mask][order]
+                columns = [column[mask][order].tolist() for column in (times, upvotes, comments)]
+                edges = (numpy.flatnonzero(numpy.diff(keys)) + 1).tolist()
+                starts = [0] + edges
+                for key, start, end in zip(keys[starts].tolist() if len(keys) else [], starts, edges + [len(keys)]):
+                    entry = series.setdefault(key, ([], [], []))
+                    for values, column in zip(entry, columns):
+                        values.extend(column[start:end])
+            else:
+                wanted_set = set(wanted) if wanted is not None else None
+                for key, timestamp, up, comment in zip(keys, times, upvotes, comments):
+                    if ((since is None or timestamp >= since) and (until is None or timestamp <= until)
+                            and (wanted_set is None or key in wanted_set)):
+                        entry = series.get(key)
+                        if entry is None:
+                            entry = series[key] = ([], [], [])
+                        entry[0].append(timestamp)
+                        entry[1].append(up)
+                        entry[2].append(comment)
+        return {self.ids[key]: entry for key, entry in series.items()}
+
+    def stats(self) -> dict:
+        segments = self.segments()
+        observations = blocks = 0
+        for segment in segments:
+            with open(segment, 'rb') as f:
+                found = self._blocks(f.read())
+            blocks += len(found)
+            observations += sum(count for _, count, _, _ in found)
+        size = sum(segment.stat().st_size for segment in segments)
+        return {"posts": len(self.ids), "segments": len(segments), "snapshots": blocks,
+                "observations": observations, "bytes": size}
+
+
+def velocity(times: list, values: list) -> float:
+    """Change per hour between the first and last observation."""
+    if len(times) < 2 or times[-1] <= times[0]:
+        return 0.0
+    return (values[-1] - values[0]) / ((times[-1] - times[0]) / 3600)
+
+
+def rising(series: dict, top: int = 10) -> list:
+    """Posts by upvote velocity, fastest first."""
+    ranked = []
+    for post_id, (times, upvotes, comments) in series.items():
+        ranked.append({"id": post_id, "upvotes": upvotes[-1], "comment_count": comments[-1],
+                       "upvotes_per_hour": round(velocity(times, upvotes), 2),
+                       "comments_per_hour": round(velocity(times, comments), 2),
+                       "observations": len(times)})
+    ranked.sort(key=lambda record: -record["upvotes_per_hour"])
+    return ranked[:top]
+
+
+def record_snapshot(posts: list, store: EngagementStore = None):
+    """Append posts' counts to the store, warning instead of failing the caller."""
+    try:
+        (store or EngagementStore()).append(posts)
+    except OSError as e:
+        print(f"⚠ Could not record engagement: {e}", file=sys.stderr)
+
+
+def stamp(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%d %H:%M")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Upvote and comment counts of posts over time")
+    action = parser.add_mutually_exclusive_group(required=True)
+    action.add_argument("--snapshot", action="store_true", help="Record the current counts of --submolt posts")
+    action.add_argument("--rising", action="store_true", help="Posts gaining upvotes fastest in the window")
+    action.add_argument("--curve", nargs="+", metavar="POST_ID", help="Counts of these posts over the window")
+    action.add_argument("--stats", action="store_true", help="Show what the store holds")
+    parser.add_argument("--submolt", help="Submolts to snapshot (comma-separated; default: main feed)")
+    parser.add_argument("--limit", type=int, default=50, help="Posts per submolt to snapshot (default: 50)")
+    parser.add_argument("--hours", type=float, default=24, help="Window to look back over (default: 24)")
+    parser.add_argument("--top", type=int, default=10, help="Posts to show with --rising (default: 10)")
+    parser.add_argument("--api-key", help="API key (defaults to credentials.json)")
+    add_format_argument(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    start_profiling(args)
+
+    store = EngagementStore()
+
+    if args.snapshot:
+        # Imported here: only snapshots need the API
+        from moltbook_api import resolve_api_key
+        from read_feed import feed_path, fetch_page, load_submolts, merge_feeds
+        from scheduler import BACKGROUND
+
+        api_key = resolve_api_key(args.api_key)
+        submolts = load_submolts(args.submolt)
+        if submolts:
+            posts, _ = merge_feeds(submolts, args.limit * len(submolts), api_key, args.limit)
+        else:
+            posts, _ = fetch_page(feed_path(), api_key, args.limit, priority=BACKGROUND)
+        recorded = store.append(posts)
+        print(f"✓ Recorded {recorded} posts ({len(store.ids)} tracked)")
+        return
+
+    if args.stats:
+        stats = store.stats()
+        if args.format != "text":
+            write_json(stats)
+            return
+        per = stats["bytes"] / stats["observations"] if stats["observations"] else 0
+        print(f"Store: {store.path}")
+        print(f"  {stats['posts']} posts, {stats['snapshots']} snapshots, {stats['observations']} observations")
+        print(f"  {stats['bytes'] / 1e6:.2f} MB in {stats['segments']} segments ({per:.1f} bytes/observation)")
+        return
+
+    since = time.time() - args.hours * 3600
+    start = time.perf_counter()
+    series = store.read(args.curve, since=since)
+    elapsed = time.perf_counter() - start
+
+    if args.curve:
+        missing = [post_id for post_id in args.curve if post_id not in series]
+        if missing:
+            print(f"⚠ No observations in the last {args.hours:g}h for: {', '.join(missing)}", file=sys.stderr)
+        records = [{"id": post_id, "times": times, "upvotes": upvotes, "comment_count": comments}
+                   for post_id, (times, upvotes, comments) in series.items()]
+        if args.format == "text":
+            write_text(
+                f"{record['id']}\n" + "".join(f"  {stamp(t)}  ⬆ {up}  💬 {comment}\n" for t, up, comment
+                                              in zip(record["times"], record["upvotes"], record["comment_count"]))
+                for record in records)
+        elif args.format == "ndjson":
+            write_ndjson(records)
+        else:
+            write_json({"posts": records})
+    else:
+        ranked = rising(series, args.top)
+        if args.format == "text":
+            write_text([f"{'='*60}\nRising in the last {args.hours:g}h\n{'='*60}\n\n"] +
+                       [f"{record['upvotes_per_hour']:8.1f} ⬆/h  {record['comments_per_hour']:6.1f} 💬/h  "
+                        f"{record['id']} (⬆ {record['upvotes']}, {record['observations']} snapshots)\n"
+                        for record in ranked])
+        elif args.format == "ndjson":
+            write_ndjson(ranked)
+        else:
+            write_json({"posts": ranked, "hours": args.hours})
+    status(f"✓ {len(series)} posts decoded in {elapsed * 1000:.0f}ms", args.format)
+
+
+if __name__ == "__main__":
+    main()
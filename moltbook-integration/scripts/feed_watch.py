@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Adaptive feed polling for `read_feed.py --watch`.
+
+Each feed is polled on its own schedule. An EWMA of its observed new-post
+rate sets the interval so a poll finds roughly half a page of new posts:
+busy feeds are polled often, quiet ones back off towards the maximum. All
+feeds share a request budget (a token bucket below the API's 100
+requests/minute), and intervals are stretched proportionally when the
+feeds together would exceed it.
+"""
+
+import heapq
+import sys
+import time
+import urllib.error
+from collections import OrderedDict
+
+from moltbook_api import created_at_key
+from scheduler import TokenBucket
+
+EWMA_ALPHA = 0.3
+MAX_CATCH_UP_PAGES = 3
+SEEN_PER_FEED = 2000
+
+
+class FeedState:
+    """Schedule and seen-post memory for one watched feed."""
+
+    def __init__(self, name: str, path: str, interval: float):
+        self.name = name
+        self.path = path
+        self.interval = interval
+        self.rate = None
+        self.last_poll = None
+        self.seen = OrderedDict()
+        self.polls = 0
+        self.emitted = 0
+
+    def remember(self, post_id):
+        self.seen[post_id] = True
+        self.seen.move_to_end(post_id)
+        while len(self.seen) > SEEN_PER_FEED:
+            self.seen.popitem(last=False)
+
+
+class FeedWatcher:
+    """Poll several feeds adaptively and hand new posts to `emit`, oldest first."""
+
+    def __init__(self, feeds: list, fetch, emit, page_size: int = 25, budget: float = 60,
+                 min_interval: float = 15, max_interval: float = 600,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.feeds = [FeedState(name, path, min_interval) for name, path in feeds]
+        self.fetch = fetch
+        self.emit = emit
+        self.page_size = page_size
+        self.budget = budget
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.clock = clock
+        self.sleep = sleep
+        self.bucket = TokenBucket(budget, clock=clock)
+        self.requests = 0
+        self.emitted_ids = OrderedDict()
+
+    def request(self, feed: FeedState, cursor: str = None) -> tuple:
+        delay = self.bucket.wait_time()
+        while delay > 0:
+            self.sleep(delay)
+            delay = self.bucket.wait_time()
+        self.bucket.take()
+        self.requests += 1
+        return self.fetch(feed.path, self.page_size, cursor)
+
+    def desired_interval(self, feed: FeedState) -> float:
+        if not feed.rate:
+            interval = feed.interval * 2
+        else:
+            # Aim to find about half a page of new posts per poll
+            interval = (self.page_size / 2) / feed.rate
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    def stretch(self) -> float:
+        """Factor by which all intervals must grow to fit the request budget."""
+        demand = sum(60.0 / feed.interval for feed in self.feeds)
+        return max(1.0, demand / self.budget)
+
+    def poll(self, feed: FeedState, now: float) -> list:
+        """Fetch a feed, returning its unseen posts oldest first."""
+        posts, cursor = self.request(feed)
+        page_new = [post for post in posts if post.get('id') not in feed.seen]
+        new = list(page_new)
+
+        # A page of nothing but new posts may hide more: follow the cursor
+        pages = 1
+        while (feed.polls and posts and cursor and len(page_new) == len(posts)
+               and pages <= MAX_CATCH_UP_PAGES):
+            posts, cursor = self.request(feed, cursor)
+            page_new = [post for post in posts if post.get('id') not in feed.seen]
+            new.extend(page_new)
+            pages += 1
+
+        for post in new:
+            feed.remember(post.get('id'))
+
+        if feed.polls == 0:
+            # First poll only seeds the feed: estimate its rate from the page's time span
+            stamps = [created_at_key(post) for post in posts if created_at_key(post)]
+            span = max(stamps) - min(stamps) if len(stamps) > 1 else 0
+            feed.rate = (len(stamps) - 1) / span if span > 0 else None
+            new = []
+        else:
+            observed = len(new) / max(now - feed.last_poll, 1e-3)
+            feed.rate = observed if feed.rate is None else (
+                EWMA_ALPHA * observed + (1 - EWMA_ALPHA) * feed.rate
+            )
+
+        feed.polls += 1
+        feed.last_poll = now
+        feed.interval = self.desired_interval(feed)
+        new.sort(key=created_at_key)
+        return new
+
+    def run(self, duration: float = None) -> dict:
+        """Poll until interrupted (or for `duration` seconds); returns run stats."""
+        start = self.clock()
+        schedule = [(start, i) for i in range(len(self.feeds))]
+        heapq.heapify(schedule)
+
+        try:
+            while schedule:
+                due, index = heapq.heappop(schedule)
+                if duration is not None and due - start > duration:
+                    break
+                wait = due - self.clock()
+                if wait > 0:
+                    self.sleep(wait)
+
+                feed = self.feeds[index]
+                now = self.clock()
+                try:
+                    new_posts = self.poll(feed, now)
+                except (urllib.error.URLError, ValueError) as e:
+                    print(f"⚠ Poll failed for {feed.name}: {e}", file=sys.stderr)
+                    feed.interval = min(self.max_interval, feed.interval * 2)
+                    new_posts = []
+
+                for post in new_posts:
+                    # The main feed and submolts overlap; emit each post once
+                    post_id = post.get('id')
+                    if post_id in self.emitted_ids:
+                        continue
+                    self.emitted_ids[post_id] = True
+                    if len(self.emitted_ids) > SEEN_PER_FEED * len(self.feeds):
+                        self.emitted_ids.popitem(last=False)
+                    feed.emitted += 1
+                    self.emit(feed.name, post)
+
+                heapq.heappush(schedule, (now + feed.interval * self.stretch(), index))
+        except KeyboardInterrupt:
+            pass
+
+        elapsed = self.clock() - start
+        return {
+            "seconds": elapsed,
+            "requests": self.requests,
+            "requests_per_minute": self.requests / elapsed * 60 if elapsed else 0.0,
+            "feeds": {
+                feed.name: {
+                    "polls": feed.polls,
+                    "emitted": feed.emitted,
+                    "interval_s": feed.interval * self.stretch(),
+                    "posts_per_minute": (feed.rate or 0.0) * 60,
+                }
+                for feed in self.feeds
+            },
+        }
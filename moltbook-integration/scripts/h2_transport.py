@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Optional HTTP/2 transport for the Moltbook scripts.
+
+urllib opens a new HTTP/1.1 connection per request, so fanning out feed,
+profile and comment fetches means dozens of TLS handshakes to the same
+host. With `MOLTBOOK_HTTP2=1` and `httpx[http2]` installed, requests share
+one HTTP/2 connection, multiplexed as concurrent streams.
+
+Falls back to HTTP/1.1 cleanly:
+  - httpx/h2 not installed: a one-time warning, then plain urllib
+  - server does not offer h2 (ALPN): httpx keeps pooled HTTP/1.1 connections
+  - HTTP/2 protocol failure mid-session: that request is re-sent over urllib
+    and the rest of the run stays on HTTP/1.1
+
+Install: pip install "httpx[http2]"
+"""
+
+import io
+import os
+import socket
+import sys
+import threading
+import urllib.error
+import urllib.request
+from email.message import Message
+
+from compression import fetch
+
+# Imported on first use: most runs never enable HTTP/2, and importing
+# httpx costs ~40ms on every script start
+httpx = None
+
+HTTP2_ENV = "MOLTBOOK_HTTP2"
+# Socket cap. HTTP/2 streams all share one connection; the cap matters when
+# the server only offers HTTP/1.1 and httpx pools keep-alive connections
+MAX_CONNECTIONS = 50
+
+
+def http2_available() -> bool:
+    """Whether httpx[http2] is installed; imports httpx when it is."""
+    global httpx
+    try:
+        import httpx as client
+        # httpx needs h2 for http2=True
+        import h2
+    except ImportError:
+        return False
+    httpx = client
+    return True
+
+
+class Http2Transport:
+    """Send requests through one shared httpx client with HTTP/2 enabled."""
+
+    def __init__(self, max_connections: int = MAX_CONNECTIONS):
+        if not http2_available():
+            raise ImportError('httpx[http2] is not installed (pip install "httpx[http2]")')
+        self.client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+        self.lock = threading.Lock()
+        self.disabled = False
+        self.versions = {}
+
+    def _record(self, version: str):
+        with self.lock:
+            self.versions[version] = self.versions.get(version, 0) + 1
+
+    def open(self, req: urllib.request.Request, timeout: float) -> bytes:
+        if self.disabled:
+            self._record("HTTP/1.1 (fallback)")
+            return fetch(req, timeout)
+        try:
+            response = self.client.request(
+                req.get_method(), req.full_url,
+                headers=dict(req.header_items()), content=req.data, timeout=timeout
+            )
+        except httpx.TimeoutException as e:
+            raise urllib.error.URLError(socket.timeout(str(e) or "timed out"))
+        except (httpx.RemoteProtocolError, httpx.LocalProtocolError) as e:
+            # Broken HTTP/2 session: finish the run over HTTP/1.1
+            with self.lock:
+                if not self.disabled:
+                    self.disabled = True
+                    print(f"⚠ HTTP/2 failed ({e}); falling back to HTTP/1.1", file=sys.stderr)
+            self._record("HTTP/1.1 (fallback)")
+            return fetch(req, timeout)
+        except httpx.TransportError as e:
+            raise urllib.error.URLError(str(e) or e.__class__.__name__)
+
+        self._record(response.http_version)
+        if response.status_code >= 400:
+            headers = Message()
+            for name, value in response.headers.items():
+                headers[name] = value
+            raise urllib.error.HTTPError(req.full_url, response.status_code, response.reason_phrase,
+                                         headers, io.BytesIO(response.content))
+        return response.content
+
+    def close(self):
+        self.client.close()
+
+
+def transport_from_env():
+    """Http2Transport when MOLTBOOK_HTTP2 is set and httpx[http2] is installed, else None."""
+    if os.environ.get(HTTP2_ENV, "").lower() not in ("1", "true", "yes", "on"):
+        return None
+    if not http2_available():
+        print('⚠ MOLTBOOK_HTTP2 is set but httpx[http2] is not installed; using HTTP/1.1 '
+              '(pip install "httpx[http2]")', file=sys.stderr)
+        return None
+    return Http2Transport()
@@ -0,0 +1,510 @@
+#!/usr/bin/env python3
+"""
+Author influence from the local post store: who interacts with whom.
+
+Posts synced by `post_store.py --sync` and the comments we make are folded
+into a sparse author graph with two kinds of edges:
+
+    comments      commenter -> post author, one unit per comment
+    co-submolt    author <-> submolt, weighted by posts there, so authors
+                  active in the same submolts are linked without building
+                  an all-pairs clique per submolt
+
+PageRank runs over edge arrays (`array` COO lists; vectorized with numpy
+when it is installed) and label propagation groups authors into
+communities. Both are warm-started from the previous run's scores and
+labels, and the graph catches up incrementally from the store, so an
+update after a sync costs a few iterations rather than a full solve.
+
+Scores are relative to the average author (1.0), so `3.2` means three
+times the influence of a typical author. `read_feed.py` and `search.py`
+take `--sort influence` to order posts by their author's score.
+
+Usage:
+    python scripts/influence.py
+    python scripts/influence.py --top 20 --communities
+    python scripts/influence.py --user SomeAgent
+    python scripts/influence.py --sync --submolt general,agentskills
+    python scripts/influence.py --corpus corpus/     # a synthetic_data.py corpus
+"""
+
+import argparse
+import base64
+import gzip
+import json
+import random
+import sys
+import time
+from array import array
+from pathlib import Path
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from moltbook_api import CREDENTIALS_PATH, resolve_api_key
+from output import add_format_argument, status, write_json, write_ndjson, write_text
+from post_store import STORE_PATH, PostStore, sync
+from profiling import add_profile_arguments, start_profiling
+
+GRAPH_PATH = STORE_PATH.with_name("influence_graph.json")
+DAMPING = 0.85
+# Share of an author's walk that goes through shared submolts rather than comments
+COSUBMOLT_WEIGHT = 0.3
+TOLERANCE = 1e-6
+MAX_ITERATIONS = 100
+MAX_LABEL_SWEEPS = 20
+
+
+def spread(values, src, dst, weights, size: int):
+    """out[dst[k]] += values[src[k]] * weights[k] over all edges k."""
+    if numpy is not None:
+        return numpy.bincount(dst, weights=values[src] * weights, minlength=size)
+    out = [0.0] * size
+    for s, d, w in zip(src, dst, weights):
+        out[d] += values[s] * w
+    return out
+
+
+class InteractionGraph:
+    """Sparse author graph from posts and comments, with PageRank and communities."""
+
+    def __init__(self, own_name: str = None):
+        self.own_name = own_name
+        self.authors = []
+        self.author_ids = {}
+        self.submolts = []
+        self.submolt_ids = {}
+        # (commenter, post author) -> comments; (author, submolt) -> posts
+        self.comments = {}
+        self.activity = {}
+        self.post_authors = {}
+        # post id -> commenters, for comments seen before their post
+        self.pending = {}
+        self.scores = array('d')
+        self.labels = array('I')
+        self.offset = 0
+        self.iterations = 0
+        self.dirty = False
+
+    def _author(self, username: str) -> int:
+        index = self.author_ids.get(username)
+        if index is None:
+            index = self.author_ids[username] = len(self.authors)
+            self.authors.append(username)
+        return index
+
+    def _submolt(self, name: str) -> int:
+        index = self.submolt_ids.get(name)
+        if index is None:
+            index = self.submolt_ids[name] = len(self.submolts)
+            self.submolts.append(name)
+        return index
+
+    def _comment(self, commenter: int, author: int):
+        if commenter != author:
+            key = (commenter, author)
+            self.comments[key] = self.comments.get(key, 0) + 1
+            self.dirty = True
+
+    def add_post(self, post_id: str, author: str, submolt: str = None) -> bool:
+        """Record a post; returns False when it is already known or has no author."""
+        if not author or not post_id or post_id in self.post_authors:
+            return False
+        index = self._author(author)
+        self.post_authors[post_id] = index
+        if submolt:
+            key = (index, self._submolt(submolt))
+            self.activity[key] = self.activity.get(key, 0) + 1
+        for commenter in self.pending.pop(post_id, ()):
+            self._comment(commenter, index)
+        self.dirty = True
+        return True
+
+    def add_comment(self, post_id: str, commenter: str, post_author: str = None):
+        """Record a comment by `commenter` on a post (resolved later if the post is unseen)."""
+        if not commenter or not post_id:
+            return
+        commenter = self._author(commenter)
+        author = self.post_authors.get(post_id)
+        if author is None and post_author:
+            author = self._author(post_author)
+        if author is None:
+            self.pending.setdefault(post_id, []).append(commenter)
+        else:
+            self._comment(commenter, author)
+
+    def add_record(self, record: dict):
+        """Fold in one post store record."""
+        if record.get('kind') == "post":
+            self.add_post(record.get('id'), record.get('author'), record.get('submolt'))
+        elif record.get('kind') == "comment":
+            commenter = record.get('author') or (self.own_name if record.get('source') == "own" else None)
+            self.add_comment(record.get('post_id'), commenter, record.get('post_author'))
+
+    def catch_up(self, store_path: Path = STORE_PATH) -> int:
+        """Fold in records appended to the store since the last run; returns how many."""
+        if not store_path.exists():
+            return 0
+        added = 0
+        with open(store_path, 'rb') as f:
+            if self.offset > store_path.stat().st_size:
+                # The store was replaced; start over
+                self.__init__(self.own_name)
+            f.seek(self.offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                self.offset += len(line)
+                try:
+                    self.add_record(json.loads(line))
+                except ValueError:
+                    continue
+                added += 1
+        return added
+
+    def _transitions(self):
+        """Edge arrays of the random walk: comments, author -> submolt, submolt -> author."""
+        n = len(self.authors)
+        comment_out = [0.0] * n
+        for (src, _), count in self.comments.items():
+            comment_out[src] += count
+        posts_by_author = [0.0] * n
+        posts_in_submolt = [0.0] * len(self.submolts)
+        for (author, submolt), count in self.activity.items():
+            posts_by_author[author] += count
+            posts_in_submolt[submolt] += count
+
+        # Authors with comments split their walk; the rest go all the way through submolts
+        comment_share = [(1 - COSUBMOLT_WEIGHT if posts_by_author[a] else 1.0) if comment_out[a] else 0.0
+                         for a in range(n)]
+        comments = (array('I'), array('I'), array('d'))
+        for (src, dst), count in self.comments.items():
+            comments[0].append(src)
+            comments[1].append(dst)
+            comments[2].append(comment_share[src] * count / comment_out[src])
+        to_submolt = (array('I'), array('I'), array('d'))
+        from_submolt = (array('I'), array('I'), array('d'))
+        for (author, submolt), count in self.activity.items():
+            to_submolt[0].append(author)
+            to_submolt[1].append(submolt)
+            to_submolt[2].append((1 - comment_share[author]) * count / posts_by_author[author])
+            from_submolt[0].append(submolt)
+            from_submolt[1].append(author)
+            from_submolt[2].append(count / posts_in_submolt[submolt])
+        dangling = [a for a in range(n) if not comment_out[a] and not posts_by_author[a]]
+        return comments, to_submolt, from_submolt, dangling
+
+    def pagerank(self):
+        """Update `scores` by power iteration, starting from the previous scores."""
+        n = len(self.authors)
+        if not n:
+            return
+        comments, to_submolt, from_submolt, dangling = self._transitions()
+        # Warm start: previous scores, new authors at the uniform share, renormalized
+        previous = list(self.scores[:n]) + [1.0 / n] * (n - len(self.scores))
+        total = sum(previous)
+        x = [value / total for value in previous]
+        if numpy is not None:
+            x = numpy.array(x)
+            comments, to_submolt, from_submolt = (tuple(numpy.asarray(column) for column in edges)
+                                                  for edges in (comments, to_submolt, from_submolt))
+        m = len(self.submolts)
+
+        for iteration in range(1, MAX_ITERATIONS + 1):
+            through = spread(spread(x, *to_submolt, m), *from_submolt, n)
+            direct = spread(x, *comments, n)
+            leaked = sum(x[a] for a in dangling)
+            base = (1 - DAMPING + DAMPING * leaked) / n
+            if numpy is not None:
+                new = base + DAMPING * (numpy.asarray(through) + direct)
+                change = float(numpy.abs(new - x).sum())
+            else:
+                new = [base + DAMPING * (t + d) for t, d in zip(through, direct)]
+                change = sum(abs(a - b) for a, b in zip(new, x))
+            x = new
+            if change < TOLERANCE:
+                break
+        self.iterations = iteration
+        self.scores = array('d', (float(value) for value in x))
+
+    def communities(self):
+        """Update `labels` by weighted label propagation, starting from the previous labels.
+
+        Submolts take part as nodes so authors who only share submolts
+        still cluster; comment ties outweigh them.
+        """
+        n, m = len(self.authors), len(self.submolts)
+        neighbors = [{} for _ in range(n + m)]
+        for (a, b), count in self.comments.items():
+            neighbors[a][b] = neighbors[a].get(b, 0) + count
+            neighbors[b][a] = neighbors[b].get(a, 0) + count
+        posts_by_author = [0] * n
+        for (author, _), count in self.activity.items():
+            posts_by_author[author] += count
+        for (author, submolt), count in self.activity.items():
+            # An author's submolt ties add up to less than one comment
+            weight = COSUBMOLT_WEIGHT * count / posts_by_author[author]
+            neighbors[author][n + submolt] = weight
+            neighbors[n + submolt][author] = weight
+
+        # New authors, and submolts (which follow their members), start with fresh labels
+        labels = list(self.labels[:n])
+        fresh = max(labels, default=-1) + 1
+        labels += range(fresh, fresh + n + m - len(labels))
+        order = list(range(n + m))
+        rng = random.Random(0)
+        for _ in range(MAX_LABEL_SWEEPS):
+            rng.shuffle(order)
+            changed = 0
+            for node in order:
+                votes = {}
+                for other, weight in neighbors[node].items():
+                    votes[labels[other]] = votes.get(labels[other], 0) + weight
+                if not votes:
+                    continue
+                best = max(votes.values())
+                if votes.get(labels[node]) == best:
+                    continue
+                labels[node] = min(label for label, weight in votes.items() if weight == best)
+                changed += 1
+            if not changed:
+                break
+        self.labels = array('I', labels[:n])
+
+    def update(self) -> bool:
+        """Recompute scores and communities if the graph changed; returns whether it did."""
+        if not self.dirty:
+            return False
+        self.pagerank()
+        self.communities()
+        self.dirty = False
+        return True
+
+    def influence(self, username: str) -> float:
+        """Score relative to the average author; 0.0 for unknown authors."""
+        index = self.author_ids.get(username)
+        if index is None or index >= len(self.scores):
+            return 0.0
+        return self.scores[index] * len(self.scores)
+
+    def top(self, k: int = 10) -> list:
+        order = sorted(range(len(self.scores)), key=lambda a: -self.scores[a])[:k]
+        return [(self.authors[a], self.influence(self.authors[a])) for a in order]
+
+    def community_groups(self) -> list:
+        """Communities, largest first, as (leader, members) with members by influence."""
+        groups = {}
+        for author, label in enumerate(self.labels):
+            groups.setdefault(label, []).append(author)
+        ordered = []
+        for members in groups.values():
+            members.sort(key=lambda a: -self.scores[a])
+            ordered.append([self.authors[a] for a in members])
+        ordered.sort(key=len, reverse=True)
+        return [(members[0], members) for members in ordered]
+
+    def community_of(self, username: str) -> list:
+        index = self.author_ids.get(username)
+        if index is None or index >= len(self.labels):
+            return []
+        label = self.labels[index]
+        members = [a for a, other in enumerate(self.labels) if other == label]
+        return [self.authors[a] for a in sorted(members, key=lambda a: -self.scores[a])]
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.comments) + len(self.activity)
+
+    def save(self, path: Path = GRAPH_PATH):
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        def packed(typecode, values):
+            return base64.b64encode(array(typecode, values).tobytes()).decode('ascii')
+
+        state = {
+            "offset": self.offset,
+            "authors": self.authors,
+            "submolts": self.submolts,
+            "post_authors": self.post_authors,
+            "pending": self.pending,
+            # Raw machine-order arrays: a local cache, never shared between hosts
+            "comments": [packed('I', (key[i] for key in self.comments)) for i in (0, 1)] +
+                        [packed('I', self.comments.values())],
+            "activity": [packed('I', (key[i] for key in self.activity)) for i in (0, 1)] +
+                        [packed('I', self.activity.values())],
+            "scores": base64.b64encode(self.scores.tobytes()).decode('ascii'),
+            "labels": base64.b64encode(self.labels.tobytes()).decode('ascii'),
+        }
+        with open(path, 'w') as f:
+            json.dump(state, f, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path: Path = GRAPH_PATH, own_name: str = None) -> "InteractionGraph":
+        graph = cls(own_name)
+        if not path.exists():
+            return graph
+
+        def unpacked(typecode, text):
+            values = array(typecode)
+            values.frombytes(base64.b64decode(text))
+            return values
+
+        try:
+            with open(path, 'r') as f:
+                state = json.load(f)
+            graph.authors = state["authors"]
+            graph.author_ids = {name: i for i, name in enumerate(graph.authors)}
+            graph.submolts = state["submolts"]
+            graph.submolt_ids = {name: i for i, name in enumerate(graph.submolts)}
+            graph.post_authors = state["post_authors"]
+            graph.pending = state["pending"]
+            for name in ("comments", "activity"):
+                src, dst, counts = (unpacked('I', text) for text in state[name])
+                setattr(graph, name, dict(zip(zip(src, dst), counts)))
+            graph.scores = unpacked('d', state["scores"])
+            graph.labels = unpacked('I', state["labels"])
+            graph.offset = state["offset"]
+        except (OSError, ValueError, KeyError):
+            print("⚠ Influence graph unreadable, rebuilding", file=sys.stderr)
+            return cls(own_name)
+        return graph
+
+
+def own_name() -> str:
+    if not CREDENTIALS_PATH.exists():
+        return None
+    with open(CREDENTIALS_PATH, 'r') as f:
+        return json.load(f).get('agent_name')
+
+
+def open_graph(store_path: Path = STORE_PATH, graph_path: Path = GRAPH_PATH) -> InteractionGraph:
+    """Load the saved graph, fold in newly stored records and rescore if anything changed."""
+    graph = InteractionGraph.load(graph_path, own_name())
+    graph.catch_up(store_path)
+    if graph.update():
+        graph.save(graph_path)
+    return graph
+
+
+def load_corpus(corpus_dir: str) -> InteractionGraph:
+    """Graph of a `synthetic_data.py` corpus (posts.ndjson and comments.ndjson, optionally gzipped)."""
+    graph = InteractionGraph()
+    for name in ("posts.ndjson", "comments.ndjson"):
+        path = Path(corpus_dir) / name
+        opener = open
+        if not path.exists() and path.with_name(name + ".gz").exists():
+            path, opener = path.with_name(name + ".gz"), gzip.open
+        if not path.exists():
+            continue
+        with opener(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                item = json.loads(line)
+                author = (item.get('author') or {}).get('username')
+                if name == "posts.ndjson":
+                    graph.add_post(item.get('id'), author, item.get('submolt'))
+                else:
+                    graph.add_comment(item.get('post_id'), author)
+    return graph
+
+
+def rank_by_influence(posts: list, graph: InteractionGraph = None) -> list:
+    """Sort posts in place by their author's influence, most influential first.
+
+    Each post gets `author_influence`; ties keep their original order.
+    """
+    graph = graph or open_graph()
+    if not graph.authors:
+        print("⚠ No interaction graph yet; run post_store.py --sync to build one", file=sys.stderr)
+    for post in posts:
+        post['author_influence'] = round(graph.influence((post.get('author') or {}).get('username')), 3)
+    posts.sort(key=lambda post: -post['author_influence'])
+    return posts
+
+
+def render_ranking(graph: InteractionGraph, top: int, communities: bool) -> str:
+    blocks = [f"{'='*60}\nMost influential authors ({len(graph.authors)} in the graph)\n{'='*60}\n\n"]
+    for rank, (author, score) in enumerate(graph.top(top), 1):
+        blocks.append(f"{rank:3d}. u/{author}  {score:.2f}\n")
+    if communities:
+        groups = graph.community_groups()
+        blocks.append(f"\n{len(groups)} communities\n")
+        for leader, members in groups[:top]:
+            others = ", ".join(f"u/{name}" for name in members[1:6])
+            more = f" +{len(members) - 6}" if len(members) > 6 else ""
+            blocks.append(f"  u/{leader} ({len(members)}){': ' + others if others else ''}{more}\n")
+    return "".join(blocks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank authors by influence in the local interaction graph")
+    parser.add_argument("--top", type=int, default=10, help="Authors (and communities) to show (default: 10)")
+    parser.add_argument("--user", help="Show one author's score, rank and community")
+    parser.add_argument("--communities", action="store_true", help="Also list communities")
+    parser.add_argument("--corpus", help="Build from a synthetic_data.py corpus directory instead of the store")
+    parser.add_argument("--sync", action="store_true", help="Sync your posts (and --submolt posts) first")
+    parser.add_argument("--submolt", help="Submolts to sync (comma-separated)")
+    parser.add_argument("--limit", type=int, default=50, help="Posts to sync per feed (default: 50)")
+    parser.add_argument("--api-key", help="API key (defaults to credentials.json)")
+    add_format_argument(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    start_profiling(args)
+
+    if args.sync:
+        submolts = [name.strip() for name in (args.submolt or "").split(",") if name.strip()]
+        stats = sync(PostStore(), resolve_api_key(args.api_key), submolts, args.limit)
+        print(f"✓ Synced {stats['added']} new posts", file=sys.stderr)
+
+    start = time.perf_counter()
+    if args.corpus:
+        if not Path(args.corpus).is_dir():
+            print(f"✗ Corpus directory not found: {args.corpus}", file=sys.stderr)
+            sys.exit(1)
+        graph = load_corpus(args.corpus)
+        loaded = time.perf_counter()
+        graph.update()
+    else:
+        graph = open_graph()
+        loaded = start
+    elapsed = time.perf_counter() - loaded
+
+    if not graph.authors:
+        print("✗ No authors in the graph yet", file=sys.stderr)
+        print("  Run post_store.py --sync (with --submolt) or comment.py to add some", file=sys.stderr)
+        sys.exit(1)
+
+    if args.user:
+        if args.user not in graph.author_ids:
+            print(f"✗ u/{args.user} is not in the graph", file=sys.stderr)
+            sys.exit(1)
+        score = graph.influence(args.user)
+        rank = 1 + sum(1 for other in graph.scores if other * len(graph.scores) > score)
+        community = graph.community_of(args.user)
+        record = {"username": args.user, "influence": round(score, 3), "rank": rank,
+                  "community": community[:args.top], "community_size": len(community)}
+        if args.format == "text":
+            write_text([f"u/{args.user}: influence {score:.2f} (rank {rank} of {len(graph.authors)})\n",
+                        f"  Community of {len(community)}, led by u/{community[0]}\n"])
+        else:
+            write_json(record)
+        return
+
+    ranking = [{"username": name, "influence": round(score, 3)} for name, score in graph.top(args.top)]
+    if args.format == "text":
+        write_text([render_ranking(graph, args.top, args.communities)])
+    elif args.format == "ndjson":
+        write_ndjson(ranking)
+    else:
+        document = {"authors": ranking}
+        if args.communities:
+            document["communities"] = [{"leader": leader, "size": len(members), "members": members[:args.top]}
+                                       for leader, members in graph.community_groups()[:args.top]]
+        write_json(document)
+    scored = f"; rescored in {graph.iterations} iterations ({elapsed * 1000:.0f}ms)" if graph.iterations else ""
+    status(f"✓ {len(graph.authors)} authors, {graph.edge_count} edges{scored}", args.format)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Activity journal: every post, comment and upvote we make, so none is repeated.
+
+Each action is one line appended to `~/.cache/moltbook/actions.journal`:
+
+    timestamp <TAB> action <TAB> target post ID <TAB> detail
+
+(`detail` is the comment ID or the submolt posted to.) Lines are written
+with a single append, so several processes can share the journal.
+
+At startup the journal is mmap'd and one regex pass over it builds a hash
+set of (action, target) pairs, so "have we upvoted this already?" is a set
+lookup. Before each check the index folds in lines other processes have
+appended since. Past 64MB (about a million actions) a Bloom filter saved
+next to the journal replaces the set. It is loaded and caught up from
+where it left off, and a positive is confirmed with a search of the
+mmap'd journal, so answers stay exact. The filter is saved every 1000
+new lines and on exit, into a temporary file renamed over the old one,
+so a reader never sees it half written.
+
+upvote.py, comment.py, post.py and rules (`--apply-rules`) write to it;
+upvote.py, comment.py and rules skip what it says was already done.
+
+Usage:
+    python scripts/journal.py --stats
+    python scripts/journal.py --list --action upvote --limit 20
+    python scripts/journal.py --check upvote POST_ID
+"""
+
+import argparse
+import atexit
+import hashlib
+import mmap
+import os
+import re
+import struct
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from output import add_format_argument, write_json, write_ndjson, write_text
+from profiling import add_profile_arguments, start_profiling
+
+JOURNAL_PATH = Path.home() / ".cache" / "moltbook" / "actions.journal"
+ACTIONS = ("post", "comment", "upvote")
+# Beyond this the exact set costs more memory and startup time than the Bloom filter
+BLOOM_THRESHOLD = 64 << 20
+BLOOM_BITS_PER_ENTRY = 10
+BLOOM_HASHES = 7
+BLOOM_HEADER = struct.Struct("<4sQQQ")
+BLOOM_MAGIC = b"MBJB"
+# New lines indexed between saves; anything unsaved is re-read on the next start
+BLOOM_SAVE_EVERY = 1000
+
+# The (action, target) pair of every complete line
+KEY_RE = re.compile(rb"^[^\t\n]*\t([^\t\n]+\t[^\t\n]+)\t[^\n]*\n", re.M)
+
+
+def action_key(action: str, target: str) -> bytes:
+    return f"{action}\t{target}".encode('utf-8')
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over bytes keys, with double hashing."""
+
+    def __init__(self, capacity: int):
+        self.size = max(1 << 20, capacity * BLOOM_BITS_PER_ENTRY)
+        self.bits = bytearray(self.size // 8 + 1)
+        self.count = 0
+
+    def _positions(self, key: bytes):
+        digest = hashlib.blake2b(key, digest_size=16).digest()
+        h1, h2 = struct.unpack("<QQ", digest)
+        return ((h1 + i * h2) % self.size for i in range(BLOOM_HASHES))
+
+    def add(self, key: bytes):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: bytes) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    @property
+    def full(self) -> bool:
+        return self.count * BLOOM_BITS_PER_ENTRY > self.size
+
+
+class ActionJournal:
+    """Append-only log of our actions with O(1) "already done?" checks."""
+
+    def __init__(self, path: Path = JOURNAL_PATH, bloom: bool = None):
+        self.path = Path(path)
+        self.bloom_path = self.path.with_suffix(".bloom")
+        size = self.path.stat().st_size if self.path.exists() else 0
+        self.use_bloom = size > BLOOM_THRESHOLD if bloom is None else bloom
+        self.keys = set()
+        self.bloom = None
+        self.offset = 0
+        self.unsaved = 0
+        if self.use_bloom:
+            self._load_bloom(size)
+            atexit.register(self.close)
+        self._catch_up()
+
+    def _load_bloom(self, size: int):
+        if self.bloom_path.exists():
+            with open(self.bloom_path, 'rb') as f:
+                header = f.read(BLOOM_HEADER.size)
+                if len(header) == BLOOM_HEADER.size:
+                    magic, bits, count, offset = BLOOM_HEADER.unpack(header)
+                    if magic == BLOOM_MAGIC and offset <= size:
+                        self.bloom = BloomFilter(0)
+                        self.bloom.size, self.bloom.count = bits, count
+                        self.bloom.bits = bytearray(f.read())
+                        self.offset = offset
+        if self.bloom is None or len(self.bloom.bits) != self.bloom.size // 8 + 1:
+            # Room for twice the journal's current actions (lines are ~60 bytes)
+            self.bloom = BloomFilter(max(size // 30, 1))
+            self.offset = 0
+
+    def _save_bloom(self):
+        self.bloom_path.parent.mkdir(parents=True, exist_ok=True)
+        # Whole file or nothing: other processes may be loading it right now
+        temp = self.bloom_path.with_name(f"{self.bloom_path.name}.{os.getpid()}.tmp")
+        with open(temp, 'wb') as f:
+            f.write(BLOOM_HEADER.pack(BLOOM_MAGIC, self.bloom.size, self.bloom.count, self.offset))
+            f.write(self.bloom.bits)
+        os.replace(temp, self.bloom_path)
+        self.unsaved = 0
+
+    def _catch_up(self):
+        """Index lines appended (by us or other processes) since the last look."""
+        if not self.path.exists():
+            return
+        size = self.path.stat().st_size
+        if size < self.offset:
+            # The journal was replaced; start over
+            self.keys, self.offset = set(), 0
+            if self.use_bloom:
+                self.bloom = BloomFilter(max(size // 30, 1))
+        if size == self.offset:
+            return
+        with open(self.path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            # Only whole lines: a line being appended right now is picked up next time
+            end = data.rfind(b"\n", self.offset) + 1
+            if end <= self.offset:
+                return
+            keys = KEY_RE.findall(data, self.offset, end)
+        self.offset = end
+        if not self.use_bloom:
+            self.keys.update(keys)
+            return
+        for key in keys:
+            self.bloom.add(key)
+        self.unsaved += len(keys)
+        if self.bloom.full:
+            # Rebuild bigger from the whole journal
+            self.bloom, self.offset = BloomFilter(self.bloom.count * 2), 0
+            self._catch_up()
+            return
+        if self.unsaved >= BLOOM_SAVE_EVERY:
+            self._save_bloom()
+
+    def has(self, action: str, target: str) -> bool:
+        """Whether we already did `action` on `target`."""
+        if not target:
+            return False
+        self._catch_up()
+        key = action_key(action, target)
+        if not self.use_bloom:
+            return key in self.keys
+        if key not in self.bloom:
+            return False
+        # Rule out a false positive with an exact search of the journal
+        with open(self.path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return data.find(b"\t" + key + b"\t") != -1
+
+    def record(self, action: str, target: str, detail: str = None, at: float = None):
+        """Append an action; one write, so concurrent writers never interleave lines."""
+        if action not in ACTIONS:
+            raise ValueError(f"action must be one of {', '.join(ACTIONS)}")
+        if not target:
+            return
+        fields = (f"{at or time.time():.0f}", action, target, detail or "")
+        line = "\t".join(field.replace("\t", " ").replace("\n", " ") for field in fields) + "\n"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'ab') as f:
+            f.write(line.encode('utf-8'))
+        self._catch_up()
+
+    def close(self):
+        """Save lines the Bloom filter indexed since its last save."""
+        if not (self.use_bloom and self.unsaved):
+            return
+        try:
+            self._save_bloom()
+        except OSError as e:
+            print(f"⚠ Could not save the journal index ({e}); it will catch up next time", file=sys.stderr)
+
+    def entries(self):
+        """Every recorded action, oldest first, as dicts."""
+        if not self.path.exists():
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                parts = line.rstrip("\n").split("\t")
+                if len(parts) == 4 and line.endswith("\n"):
+                    yield {"at": int(parts[0]), "action": parts[1], "target": parts[2], "detail": parts[3] or None}
+
+    @property
+    def size(self) -> int:
+        return self.bloom.count if self.use_bloom else len(self.keys)
+
+
+def already_done(journal: ActionJournal, action: str, target: str, force: bool = False) -> bool:
+    """Print a notice when the journal has `action` on `target`; True when sending should stop."""
+    if not journal.has(action, target):
+        return False
+    done = {"upvote": "upvoted", "comment": "commented on"}.get(action, f"{action}ed")
+    if force:
+        print(f"⚠ Already {done} post {target} - sending anyway (--force)", file=sys.stderr)
+        return False
+    print(f"✗ Already {done} post {target} (activity journal)", file=sys.stderr)
+    print("  Nothing was sent. Pass --force to send anyway.", file=sys.stderr)
+    return True
+
+
+def stamp(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%d %H:%M")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect the local activity journal")
+    action = parser.add_mutually_exclusive_group(required=True)
+    action.add_argument("--stats", action="store_true", help="Show what the journal holds")
+    action.add_argument("--list", action="store_true", help="List recorded actions, newest first")
+    action.add_argument("--check", nargs=2, metavar=("ACTION", "POST_ID"),
+                        help="Exit 0 if ACTION (post, comment, upvote) was already done on POST_ID, else 1")
+    parser.add_argument("--action", choices=ACTIONS, help="With --list: only this kind of action")
+    parser.add_argument("--limit", type=int, default=20, help="With --list: actions to show (default: 20)")
+    parser.add_argument("--bloom", action="store_true", help="Index with the Bloom filter whatever the size")
+    add_format_argument(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    start_profiling(args)
+
+    start = time.perf_counter()
+    journal = ActionJournal(bloom=True if args.bloom else None)
+    loaded = time.perf_counter() - start
+
+    if args.check:
+        action_name, target = args.check
+        start = time.perf_counter()
+        found = journal.has(action_name, target)
+        elapsed = time.perf_counter() - start
+        print(f"{'✓' if found else '✗ No'} {action_name} on {target} in the journal ({elapsed * 1e6:.0f}µs)")
+        sys.exit(0 if found else 1)
+
+    if args.list:
+        entries = [entry for entry in journal.entries() if not args.action or entry["action"] == args.action]
+        entries = entries[::-1][:args.limit]
+        if args.format == "text":
+            write_text(f"{stamp(entry['at'])}  {entry['action']:<8} {entry['target']}"
+                       f"{'  ' + entry['detail'] if entry['detail'] else ''}\n" for entry in entries)
+        elif args.format == "ndjson":
+            write_ndjson(entries)
+        else:
+            write_json({"actions": entries})
+        return
+
+    counts = {name: 0 for name in ACTIONS}
+    for entry in journal.entries():
+        counts[entry["action"]] = counts.get(entry["action"], 0) + 1
+    stats = {"path": str(journal.path), "actions": counts,
+             "bytes": journal.path.stat().st_size if journal.path.exists() else 0,
+             "index": "bloom" if journal.use_bloom else "hash", "load_ms": round(loaded * 1000, 2)}
+    if args.format != "text":
+        write_json(stats)
+        return
+    print(f"Journal: {journal.path}")
+    print(f"  {', '.join(f'{count} {name}s' for name, count in counts.items())}")
+    print(f"  {stats['bytes'] / 1e6:.2f} MB, {stats['index']} index loaded in {stats['load_ms']}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Shared Moltbook API helpers.
+
+Credentials, retry logic and JSON requests for every script. All traffic
+goes through `open_url`, so a cassette (see cassette.py) can record or
+replay it and `MOLTBOOK_HTTP2=1` can move it onto one multiplexed HTTP/2
+connection (see h2_transport.py). `api_request` waits for a slot from the
+priority scheduler (see scheduler.py) before each attempt.
+"""
+
+import json
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import datetime
+from pathlib import Path
+
+import cassette
+import h2_transport
+import scheduler
+from compression import ACCEPT_ENCODING, fetch
+
+MOLTBOOK_API = "https://moltbook-api.simeon-garratt.workers.dev/v1"
+CREDENTIALS_PATH = Path.home() / ".config" / "moltbook" / "credentials.json"
+USER_AGENT = "moltbook-skill"
+
+_transport = None
+_transport_loaded = False
+_transport_lock = threading.Lock()
+_scheduler = None
+_scheduler_loaded = False
+
+
+def load_credentials() -> dict:
+    """Load Moltbook credentials."""
+    if not CREDENTIALS_PATH.exists():
+        print(f"✗ Credentials not found at {CREDENTIALS_PATH}", file=sys.stderr)
+        print("Run register.py first to create an account", file=sys.stderr)
+        sys.exit(1)
+
+    with open(CREDENTIALS_PATH, 'r') as f:
+        return json.load(f)
+
+
+def resolve_api_key(api_key: str = None) -> str:
+    """Return the given API key or the one from credentials.json."""
+    if not api_key:
+        creds = load_credentials()
+        api_key = creds.get('api_key')
+
+    if not api_key:
+        print("✗ No API key found. Register first with register.py", file=sys.stderr)
+        sys.exit(1)
+
+    return api_key
+
+
+def retry_request(func, max_retries=3, backoff=2):
+    """Retry request with exponential backoff."""
+    for attempt in range(max_retries):
+        try:
+            return func()
+        except urllib.error.HTTPError as e:
+            if e.code == 429:
+                if attempt < max_retries - 1:
+                    wait = backoff ** attempt
+                    print(f"⏳ Rate limited. Waiting {wait}s...", file=sys.stderr)
+                    time.sleep(wait)
+                    continue
+                else:
+                    raise
+            else:
+                raise
+        except cassette.CassetteMiss:
+            raise
+        except urllib.error.URLError as e:
+            if attempt < max_retries - 1:
+                wait = backoff ** attempt
+                print(f"⏳ Connection error. Retrying in {wait}s...", file=sys.stderr)
+                time.sleep(wait)
+                continue
+            else:
+                raise
+    raise Exception("Max retries exceeded")
+
+
+def _load_transport():
+    global _transport, _transport_loaded
+    with _transport_lock:
+        if not _transport_loaded:
+            _transport = cassette.transport_from_env() or h2_transport.transport_from_env()
+            _transport_loaded = True
+    return _transport
+
+
+def open_url(req: urllib.request.Request, timeout: float) -> bytes:
+    """Send a request and return the response body, via the cassette if one is set."""
+    if _load_transport() is not None:
+        return _transport.open(req, timeout)
+    return fetch(req, timeout)
+
+
+def use_transport(transport):
+    """Send all further requests through `transport` (None for plain urllib)."""
+    global _transport, _transport_loaded
+    with _transport_lock:
+        _transport = transport
+        _transport_loaded = True
+
+
+def get_scheduler():
+    """The process-wide request scheduler (None when rate limiting is off or replaying)."""
+    global _scheduler, _scheduler_loaded
+    replaying = isinstance(_load_transport(), cassette.Replayer)
+    with _transport_lock:
+        if not _scheduler_loaded:
+            _scheduler = None if replaying else scheduler.scheduler_from_env()
+            _scheduler_loaded = True
+    return _scheduler
+
+
+def use_scheduler(request_scheduler):
+    """Schedule all further requests with `request_scheduler` (None for unthrottled)."""
+    global _scheduler, _scheduler_loaded
+    with _transport_lock:
+        _scheduler = request_scheduler
+        _scheduler_loaded = True
+
+
+def request_budget(api_key: str = None, priority: int = scheduler.READ, within: float = 0.0):
+    """Requests of `priority` the scheduler could grant `api_key` within `within` seconds (None: unlimited)."""
+    request_scheduler = get_scheduler()
+    if request_scheduler is None:
+        return None
+    return request_scheduler.available(priority, within, api_key or "")
+
+
+def api_request(method: str, path: str, api_key: str = None, params: dict = None,
+                payload: dict = None, timeout: int = 10, max_retries: int = 3,
+                user_agent: str = USER_AGENT, priority: int = None) -> dict:
+    """Make a JSON request (authenticated when `api_key` is given); raises urllib errors.
+
+    `priority` is a scheduler class (WRITE, READ or BACKGROUND); by default
+    GETs are READ and everything else is WRITE.
+    """
+    url = f"{MOLTBOOK_API}{path}"
+    if params:
+        url = f"{url}?{urllib.parse.urlencode(params)}"
+
+    headers = {"User-Agent": user_agent, "Accept-Encoding": ACCEPT_ENCODING}
+    if api_key:
+        headers["Authorization"] = f"Bearer {api_key}"
+    data = None
+    if payload is not None:
+        data = json.dumps(payload).encode('utf-8')
+        headers["Content-Type"] = "application/json"
+
+    if priority is None:
+        priority = scheduler.default_priority(method)
+    request_scheduler = get_scheduler()
+
+    def make_request():
+        if request_scheduler is not None:
+            request_scheduler.acquire(priority, api_key or "")
+        req = urllib.request.Request(url, data=data, headers=headers, method=method)
+        try:
+            body = open_url(req, timeout)
+        except urllib.error.HTTPError as e:
+            if e.code == 429 and request_scheduler is not None:
+                request_scheduler.throttled(api_key or "")
+            raise
+        return json.loads(body.decode('utf-8'))
+
+    return retry_request(make_request, max_retries)
+
+
+def submolt_path(submolt: str) -> str:
+    """Normalize 'general' or 'm/general' to 'm/general'."""
+    return submolt if submolt.startswith("m/") else f"m/{submolt}"
+
+
+def created_at_key(post: dict) -> float:
+    """Sort key for a post's `created_at` (seconds since the epoch, 0 if missing)."""
+    stamp = post.get('created_at') or ''
+    try:
+        return datetime.fromisoformat(stamp.replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return 0.0
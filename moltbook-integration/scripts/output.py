@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Output formats shared by the read commands (`--format text|ndjson|json`).
+
+`text` is the decorated, truncated listing for people. `ndjson` writes one
+complete post object per line and `json` writes the whole result as one
+document, both untruncated. Records are encoded up front and written in
+batches, one `write` per batch rather than several prints per post, so
+piping thousands of posts is bound by I/O rather than by printing.
+Status lines go to stderr in the machine formats, keeping stdout
+parseable.
+"""
+
+import json
+import os
+import sys
+
+FORMATS = ("text", "ndjson", "json")
+BATCH_RECORDS = 256
+
+
+def add_format_argument(parser):
+    parser.add_argument("--format", choices=FORMATS, default="text",
+                        help="text (default), ndjson (one full post per line) or json (one document)")
+
+
+def encode(record) -> str:
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+
+
+def _write(stream, text: str):
+    try:
+        stream.write(text)
+    except BrokenPipeError:
+        # Reader went away (e.g. `| head`): stop quietly, as other CLI tools do
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        sys.exit(0)
+
+
+def write_ndjson(records, stream=None, flush: bool = False):
+    """Write records one per line, batching the writes."""
+    stream = stream or sys.stdout
+    batch = []
+    for record in records:
+        batch.append(encode(record))
+        if len(batch) >= BATCH_RECORDS:
+            _write(stream, "\n".join(batch) + "\n")
+            batch = []
+    if batch:
+        _write(stream, "\n".join(batch) + "\n")
+    if flush:
+        stream.flush()
+
+
+def write_json(document, stream=None):
+    """Write one JSON document."""
+    _write(stream or sys.stdout, encode(document) + "\n")
+
+
+def write_text(blocks, stream=None):
+    """Write pre-rendered text blocks in batches."""
+    stream = stream or sys.stdout
+    batch = []
+    for block in blocks:
+        batch.append(block)
+        if len(batch) >= BATCH_RECORDS:
+            _write(stream, "".join(batch))
+            batch = []
+    if batch:
+        _write(stream, "".join(batch))
+
+
+def status(message: str, fmt: str = "text"):
+    """A summary line: stdout for text, stderr when stdout carries data."""
+    print(message, file=sys.stdout if fmt == "text" else sys.stderr)
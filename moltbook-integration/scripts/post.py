@@ -6,44 +6,27 @@ Usage:
     python scripts/post.py "Your post content here"
     python scripts/post.py "Post content" --submolt general
     python scripts/post.py "Post content" --title "Post Title"
+    python scripts/post.py "Post content" --force    # send even if it is a near-duplicate
     
 Environment:
     MOLTBOOK_API_KEY: Your Moltbook API key (from credentials.json)
 """
 
 import argparse
-import json
-import os
 import sys
-from pathlib import Path
-import urllib.request
 import urllib.error
 
-MOLTBOOK_API = "https://moltbook-api.simeon-garratt.workers.dev/v1"
-CREDENTIALS_PATH = Path.home() / ".config" / "moltbook" / "credentials.json"
+from journal import ActionJournal
+from moltbook_api import api_request, resolve_api_key
+from post_store import PostStore, check_duplicate, post_text
+from profiling import add_profile_arguments, start_profiling
 
 
-def load_credentials() -> dict:
-    """Load Moltbook credentials."""
-    if not CREDENTIALS_PATH.exists():
-        print(f"✗ Credentials not found at {CREDENTIALS_PATH}", file=sys.stderr)
-        print("Run register.py first to create an account", file=sys.stderr)
-        sys.exit(1)
-    
-    with open(CREDENTIALS_PATH, 'r') as f:
-        return json.load(f)
-
-
-def create_post(content: str, submolt: str = None, title: str = None, api_key: str = None) -> dict:
+def create_post(content: str, submolt: str = None, title: str = None, api_key: str = None,
+                force: bool = False) -> dict:
     """Create a post on Moltbook."""
     
-    if not api_key:
-        creds = load_credentials()
-        api_key = creds.get('api_key')
-    
-    if not api_key:
-        print("✗ No API key found. Register first with register.py", file=sys.stderr)
-        sys.exit(1)
+    api_key = resolve_api_key(api_key)
     
     # Prepare post payload
     payload = {"content": content}
@@ -52,30 +35,27 @@ def create_post(content: str, submolt: str = None, title: str = None, api_key: s
     if submolt:
         payload["submolt"] = submolt if submolt.startswith("m/") else f"m/{submolt}"
     
-    # Make post request
-    req = urllib.request.Request(
-        f"{MOLTBOOK_API}/posts",
-        data=json.dumps(payload).encode('utf-8'),
-        headers={
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {api_key}",
-            "User-Agent": "moltbook-skill"
-        }
-    )
+    # Don't spend the 10 posts/hour on something we (or others) already posted
+    store = PostStore()
+    if check_duplicate(store, post_text(payload), force):
+        sys.exit(1)
     
+    # Make post request (no retries: a retried post could be published twice)
     try:
-        with urllib.request.urlopen(req) as response:
-            result = json.loads(response.read().decode('utf-8'))
-            
-            post_id = result.get('id', 'unknown')
-            post_url = result.get('url', f"https://moltbook.com/post/{post_id}")
-            
-            print(f"✓ Post created!")
-            print(f"  ID: {post_id}")
-            print(f"  URL: {post_url}")
-            
-            return result
-            
+        result = api_request("POST", "/posts", api_key, payload=payload, timeout=30, max_retries=1)
+        post_id = result.get('id', 'unknown')
+        post_url = result.get('url', f"https://moltbook.com/post/{post_id}")
+        
+        print(f"✓ Post created!")
+        print(f"  ID: {post_id}")
+        print(f"  URL: {post_url}")
+        
+        store.add("post", post_text(payload), result.get('id'),
+                  submolt=payload.get('submolt'), url=post_url)
+        ActionJournal().record("post", result.get('id'), payload.get('submolt'))
+        
+        return result
+        
     except urllib.error.HTTPError as e:
         error_msg = e.read().decode('utf-8')
         print(f"✗ Post creation failed: {e.code} - {error_msg}", file=sys.stderr)
@@ -91,9 +71,12 @@ def main():
     parser.add_argument("--title", help="Post title (optional)")
     parser.add_argument("--submolt", help="Submolt name (e.g., 'general' or 'm/general')")
     parser.add_argument("--api-key", help="API key (defaults to credentials.json)")
+    parser.add_argument("--force", action="store_true", help="Post even if it is a near-duplicate")
+    add_profile_arguments(parser)
     args = parser.parse_args()
+    start_profiling(args)
     
-    create_post(args.content, args.submolt, args.title, args.api_key)
+    create_post(args.content, args.submolt, args.title, args.api_key, args.force)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Local post store with near-duplicate detection.
+
+Everything we post or comment, plus posts synced from Moltbook, is kept in
+`~/.cache/moltbook/history.jsonl` with a 64-bit SimHash of its text. The
+fingerprints are indexed in LSH buckets (the hash split into bands), so
+`post.py` and `comment.py` can check new content against thousands of
+stored texts in well under a millisecond before spending a post or
+comment from the hourly quota.
+
+Two texts are near-duplicates when their fingerprints differ in at most
+`max_distance` bits (default 7). With max_distance + 1 bands, any such
+pair shares at least one band exactly, so the bucket lookup never misses
+a match.
+
+Usage:
+    python scripts/post_store.py --sync
+    python scripts/post_store.py --sync --submolt general,agentskills --limit 50
+    python scripts/post_store.py --check "Text you are about to post"
+    python scripts/post_store.py --stats
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+import urllib.error
+from datetime import datetime, timezone
+from pathlib import Path
+
+from moltbook_api import api_request, resolve_api_key, submolt_path
+from profiling import add_profile_arguments, start_profiling
+from scheduler import BACKGROUND
+
+STORE_PATH = Path.home() / ".cache" / "moltbook" / "history.jsonl"
+FINGERPRINT_BITS = 64
+DEFAULT_MAX_DISTANCE = 7
+MAX_RECORDS = 50000
+
+WORD_RE = re.compile(r"[a-z0-9']+")
+
+
+def features(text: str) -> list:
+    """Lowercased words of a text, repeats included so they weigh more.
+
+    Posts are short: with word n-grams a single edit changes n features,
+    which pushes reworded copies as far apart as unrelated posts.
+    """
+    return WORD_RE.findall(text.lower())
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash of a text; similar texts get fingerprints a few bits apart."""
+    words = features(text)
+    if not words:
+        return 0
+    # One bit string per feature; counting '1's down each column with a
+    # strided slice keeps the per-bit vote in C instead of a 64-step loop
+    bits = "".join(
+        format(int.from_bytes(hashlib.blake2b(f.encode('utf-8'), digest_size=8).digest(), 'big'), '064b')
+        for f in words
+    )
+    half = len(words) / 2
+    fingerprint = 0
+    for i in range(FINGERPRINT_BITS):
+        fingerprint = (fingerprint << 1) | (bits[i::FINGERPRINT_BITS].count("1") > half)
+    return fingerprint
+
+
+def tail_lines(path: Path, count: int, block_size: int = 1 << 16) -> list:
+    """The last `count` lines of a file, read backwards from the end.
+
+    Cost depends on `count`, not on the file's size, so an ever-growing
+    history doesn't slow down every post.py/comment.py startup.
+    """
+    blocks = []
+    newlines = 0
+    with open(path, 'rb') as f:
+        end = f.seek(0, os.SEEK_END)
+        # One newline more than needed, so the oldest line kept is complete
+        while end > 0 and newlines <= count:
+            start = max(0, end - block_size)
+            f.seek(start)
+            block = f.read(end - start)
+            newlines += block.count(b"\n")
+            blocks.append(block)
+            end = start
+    lines = b"".join(reversed(blocks)).split(b"\n")
+    if lines and not lines[-1]:
+        lines.pop()
+    if end > 0:
+        lines = lines[1:]
+    return [line.decode('utf-8', errors='replace') for line in lines[-count:]]
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+class SimHashIndex:
+    """LSH buckets over SimHash fingerprints for near-duplicate lookups."""
+
+    def __init__(self, max_distance: int = DEFAULT_MAX_DISTANCE):
+        if not 0 <= max_distance < FINGERPRINT_BITS // 4:
+            raise ValueError(f"max_distance must be between 0 and {FINGERPRINT_BITS // 4 - 1}")
+        self.max_distance = max_distance
+        # Pigeonhole: max_distance differing bits leave at least one band intact
+        bands = max_distance + 1
+        edges = [FINGERPRINT_BITS * i // bands for i in range(bands + 1)]
+        self.bands = [
+            (FINGERPRINT_BITS - end, (1 << (end - start)) - 1)
+            for start, end in zip(edges, edges[1:])
+        ]
+        self.buckets = [{} for _ in self.bands]
+        self.size = 0
+
+    def add(self, fingerprint: int, record: dict):
+        for buckets, (shift, mask) in zip(self.buckets, self.bands):
+            buckets.setdefault((fingerprint >> shift) & mask, []).append((fingerprint, record))
+        self.size += 1
+
+    def query(self, fingerprint: int) -> list:
+        """Stored (distance, record) pairs within max_distance, closest first."""
+        found = {}
+        for buckets, (shift, mask) in zip(self.buckets, self.bands):
+            for candidate, record in buckets.get((fingerprint >> shift) & mask, ()):
+                distance = hamming(fingerprint, candidate)
+                if distance <= self.max_distance:
+                    found[id(record)] = (distance, record)
+        return sorted(found.values(), key=lambda match: match[0])
+
+
+class PostStore:
+    """Our posting history and synced posts, indexed for near-duplicate checks."""
+
+    def __init__(self, path: Path = STORE_PATH, max_distance: int = DEFAULT_MAX_DISTANCE):
+        self.path = Path(path) if path else None
+        self.index = SimHashIndex(max_distance)
+        self.ids = set()
+        self.own = 0
+        if self.path and self.path.exists():
+            self.load()
+
+    def load(self):
+        """Index the newest MAX_RECORDS entries, read from the end of the file."""
+        for line in tail_lines(self.path, MAX_RECORDS):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            self._index(record)
+
+    def _index(self, record: dict):
+        if record.get('id'):
+            self.ids.add((record.get('kind'), record['id']))
+        if record.get('source') == "own":
+            self.own += 1
+        self.index.add(int(record['simhash'], 16), record)
+
+    def find_similar(self, text: str):
+        """Closest stored (distance, record) for `text`, or None."""
+        if not features(text):
+            return None
+        matches = self.index.query(simhash(text))
+        return matches[0] if matches else None
+
+    def add(self, kind: str, text: str, item_id: str = None, source: str = "own", **extra) -> bool:
+        """Store a post or comment; returns False when it is already stored."""
+        if item_id and (kind, item_id) in self.ids:
+            return False
+        record = {
+            "kind": kind,
+            "id": item_id,
+            "source": source,
+            "simhash": format(simhash(text), '016x'),
+            "text": text,
+            "stored_at": datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        }
+        record.update(extra)
+        self._index(record)
+        if self.path:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'a') as f:
+                f.write(json.dumps(record) + "\n")
+        return True
+
+    @property
+    def size(self) -> int:
+        return self.index.size
+
+
+def post_text(post: dict) -> str:
+    """Text that identifies a post for similarity: title and content."""
+    return "\n".join(part for part in (post.get('title'), post.get('content')) if part)
+
+
+def describe_match(match: tuple) -> str:
+    distance, record = match
+    whose = "your" if record.get('source') == "own" else "a synced"
+    label = f"{whose} {record.get('kind', 'post')}"
+    if record.get('id'):
+        label += f" {record['id']}"
+    exact = "identical" if distance == 0 else f"{distance} bits apart"
+    snippet = record.get('text', '').replace('\n', ' ')[:80]
+    return f"Near-duplicate of {label} ({exact}): \"{snippet}\""
+
+
+def check_duplicate(store: PostStore, text: str, force: bool = False) -> bool:
+    """Print a warning for near-duplicate text; returns True when sending should stop."""
+    match = store.find_similar(text)
+    if match is None:
+        return False
+    if force:
+        print(f"⚠ {describe_match(match)} - sending anyway (--force)", file=sys.stderr)
+        return False
+    print(f"✗ {describe_match(match)}", file=sys.stderr)
+    print("  Nothing was sent. Rephrase it, or pass --force to send anyway.", file=sys.stderr)
+    return True
+
+
+def sync(store: PostStore, api_key: str, submolts: list = None, limit: int = 50) -> dict:
+    """Add our own recent posts, and optionally submolt posts, to the store."""
+    feeds = [("own", "/users/me/posts")]
+    feeds += [("synced", f"/submolts/{submolt_path(name)}/posts") for name in submolts or []]
+
+    stats = {"added": 0, "known": 0, "failed": []}
+    for source, path in feeds:
+        try:
+            result = api_request("GET", path, api_key, {"limit": limit}, priority=BACKGROUND)
+        except (urllib.error.URLError, ValueError) as e:
+            print(f"⚠ Could not sync {path}: {e}", file=sys.stderr)
+            stats["failed"].append(path)
+            continue
+        for post in result.get('posts', []):
+            added = store.add("post", post_text(post), post.get('id'), source,
+                              submolt=post.get('submolt'), created_at=post.get('created_at'),
+                              author=(post.get('author') or {}).get('username'), url=post.get('url'))
+            stats["added" if added else "known"] += 1
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local post store for near-duplicate checks")
+    action = parser.add_mutually_exclusive_group(required=True)
+    action.add_argument("--sync", action="store_true", help="Store your recent posts (and --submolt posts)")
+    action.add_argument("--check", metavar="TEXT", help="Check text against the store without sending it")
+    action.add_argument("--stats", action="store_true", help="Show what the store holds")
+    parser.add_argument("--submolt", help="Also sync these submolts (comma-separated)")
+    parser.add_argument("--limit", type=int, default=50, help="Posts to sync per feed (default: 50)")
+    parser.add_argument("--max-distance", type=int, default=DEFAULT_MAX_DISTANCE,
+                        help="Differing fingerprint bits still counted as a duplicate (default: 7)")
+    parser.add_argument("--api-key", help="API key (defaults to credentials.json)")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    start_profiling(args)
+
+    try:
+        store = PostStore(max_distance=args.max_distance)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.sync:
+        submolts = [name.strip() for name in (args.submolt or "").split(",") if name.strip()]
+        stats = sync(store, resolve_api_key(args.api_key), submolts, args.limit)
+        print(f"✓ Synced {stats['added']} new posts ({stats['known']} already stored, "
+              f"{store.size} total)")
+        if stats["failed"]:
+            sys.exit(1)
+    elif args.check is not None:
+        start = time.perf_counter()
+        match = store.find_similar(args.check)
+        elapsed = time.perf_counter() - start
+        if match is None:
+            print(f"✓ No near-duplicate among {store.size} stored texts ({elapsed * 1000:.2f}ms)")
+        else:
+            print(f"✗ {describe_match(match)} ({elapsed * 1000:.2f}ms)")
+            sys.exit(1)
+    else:
+        print(f"Store: {store.path}")
+        print(f"  {store.size} texts ({store.own} yours, {store.size - store.own} synced)")
+        print(f"  {len(store.index.bands)} LSH bands, max distance {store.index.max_distance} bits")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Author profile cache with concurrent prefetch.
+
+Feed and search results only carry `author.username`/`id`. ProfileCache
+fetches `GET /users/{username}` for every unseen author of a page at once,
+so enriching a 50-post page costs one round trip instead of 50:
+
+    cache = ProfileCache(api_key)
+    cache.enrich(posts)              # adds post['author_profile']
+    cache.save()                     # reuse across runs until the TTL expires
+
+Entries expire after a TTL and the least recently used are evicted beyond
+`max_entries`. Concurrent lookups of the same author share one request.
+
+Enrichment is optional, so it stays within the request budget (see
+scheduler.py): it fetches only as many authors as the budget can grant
+within a few seconds. The rest are deferred, not queued, and show up
+without a profile until a later run fetches them.
+
+Usage:
+    python scripts/profile_cache.py AgentOne AgentTwo
+    python scripts/profile_cache.py --clear
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from moltbook_api import api_request, request_budget, resolve_api_key
+from profiling import add_profile_arguments, start_profiling
+
+CACHE_PATH = Path.home() / ".cache" / "moltbook" / "profiles.json"
+DEFAULT_TTL = 600
+MISSING_TTL = 60
+# Enough to fetch every author of a full 50-post page in one wave
+MAX_PREFETCH_WORKERS = 50
+# Longest enrichment waits for request budget; authors beyond it are deferred
+BUDGET_WAIT = 3.0
+# Allowance for the fetches themselves once started
+FETCH_TIMEOUT = 15
+
+
+class ProfileCache:
+    """TTL/LRU cache of user profiles with single-flight concurrent fetching."""
+
+    def __init__(self, api_key: str, ttl: float = DEFAULT_TTL, max_entries: int = 5000,
+                 max_workers: int = MAX_PREFETCH_WORKERS, path: Path = CACHE_PATH):
+        self.api_key = api_key
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_workers = max_workers
+        self.path = Path(path) if path else None
+        # username -> (expires_at, profile or None for unknown users)
+        self.entries = OrderedDict()
+        self.inflight = {}
+        # Re-entrant: a done-callback can run inline while prefetch holds the lock
+        self.lock = threading.RLock()
+        self.pool = None
+        self.stats = {"hits": 0, "fetches": 0, "errors": 0, "deferred": 0}
+
+        if self.path and self.path.exists():
+            self.load()
+
+    def load(self):
+        """Load unexpired entries saved by a previous run."""
+        try:
+            with open(self.path, 'r') as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        now = time.time()
+        for username, (expires_at, profile) in saved.items():
+            if expires_at > now:
+                self.entries[username] = (expires_at, profile)
+        self._evict()
+
+    def save(self):
+        """Persist unexpired entries for the next run."""
+        if not self.path:
+            return
+        now = time.time()
+        with self.lock:
+            live = {u: list(entry) for u, entry in self.entries.items() if entry[0] > now}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'w') as f:
+            json.dump(live, f)
+
+    def _evict(self):
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def _cached(self, username: str):
+        """Return (hit, profile) and refresh LRU order; caller holds the lock."""
+        entry = self.entries.get(username)
+        if entry is None:
+            return False, None
+        if entry[0] <= time.time():
+            del self.entries[username]
+            return False, None
+        self.entries.move_to_end(username)
+        return True, entry[1]
+
+    def _fetch(self, username: str):
+        try:
+            profile = api_request("GET", f"/users/{urllib.parse.quote(username)}", self.api_key)
+            ttl = self.ttl
+        except urllib.error.HTTPError as e:
+            if e.code != 404:
+                raise
+            profile, ttl = None, MISSING_TTL
+        with self.lock:
+            self.stats["fetches"] += 1
+            self.entries[username] = (time.time() + ttl, profile)
+            self.entries.move_to_end(username)
+            self._evict()
+        return profile
+
+    def _done(self, username: str, future: Future):
+        with self.lock:
+            self.inflight.pop(username, None)
+
+    def prefetch(self, usernames, limit: int = None) -> dict:
+        """Start fetching uncached authors, at most `limit` new ones; returns {username: Future}.
+
+        Authors beyond `limit` are left out of the result.
+        """
+        futures = {}
+        with self.lock:
+            for username in dict.fromkeys(u for u in usernames if u):
+                hit, profile = self._cached(username)
+                if hit:
+                    self.stats["hits"] += 1
+                    future = Future()
+                    future.set_result(profile)
+                elif username in self.inflight:
+                    # Single flight: join the request already under way
+                    future = self.inflight[username]
+                elif limit is not None and limit <= 0:
+                    continue
+                else:
+                    if limit is not None:
+                        limit -= 1
+                    if self.pool is None:
+                        self.pool = ThreadPoolExecutor(max_workers=self.max_workers)
+                    future = self.pool.submit(self._fetch, username)
+                    self.inflight[username] = future
+                    future.add_done_callback(lambda f, u=username: self._done(u, f))
+                futures[username] = future
+        return futures
+
+    def get_many(self, usernames, max_wait: float = BUDGET_WAIT) -> dict:
+        """Profiles for `usernames` (None when unknown, failed to load or deferred).
+
+        Only fetches the request budget can grant within `max_wait` seconds
+        are started; None waits for every one.
+        """
+        limit = None if max_wait is None else request_budget(self.api_key, within=max_wait)
+        futures = self.prefetch(usernames, limit)
+        wait(futures.values(), timeout=None if max_wait is None else max_wait + FETCH_TIMEOUT)
+        profiles = {}
+        for username in dict.fromkeys(u for u in usernames if u):
+            future = futures.get(username)
+            if future is None:
+                profiles[username] = None
+                self.stats["deferred"] += 1
+            elif future.done() and future.exception() is None:
+                profiles[username] = future.result()
+            else:
+                profiles[username] = None
+                self.stats["errors"] += 1
+        return profiles
+
+    def get(self, username: str, max_wait: float = BUDGET_WAIT):
+        return self.get_many([username], max_wait)[username]
+
+    def enrich(self, posts: list, max_wait: float = BUDGET_WAIT) -> list:
+        """Attach `author_profile` to each post, fetching unseen authors concurrently."""
+        authors = [(post.get('author') or {}).get('username') for post in posts]
+        profiles = self.get_many(authors, max_wait)
+        for post, author in zip(posts, authors):
+            post['author_profile'] = profiles.get(author)
+        return posts
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=False)
+            self.pool = None
+
+
+def enrich_posts(posts: list, api_key: str) -> ProfileCache:
+    """Enrich posts with author profiles using the shared on-disk cache."""
+    cache = ProfileCache(api_key)
+    try:
+        cache.enrich(posts)
+        if cache.stats["errors"]:
+            print(f"⚠ {cache.stats['errors']} author profiles could not be loaded", file=sys.stderr)
+        if cache.stats["deferred"]:
+            print(f"⚠ {cache.stats['deferred']} author profiles deferred to stay within the request budget "
+                  "(later runs fill them in)", file=sys.stderr)
+        cache.save()
+    finally:
+        cache.close()
+    return cache
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Look up Moltbook author profiles through the local cache")
+    parser.add_argument("usernames", nargs="*", help="Usernames to look up")
+    parser.add_argument("--clear", action="store_true", help="Delete the profile cache")
+    parser.add_argument("--api-key", help="API key (defaults to credentials.json)")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    start_profiling(args)
+
+    if args.clear:
+        if CACHE_PATH.exists():
+            CACHE_PATH.unlink()
+        print(f"✓ Cleared {CACHE_PATH}")
+        return
+
+    if not args.usernames:
+        print("Error: Provide at least one username (or --clear)", file=sys.stderr)
+        sys.exit(1)
+
+    cache = ProfileCache(resolve_api_key(args.api_key))
+    try:
+        start = time.perf_counter()
+        # Asked for by name: wait for the budget rather than deferring
+        profiles = cache.get_many(args.usernames, max_wait=None)
+        elapsed = time.perf_counter() - start
+        cache.save()
+    finally:
+        cache.close()
+
+    for username, profile in profiles.items():
+        if profile is None:
+            print(f"✗ u/{username}: not found")
+            continue
+        verified = " ✓" if profile.get('verified') else ""
+        print(f"u/{username}{verified} • karma {profile.get('karma', 0)} • "
+              f"{profile.get('followers', 0)} followers")
+    print(f"\n{cache.stats['hits']} cached, {cache.stats['fetches']} fetched in {elapsed * 1000:.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Host-wide request budgets shared by every script process.
+
+Each process used to pace itself, so ten agent processes on one key sent
+ten times the budget, hit 429s together and backed off together. The
+token buckets now live in a small SQLite table (WAL mode) that all
+processes on the host draw from, one row per API key (keyed by a hash of
+the key, never the key itself), since the API limits each key separately.
+A refill-and-take is one short `BEGIN IMMEDIATE` transaction, so it is
+atomic across processes and costs tens of microseconds.
+
+Only the token count is shared. Which request gets the next token is
+decided in each process (see scheduler.py); across processes it is first
+come, first served, apart from the headroom background requests leave.
+
+Environment:
+    MOLTBOOK_RATE_STORE    bucket database path, or "none" for a per-process
+                           budget (default: ~/.cache/moltbook/ratelimit.sqlite)
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+RATE_STORE_ENV = "MOLTBOOK_RATE_STORE"
+RATE_STORE_PATH = Path.home() / ".cache" / "moltbook" / "ratelimit.sqlite"
+
+
+def bucket_key(api_key: str) -> str:
+    """Row key for an API key's bucket; requests without a key share one."""
+    if not api_key:
+        return "anonymous"
+    return "key:" + hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:16]
+
+
+class SharedTokenBucket:
+    """One API key's token bucket, stored in SQLite and drawn from atomically by every process."""
+
+    def __init__(self, path, per_minute: float, burst: int = 5, api_key: str = "", clock=time.time):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.rate = per_minute / 60.0
+        self.capacity = max(1, burst)
+        self.key = bucket_key(api_key)
+        # Wall clock: it is the one clock every process agrees on
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(str(path), timeout=10, isolation_level=None, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        # Losing the bucket in a power cut is harmless; skip the fsyncs
+        self.db.execute("PRAGMA synchronous=OFF")
+        self.db.execute("CREATE TABLE IF NOT EXISTS buckets "
+                        "(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)")
+
+    def _update(self, change):
+        """Refill, apply `change(tokens) -> (tokens, result)` and store, in one transaction."""
+        with self.lock:
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self.db.execute("SELECT tokens, updated FROM buckets WHERE key = ?",
+                                      (self.key,)).fetchone()
+                now = self.clock()
+                tokens = float(self.capacity)
+                if row is not None:
+                    tokens = min(self.capacity, row[0] + max(0.0, now - row[1]) * self.rate)
+                tokens, result = change(tokens)
+                self.db.execute("INSERT OR REPLACE INTO buckets (key, tokens, updated) VALUES (?, ?, ?)",
+                                (self.key, tokens, now))
+                self.db.execute("COMMIT")
+            except BaseException:
+                self.db.execute("ROLLBACK")
+                raise
+        return result
+
+    def try_take(self, tokens: float = 1) -> float:
+        """Take a token if `tokens` are available; otherwise seconds to wait before retrying."""
+        def change(available):
+            if available >= tokens:
+                return available - 1, 0.0
+            return available, (tokens - available) / self.rate
+        return self._update(change)
+
+    def peek(self) -> float:
+        """Tokens available now, taking none."""
+        return self._update(lambda available: (available, available))
+
+    def drain(self):
+        self._update(lambda available: (min(available, 0.0), None))
+
+    def close(self):
+        self.db.close()
@@ -5,91 +5,153 @@ Read Moltbook feed.
 Usage:
     python scripts/read_feed.py
     python scripts/read_feed.py --submolt general
+    python scripts/read_feed.py --submolt general,agentskills,showandtell --limit 30
+    python scripts/read_feed.py --submolts-file watched.txt
     python scripts/read_feed.py --limit 20
     python scripts/read_feed.py --profile
-    
+    python scripts/read_feed.py --submolt general,agentskills --sort influence
+    python scripts/read_feed.py --watch --submolt general,agentskills --track
+    python scripts/read_feed.py --submolt general,agentskills --limit 1000 --format ndjson > posts.ndjson
+
 Environment:
     MOLTBOOK_API_KEY: Your Moltbook API key (from credentials.json)
 """
 
 import argparse
-import json
-import os
+import heapq
+import itertools
 import sys
-from pathlib import Path
-import urllib.request
 import urllib.error
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
-MOLTBOOK_API = "https://moltbook-api.simeon-garratt.workers.dev/v1"
-CREDENTIALS_PATH = Path.home() / ".config" / "moltbook" / "credentials.json"
-
+from feed_watch import FeedWatcher
+from moltbook_api import api_request, created_at_key, resolve_api_key, submolt_path
+from output import add_format_argument, status, write_json, write_ndjson, write_text
+from profile_cache import enrich_posts
+from profiling import add_profile_arguments, start_profiling
+from rules import apply_rules, describe_outcome, load_runner
+from scheduler import BACKGROUND, READ
 
-def load_credentials() -> dict:
-    """Load Moltbook credentials."""
-    if not CREDENTIALS_PATH.exists():
-        print(f"✗ Credentials not found at {CREDENTIALS_PATH}", file=sys.stderr)
-        print("Run register.py first to create an account", file=sys.stderr)
-        sys.exit(1)
-    
-    with open(CREDENTIALS_PATH, 'r') as f:
-        return json.load(f)
+MAX_FETCH_WORKERS = 8
 
 
-def read_feed(submolt: str = None, limit: int = 10, profile: bool = False, api_key: str = None) -> dict:
-    """Read Moltbook feed."""
-    
-    if not api_key:
-        creds = load_credentials()
-        api_key = creds.get('api_key')
-    
-    if not api_key:
-        print("✗ No API key found. Register first with register.py", file=sys.stderr)
-        sys.exit(1)
-    
-    # Build URL
+def feed_path(submolt: str = None, profile: bool = False) -> str:
+    """API path for the main feed, a submolt, or your own posts."""
     if profile:
-        creds = load_credentials()
-        url = f"{MOLTBOOK_API}/users/me/posts?limit={limit}"
-    elif submolt:
-        submolt_path = submolt if submolt.startswith("m/") else f"m/{submolt}"
-        url = f"{MOLTBOOK_API}/submolts/{submolt_path}/posts?limit={limit}"
+        return "/users/me/posts"
+    if submolt:
+        return f"/submolts/{submolt_path(submolt)}/posts"
+    return "/feed"
+
+
+def fetch_page(path: str, api_key: str, limit: int, cursor: str = None, priority: int = READ) -> tuple:
+    """Fetch one page of posts, returning (posts, next_cursor)."""
+    params = {"limit": limit}
+    if cursor:
+        params["cursor"] = cursor
+    result = api_request("GET", path, api_key, params, priority=priority)
+    return result.get('posts', []), (result.get('pagination') or {}).get('next')
+
+
+def iter_feed(path: str, api_key: str, page_size: int, first_page: tuple, stats: dict):
+    """Yield a feed's posts newest first, fetching further pages only on demand."""
+    posts, cursor = first_page
+    while True:
+        yield from posts
+        if not posts or not cursor:
+            return
+        try:
+            posts, cursor = fetch_page(path, api_key, page_size, cursor)
+        except (urllib.error.URLError, ValueError) as e:
+            print(f"⚠ Stopped paging {path}: {e}", file=sys.stderr)
+            return
+        stats["pages"] += 1
+
+
+def merge_feeds(submolts: list, limit: int, api_key: str, page_size: int = None) -> tuple:
+    """Newest `limit` posts across submolts, returning (posts, stats).
+
+    First pages are fetched concurrently; after that a k-way heap merge
+    pulls posts lazily, so a submolt is only paged further while its posts
+    are still making the cut.
+    """
+    page_size = page_size or limit
+    paths = [feed_path(submolt) for submolt in submolts]
+    stats = {"pages": 0, "failed": []}
+
+    def first_page(path):
+        try:
+            return fetch_page(path, api_key, page_size)
+        except (urllib.error.URLError, ValueError) as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(paths))) as pool:
+        pages = list(pool.map(first_page, paths))
+
+    feeds = []
+    for submolt, path, page in zip(submolts, paths, pages):
+        if isinstance(page, Exception):
+            print(f"⚠ Could not read {submolt_path(submolt)}: {page}", file=sys.stderr)
+            stats["failed"].append(submolt)
+            continue
+        stats["pages"] += 1
+        feeds.append(iter_feed(path, api_key, page_size, page, stats))
+
+    seen = set()
+    merged = heapq.merge(*feeds, key=created_at_key, reverse=True)
+    unique = (post for post in merged if not (post.get('id') in seen or seen.add(post.get('id'))))
+    return list(itertools.islice(unique, limit)), stats
+
+
+def render_post(post: dict, show_submolt: bool = False) -> str:
+    """One post as a text block, with its rule outcome when one was recorded."""
+    author = post.get('author', {}).get('username', 'unknown')
+    content = post.get('content', '')[:200]
+    upvotes = post.get('upvotes', 0)
+    comments = post.get('comment_count', 0)
+    post_url = post.get('url', '')
+
+    where = f"{post.get('submolt', '')} • " if show_submolt else ""
+    profile = post.get('author_profile')
+    karma = f" (karma {profile.get('karma', 0)})" if profile else ""
+    influence = f" • influence {post['author_influence']:.2f}" if 'author_influence' in post else ""
+    lines = [f"u/{author}{karma}{influence} • {where}⬆ {upvotes} • 💬 {comments}"]
+    if post.get('title'):
+        lines.append(f"  {post['title']}")
+    lines.append(f"  {content}{'...' if len(post.get('content', '')) > 200 else ''}")
+    outcome = describe_outcome(post)
+    if outcome:
+        lines.append(f"  {outcome}")
+    lines.append(f"  {post_url}\n\n")
+    return "\n".join(lines)
+
+
+def print_posts(heading: str, posts: list, show_submolt: bool = False, fmt: str = "text",
+                document: dict = None):
+    """Write posts as text, NDJSON (one full post per line) or one JSON `document`."""
+    if fmt == "text":
+        write_text(itertools.chain(
+            [f"{'='*60}\n{heading} ({len(posts)} posts)\n{'='*60}\n\n"],
+            (render_post(post, show_submolt) for post in posts)
+        ))
+        return
+
+    if fmt == "ndjson":
+        write_ndjson(posts)
     else:
-        url = f"{MOLTBOOK_API}/feed?limit={limit}"
-    
-    # Make request
-    req = urllib.request.Request(
-        url,
-        headers={
-            "Authorization": f"Bearer {api_key}",
-            "User-Agent": "moltbook-skill"
-        }
-    )
-    
+        write_json(document if document is not None else {"posts": posts})
+
+
+def read_feed(submolt: str = None, limit: int = 10, profile: bool = False, api_key: str = None,
+              with_profiles: bool = False, rules=None, fmt: str = "text", sort: str = "default",
+              track: bool = False) -> dict:
+    """Read Moltbook feed."""
+
+    api_key = resolve_api_key(api_key)
+
     try:
-        with urllib.request.urlopen(req) as response:
-            result = json.loads(response.read().decode('utf-8'))
-            
-            # Pretty print posts
-            posts = result.get('posts', [])
-            print(f"{'='*60}")
-            print(f"{'Profile Posts' if profile else submolt or 'Feed'} ({len(posts)} posts)")
-            print(f"{'='*60}\n")
-            
-            for post in posts:
-                author = post.get('author', {}).get('username', 'unknown')
-                content = post.get('content', '')[:200]
-                upvotes = post.get('upvotes', 0)
-                comments = post.get('comment_count', 0)
-                post_url = post.get('url', '')
-                
-                print(f"u/{author} • ⬆ {upvotes} • 💬 {comments}")
-                if post.get('title'):
-                    print(f"  {post['title']}")
-                print(f"  {content}{'...' if len(post.get('content', '')) > 200 else ''}")
-                print(f"  {post_url}\n")
-            
-            return result
-            
+        result = api_request("GET", feed_path(submolt, profile), api_key, {"limit": limit})
     except urllib.error.HTTPError as e:
         error_msg = e.read().decode('utf-8')
         print(f"✗ Feed read failed: {e.code} - {error_msg}", file=sys.stderr)
@@ -98,16 +160,178 @@ def read_feed(submolt: str = None, limit: int = 10, profile: bool = False, api_k
         print(f"✗ Feed read failed: {str(e)}", file=sys.stderr)
         sys.exit(1)
 
+    if track:
+        # Imported here, as they pull in numpy
+        from engagement import record_snapshot
+        record_snapshot(result.get('posts', []))
+    if with_profiles:
+        enrich_posts(result.get('posts', []), api_key)
+    if sort == "influence":
+        from influence import rank_by_influence
+        rank_by_influence(result.get('posts', []))
+    if rules:
+        apply_rules(rules, result.get('posts', []))
+    print_posts('Profile Posts' if profile else submolt or 'Feed', result.get('posts', []), fmt=fmt,
+                document=result)
+    return result
+
+
+def read_submolts(submolts: list, limit: int = 10, api_key: str = None, page_size: int = None,
+                  with_profiles: bool = False, rules=None, fmt: str = "text", sort: str = "default",
+                  track: bool = False) -> dict:
+    """Read a combined timeline of several submolts, newest first."""
+
+    api_key = resolve_api_key(api_key)
+    posts, stats = merge_feeds(submolts, limit, api_key, page_size)
+
+    if len(stats["failed"]) == len(submolts):
+        print("✗ Feed read failed for every submolt", file=sys.stderr)
+        sys.exit(1)
+
+    if track:
+        from engagement import record_snapshot
+        record_snapshot(posts)
+    if with_profiles:
+        enrich_posts(posts, api_key)
+    if sort == "influence":
+        from influence import rank_by_influence
+        rank_by_influence(posts)
+    if rules:
+        apply_rules(rules, posts)
+    result = {"posts": posts, "submolts": submolts, "pages_fetched": stats["pages"]}
+    print_posts(f"{len(submolts)} submolts", posts, show_submolt=True, fmt=fmt, document=result)
+    status(f"✓ Merged {len(submolts) - len(stats['failed'])} submolts in {stats['pages']} page requests", fmt)
+    return result
+
+
+def print_new_post(feed_name: str, post: dict, fmt: str = "text"):
+    """Print one post as a single line, flushed, for streaming consumers."""
+    if fmt != "text":
+        write_ndjson([dict(post, feed=feed_name)], flush=True)
+        return
+    author = post.get('author', {}).get('username', 'unknown')
+    text = (post.get('title') or post.get('content') or '').replace('\n', ' ')[:100]
+    outcome = describe_outcome(post)
+    print(f"[{feed_name}] u/{author} • {text} • {post.get('url', '')}"
+          f"{f' {outcome}' if outcome else ''}", flush=True)
+
+
+def watch_feeds(submolts: list, api_key: str = None, page_size: int = 25, budget: float = 60,
+                min_interval: float = 15, max_interval: float = 600, duration: float = None,
+                rules=None, fmt: str = "text", track: bool = False) -> dict:
+    """Stream new posts from the feed or submolts until interrupted."""
+
+    api_key = resolve_api_key(api_key)
+    feeds = [(name, feed_path(name)) for name in submolts] or [("feed", feed_path())]
+    tracker = None
+    if track:
+        from engagement import EngagementStore, record_snapshot
+        tracker = EngagementStore()
+
+    def fetch(path, limit, cursor):
+        # Polling is background work: interactive requests go first
+        page = fetch_page(path, api_key, limit, cursor, BACKGROUND)
+        if tracker:
+            # Every poll re-reads posts already seen: a free engagement snapshot
+            record_snapshot(page[0], tracker)
+        return page
+
+    def emit(feed_name, post):
+        if rules:
+            apply_rules(rules, [post])
+        print_new_post(feed_name, post, fmt)
+
+    watcher = FeedWatcher(
+        feeds,
+        fetch=fetch,
+        emit=emit,
+        page_size=page_size,
+        budget=budget,
+        min_interval=min_interval,
+        max_interval=max_interval
+    )
+    print(f"👀 Watching {len(feeds)} feed(s) within {budget:g} requests/minute (Ctrl-C to stop)",
+          file=sys.stderr)
+    stats = watcher.run(duration)
+
+    print(f"✓ {stats['requests']} requests in {stats['seconds']:.0f}s "
+          f"({stats['requests_per_minute']:.1f}/min)", file=sys.stderr)
+    for name, feed in stats["feeds"].items():
+        print(f"  {name}: {feed['emitted']} new posts, {feed['polls']} polls, "
+              f"every {feed['interval_s']:.0f}s", file=sys.stderr)
+    return stats
+
+
+def load_submolts(value: str = None, file_path: str = None) -> list:
+    """Collect submolt names from a comma-separated list and/or a file (one per line)."""
+    names = [name.strip() for name in (value or "").split(",")]
+    if file_path:
+        with open(file_path, 'r') as f:
+            names.extend(line.split("#", 1)[0].strip() for line in f)
+    # Keep the first occurrence of each submolt
+    return list(dict.fromkeys(submolt_path(name) for name in names if name))
+
 
 def main():
     parser = argparse.ArgumentParser(description="Read Moltbook feed")
-    parser.add_argument("--submolt", help="Submolt name (e.g., 'general')")
+    parser.add_argument("--submolt", help="Submolt name, or several comma-separated (e.g., 'general,agentskills')")
+    parser.add_argument("--submolts-file", help="File listing submolts to merge, one per line")
     parser.add_argument("--limit", type=int, default=10, help="Number of posts to fetch")
+    parser.add_argument("--page-size", type=int,
+                        help="Posts per request when merging submolts (default: --limit)")
     parser.add_argument("--profile", action="store_true", help="Read your own posts")
+    parser.add_argument("--with-profiles", action="store_true",
+                        help="Fetch author profiles (karma) for the posts, via the profile cache")
+    parser.add_argument("--sort", choices=("default", "influence"), default="default",
+                        help="Order posts as the API returns them (default) or by author influence")
+    parser.add_argument("--track", action="store_true",
+                        help="Record the posts' upvote/comment counts for engagement.py")
     parser.add_argument("--api-key", help="API key (defaults to credentials.json)")
+    parser.add_argument("--rules", help="Keyword rules file: show each post's matching action")
+    parser.add_argument("--apply-rules", action="store_true", help="Carry out matched upvote/comment actions")
+    parser.add_argument("--max-actions", type=int, default=5,
+                        help="Most rule actions to carry out per run (default: 5)")
+    add_format_argument(parser)
+
+    watch = parser.add_argument_group("watch mode")
+    watch.add_argument("--watch", action="store_true", help="Keep polling and print only new posts")
+    watch.add_argument("--budget", type=float, default=60,
+                       help="Requests per minute shared by all feeds (default: 60 of the 100 limit)")
+    watch.add_argument("--min-interval", type=float, default=15, help="Fastest poll per feed in seconds")
+    watch.add_argument("--max-interval", type=float, default=600, help="Slowest poll per feed in seconds")
+    watch.add_argument("--duration", type=float, help="Stop watching after this many seconds")
+    add_profile_arguments(parser)
     args = parser.parse_args()
-    
-    read_feed(args.submolt, args.limit, args.profile, args.api_key)
+    start_profiling(args)
+
+    if args.submolts_file and not Path(args.submolts_file).exists():
+        print(f"✗ File not found: {args.submolts_file}", file=sys.stderr)
+        sys.exit(1)
+
+    submolts = load_submolts(args.submolt, args.submolts_file)
+
+    rules = None
+    if args.rules:
+        rules = load_runner(args.rules, resolve_api_key(args.api_key), args.apply_rules, args.max_actions)
+    elif args.apply_rules:
+        print("Error: --apply-rules needs --rules", file=sys.stderr)
+        sys.exit(1)
+
+    if args.watch:
+        if not 0 < args.budget <= 100:
+            print("Error: --budget must be between 0 and 100 requests/minute", file=sys.stderr)
+            sys.exit(1)
+        if args.format == "json":
+            print("Error: --watch streams posts; use --format ndjson", file=sys.stderr)
+            sys.exit(1)
+        watch_feeds(submolts, args.api_key, args.page_size or 25, args.budget,
+                    args.min_interval, args.max_interval, args.duration, rules, args.format, args.track)
+    elif len(submolts) > 1 and not args.profile:
+        read_submolts(submolts, args.limit, args.api_key, args.page_size, args.with_profiles, rules,
+                      args.format, args.sort, args.track)
+    else:
+        read_feed(submolts[0] if submolts else None, args.limit, args.profile, args.api_key,
+                  args.with_profiles, rules, args.format, args.sort, args.track)
 
 
 if __name__ == "__main__":
@@ -11,14 +11,12 @@ Environment:
 
 import argparse
 import json
-import os
 import sys
-from pathlib import Path
-import urllib.request
 import urllib.error
 
-MOLTBOOK_API = "https://moltbook-api.simeon-garratt.workers.dev/v1"
-CREDENTIALS_PATH = Path.home() / ".config" / "moltbook" / "credentials.json"
+from cassette import REDACTED
+from moltbook_api import CREDENTIALS_PATH, api_request
+from profiling import add_profile_arguments, start_profiling
 
 
 def register_agent(agent_name: str, twitter_username: str = None) -> dict:
@@ -30,35 +28,31 @@ def register_agent(agent_name: str, twitter_username: str = None) -> dict:
         payload["twitter_username"] = twitter_username
     
     # Make registration request
-    req = urllib.request.Request(
-        f"{MOLTBOOK_API}/agents/register",
-        data=json.dumps(payload).encode('utf-8'),
-        headers={
-            "Content-Type": "application/json",
-            "User-Agent": f"moltbook-skill/{agent_name}"
-        }
-    )
-    
     try:
-        with urllib.request.urlopen(req) as response:
-            result = json.loads(response.read().decode('utf-8'))
-            
-            # Save credentials
-            CREDENTIALS_PATH.parent.mkdir(parents=True, exist_ok=True)
-            with open(CREDENTIALS_PATH, 'w') as f:
-                json.dump(result, f, indent=2)
-            
-            print(f"✓ Registered as {result.get('agent_name', agent_name)}")
-            print(f"✓ Credentials saved to {CREDENTIALS_PATH}")
-            print(f"\nProfile: {result.get('profile_url', 'N/A')}")
-            print(f"Claim URL: {result.get('claim_url', 'N/A')}")
-            print(f"Verification code: {result.get('verification_code', 'N/A')}")
-            
-            if result.get('claim_url'):
-                print(f"\nNext step: Have your human visit the claim URL and tweet the verification code")
-            
+        result = api_request("POST", "/agents/register", payload=payload, timeout=30, max_retries=1,
+                             user_agent=f"moltbook-skill/{agent_name}")
+        
+        if result.get('api_key') == REDACTED:
+            # Replayed from a cassette: never overwrite real credentials with a placeholder
+            print(f"⚠ Response came from a cassette; credentials not saved", file=sys.stderr)
             return result
-            
+        
+        # Save credentials
+        CREDENTIALS_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(CREDENTIALS_PATH, 'w') as f:
+            json.dump(result, f, indent=2)
+        
+        print(f"✓ Registered as {result.get('agent_name', agent_name)}")
+        print(f"✓ Credentials saved to {CREDENTIALS_PATH}")
+        print(f"\nProfile: {result.get('profile_url', 'N/A')}")
+        print(f"Claim URL: {result.get('claim_url', 'N/A')}")
+        print(f"Verification code: {result.get('verification_code', 'N/A')}")
+        
+        if result.get('claim_url'):
+            print(f"\nNext step: Have your human visit the claim URL and tweet the verification code")
+        
+        return result
+        
     except urllib.error.HTTPError as e:
         error_msg = e.read().decode('utf-8')
         print(f"✗ Registration failed: {e.code} - {error_msg}", file=sys.stderr)
@@ -72,7 +66,9 @@ def main():
     parser = argparse.ArgumentParser(description="Register agent on Moltbook")
     parser.add_argument("--name", required=True, help="Agent name")
     parser.add_argument("--twitter", help="Twitter/X username (optional)")
+    add_profile_arguments(parser)
     args = parser.parse_args()
+    start_profiling(args)
     
     register_agent(args.name, args.twitter)
 
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Related posts from the local post store, with no API calls per query.
+
+Posts synced by `post_store.py --sync` (and the ones you post) are indexed
+as sparse TF-IDF vectors: term counts in compressed sparse row form
+(`indptr`/`indices`/`counts` arrays), plus the same counts by term (the
+inverted index) for scoring. A query only touches the posting lists of
+its own terms. Several queries in one call share a single pass over each
+list.
+
+Both layouts, document frequencies and vector norms are saved next to the
+store and caught up incrementally: each run reads only history lines added
+since the last one and appends their postings. Norms depend on IDF, which
+drifts as posts are added, so they are all recomputed once the index has
+grown by a tenth; in between, older posts keep norms from slightly older
+IDF weights.
+
+Usage:
+    python scripts/related.py POST_ID
+    python scripts/related.py POST_ID OTHER_ID --top 3
+    python scripts/related.py --text "sandboxing agent skills"
+    python scripts/related.py POST_ID --sync --submolt general,agentskills
+"""
+
+import argparse
+import base64
+import heapq
+import json
+import math
+import sys
+from array import array
+from pathlib import Path
+
+from moltbook_api import resolve_api_key
+from output import add_format_argument, status, write_json, write_ndjson, write_text
+from post_store import STORE_PATH, PostStore, features, sync
+from profiling import add_profile_arguments, start_profiling
+
+INDEX_PATH = STORE_PATH.with_name("related_index.json")
+# Recompute every norm once the index has grown by this fraction
+NORM_REFRESH_GROWTH = 0.1
+
+STOPWORDS = frozenset("""
+a about after all also an and any are as at be been but by can could did do does for from
+had has have how i if in into is it its just like more my no not of on one or our out so
+some than that the their them then there these they this to up us was we were what when
+which who will with would you your i'm it's don't
+""".split())
+
+
+# Saved arrays and their typecodes
+ARRAYS = {"indptr": 'I', "indices": 'I', "counts": 'H', "term_ptr": 'I', "term_docs": 'I',
+          "term_counts": 'H', "df": 'I', "norms": 'd'}
+
+
+def terms(text: str) -> list:
+    return [word for word in features(text) if word not in STOPWORDS and len(word) > 1]
+
+
+class TfidfIndex:
+    """Sparse TF-IDF vectors of posts, stored CSR-style and scored via posting lists."""
+
+    def __init__(self):
+        self.vocab = {}
+        self.df = array('I')
+        self.docs = []
+        self.positions = {}
+        self.indptr = array('I', [0])
+        self.indices = array('I')
+        self.counts = array('H')
+        # Inverted index, CSC-style: term t's postings are term_docs/term_counts
+        # [term_ptr[t]:term_ptr[t + 1]], plus any added since load in `extra`
+        self.term_ptr = array('I', [0])
+        self.term_docs = array('I')
+        self.term_counts = array('H')
+        self.extra = {}
+        self.norms = array('d')
+        self.norm_docs = 0
+        self.offset = 0
+
+    def add(self, doc_id: str, text: str, meta: dict = None) -> bool:
+        """Append one post; returns False when it is already indexed."""
+        if doc_id in self.positions:
+            return False
+        counts = {}
+        for term in terms(text):
+            index = self.vocab.get(term)
+            if index is None:
+                index = self.vocab[term] = len(self.df)
+                self.df.append(0)
+            counts[index] = counts.get(index, 0) + 1
+        doc = len(self.docs)
+        for index in sorted(counts):
+            count = min(counts[index], 65535)
+            self.df[index] += 1
+            self.indices.append(index)
+            self.counts.append(count)
+            docs, term_counts = self.extra.setdefault(index, (array('I'), array('H')))
+            docs.append(doc)
+            term_counts.append(count)
+        self.indptr.append(len(self.indices))
+        self.positions[doc_id] = doc
+        self.docs.append(dict(meta or {}, id=doc_id))
+        return True
+
+    def catch_up(self, store_path: Path = STORE_PATH) -> int:
+        """Index posts appended to the store since the last run; returns how many."""
+        if not store_path.exists():
+            return 0
+        added = 0
+        with open(store_path, 'rb') as f:
+            if self.offset > store_path.stat().st_size:
+                # The store was replaced; start over
+                self.__init__()
+            f.seek(self.offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                self.offset += len(line)
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get('kind') != "post" or not record.get('id'):
+                    continue
+                meta = {key: record.get(key) for key in ("submolt", "author", "url") if record.get(key)}
+                meta["title"] = record.get('text', '').split("\n", 1)[0][:100]
+                added += self.add(record['id'], record.get('text', ''), meta)
+        return added
+
+    def idf(self, index: int) -> float:
+        return math.log((len(self.docs) + 1) / (self.df[index] + 1)) + 1
+
+    def update_norms(self, refresh: bool = False):
+        """Compute norms of posts added since the last call.
+
+        Every norm is recomputed with current IDF instead once the index has
+        grown by NORM_REFRESH_GROWTH since the last full pass, or on `refresh`.
+        """
+        if refresh or len(self.docs) > self.norm_docs * (1 + NORM_REFRESH_GROWTH):
+            self.norms = array('d')
+            self.norm_docs = len(self.docs)
+        if len(self.norms) == len(self.docs):
+            return
+        idf = [self.idf(i) for i in range(len(self.df))]
+        indptr, indices, counts = self.indptr, self.indices, self.counts
+        for doc in range(len(self.norms), len(self.docs)):
+            squared = 0.0
+            for k in range(indptr[doc], indptr[doc + 1]):
+                weight = (1 + math.log(counts[k])) * idf[indices[k]]
+                squared += weight * weight
+            self.norms.append(math.sqrt(squared) or 1.0)
+
+    def postings(self, term: int) -> tuple:
+        """(doc positions, counts) of a term, oldest post first."""
+        if term + 1 < len(self.term_ptr):
+            start, end = self.term_ptr[term], self.term_ptr[term + 1]
+            docs, counts = self.term_docs[start:end], self.term_counts[start:end]
+        else:
+            docs, counts = array('I'), array('H')
+        extra = self.extra.get(term)
+        if extra:
+            docs.extend(extra[0])
+            counts.extend(extra[1])
+        return docs, counts
+
+    def _merge_postings(self):
+        """Fold postings added since load into the CSC arrays."""
+        if not self.extra:
+            return
+        term_ptr, term_docs, term_counts = array('I', [0]), array('I'), array('H')
+        for term in range(len(self.df)):
+            docs, counts = self.postings(term)
+            term_docs.extend(docs)
+            term_counts.extend(counts)
+            term_ptr.append(len(term_docs))
+        self.term_ptr, self.term_docs, self.term_counts = term_ptr, term_docs, term_counts
+        self.extra = {}
+
+    def vector(self, text: str = None, doc_id: str = None) -> dict:
+        """Sparse query vector {term index: weight} for a text or an indexed post."""
+        counts = {}
+        if doc_id is not None:
+            doc = self.positions[doc_id]
+            for k in range(self.indptr[doc], self.indptr[doc + 1]):
+                counts[self.indices[k]] = self.counts[k]
+        else:
+            for term in terms(text):
+                index = self.vocab.get(term)
+                if index is not None:
+                    counts[index] = counts.get(index, 0) + 1
+        return {index: (1 + math.log(count)) * self.idf(index) for index, count in counts.items()}
+
+    def top_k(self, queries: list, k: int = 5) -> list:
+        """Best (score, doc) matches for each query vector, in one pass per posting list."""
+        self.update_norms()
+        norms = self.norms
+        by_term = {}
+        for q, vector in enumerate(queries):
+            for term, weight in vector.items():
+                by_term.setdefault(term, []).append((q, weight))
+
+        scores = [{} for _ in queries]
+        for term, users in by_term.items():
+            docs, counts = self.postings(term)
+            idf = self.idf(term)
+            weights = [(1 + math.log(count)) * idf for count in counts]
+            for q, q_weight in users:
+                acc = scores[q]
+                for doc, weight in zip(docs, weights):
+                    acc[doc] = acc.get(doc, 0.0) + weight * q_weight
+
+        results = []
+        for vector, acc in zip(queries, scores):
+            q_norm = math.sqrt(sum(w * w for w in vector.values())) or 1.0
+            best = heapq.nlargest(k, acc.items(), key=lambda item: item[1] / norms[item[0]])
+            results.append([(score / (norms[doc] * q_norm), self.docs[doc]) for doc, score in best])
+        return results
+
+    def save(self, path: Path = INDEX_PATH):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._merge_postings()
+        self.update_norms()
+        state = {
+            "offset": self.offset,
+            "norm_docs": self.norm_docs,
+            "vocab": sorted(self.vocab, key=self.vocab.get),
+            "docs": self.docs,
+        }
+        # Raw machine-order arrays: a local cache, never shared between hosts
+        for name in ARRAYS:
+            state[name] = base64.b64encode(getattr(self, name).tobytes()).decode('ascii')
+        with open(path, 'w') as f:
+            json.dump(state, f, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path: Path = INDEX_PATH) -> "TfidfIndex":
+        index = cls()
+        if not path.exists():
+            return index
+        try:
+            with open(path, 'r') as f:
+                state = json.load(f)
+            index.vocab = {term: i for i, term in enumerate(state["vocab"])}
+            index.docs = state["docs"]
+            index.positions = {doc["id"]: i for i, doc in enumerate(index.docs)}
+            for name, typecode in ARRAYS.items():
+                values = array(typecode)
+                values.frombytes(base64.b64decode(state[name]))
+                setattr(index, name, values)
+            index.offset = state["offset"]
+            index.norm_docs = state["norm_docs"]
+        except (OSError, ValueError, KeyError):
+            print("⚠ Related-post index unreadable, rebuilding", file=sys.stderr)
+            return cls()
+        return index
+
+
+def open_index(store_path: Path = STORE_PATH, index_path: Path = INDEX_PATH) -> TfidfIndex:
+    """Load the saved index and fold in newly stored posts."""
+    index = TfidfIndex.load(index_path)
+    if index.catch_up(store_path):
+        index.save(index_path)
+    return index
+
+
+def render_related(heading: str, matches: list) -> str:
+    blocks = [f"{'='*60}\n{heading}\n{'='*60}\n\n"]
+    if not matches:
+        blocks.append("  No related posts in the local store\n\n")
+    for score, doc in matches:
+        where = " • ".join(part for part in (doc.get('submolt'), f"u/{doc['author']}" if doc.get('author') else None)
+                           if part)
+        blocks.append(f"{score:.3f}  {doc.get('title') or doc['id']}\n"
+                      f"       {where}{' • ' if where else ''}{doc.get('url') or doc['id']}\n\n")
+    return "".join(blocks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find related posts in the local post store")
+    parser.add_argument("post_ids", nargs="*", help="Post IDs (from the local store) to find related posts for")
+    parser.add_argument("--text", help="Find posts related to this text instead")
+    parser.add_argument("--top", type=int, default=5, help="Related posts per query (default: 5)")
+    parser.add_argument("--sync", action="store_true", help="Sync your posts (and --submolt posts) first")
+    parser.add_argument("--submolt", help="Submolts to sync (comma-separated)")
+    parser.add_argument("--limit", type=int, default=50, help="Posts to sync per feed (default: 50)")
+    parser.add_argument("--api-key", help="API key (defaults to credentials.json)")
+    add_format_argument(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    start_profiling(args)
+
+    if not args.post_ids and not args.text:
+        print("Error: Provide a post ID or --text", file=sys.stderr)
+        sys.exit(1)
+
+    if args.sync:
+        submolts = [name.strip() for name in (args.submolt or "").split(",") if name.strip()]
+        stats = sync(PostStore(), resolve_api_key(args.api_key), submolts, args.limit)
+        print(f"✓ Synced {stats['added']} new posts", file=sys.stderr)
+
+    index = open_index()
+    missing = [post_id for post_id in args.post_ids if post_id not in index.positions]
+    if missing:
+        print(f"✗ Not in the local store: {', '.join(missing)}", file=sys.stderr)
+        print("  Run post_store.py --sync (with --submolt) to fetch them", file=sys.stderr)
+        sys.exit(1)
+
+    queries = [(f"Related to {post_id}: {index.docs[index.positions[post_id]].get('title', '')}",
+                index.vector(doc_id=post_id), post_id)
+               for post_id in args.post_ids]
+    if args.text:
+        queries.append((f"Related to \"{args.text[:60]}\"", index.vector(text=args.text), None))
+
+    # Ask for one extra so a post can be dropped from its own results
+    results = index.top_k([vector for _, vector, _ in queries], args.top + 1)
+    answers = []
+    for (heading, _, post_id), matches in zip(queries, results):
+        matches = [(score, doc) for score, doc in matches if doc['id'] != post_id][:args.top]
+        answers.append((heading, post_id if post_id is not None else args.text, matches))
+
+    if args.format == "text":
+        write_text(render_related(heading, matches) for heading, _, matches in answers)
+    elif args.format == "ndjson":
+        write_ndjson(dict(doc, query=query, score=round(score, 4))
+                     for _, query, matches in answers for score, doc in matches)
+    else:
+        write_json({"queries": [
+            {"query": query, "related": [dict(doc, score=round(score, 4)) for score, doc in matches]}
+            for _, query, matches in answers
+        ]})
+    status(f"✓ {len(queries)} queries over {len(index.docs)} local posts", args.format)
+
+
+if __name__ == "__main__":
+    main()
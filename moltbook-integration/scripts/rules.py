@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Keyword rules for auto-engagement.
+
+Compiles every keyword and phrase of a rules file into one Aho-Corasick
+automaton, so matching a post costs one pass over its text no matter how
+many thousand patterns there are. Each rule carries an action: `upvote`,
+`comment` (with a template) or `ignore` (which vetoes everything else).
+
+Rules file (JSON):
+    {
+      "rules": [
+        {"name": "skills", "patterns": ["openclaw", "agent skill"], "action": "upvote"},
+        {"name": "hunts", "patterns_file": "hunt_terms.txt", "action": "comment",
+         "template": "Nice one u/{author}! Have you tried a web hunt for {keyword}?"},
+        {"name": "spam", "patterns": ["airdrop"], "action": "ignore"}
+      ]
+    }
+
+Templates can use {author}, {title}, {submolt}, {keyword} and {rule}.
+Matching is case-insensitive on whole words unless a rule sets
+"whole_word": false.
+
+Usage:
+    python scripts/rules.py rules.json "Just shipped an OpenClaw agent skill"
+    python scripts/read_feed.py --submolt general --rules rules.json
+    python scripts/read_feed.py --watch --rules rules.json --apply-rules
+"""
+
+import argparse
+import json
+import sys
+import time
+import urllib.error
+from collections import deque
+from pathlib import Path
+
+from journal import ActionJournal
+from moltbook_api import CREDENTIALS_PATH, api_request
+from post_store import PostStore
+from profiling import add_profile_arguments, start_profiling
+
+ACTIONS = ("upvote", "comment", "ignore")
+
+
+def normalize(text: str) -> str:
+    """Lowercase and collapse whitespace, for patterns and post text alike."""
+    return " ".join(text.lower().split())
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton over a fixed set of patterns."""
+
+    def __init__(self, patterns: list):
+        self.patterns = patterns
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [()]
+
+        for pattern_id, pattern in enumerate(patterns):
+            node = 0
+            for ch in pattern:
+                child = self.goto[node].get(ch)
+                if child is None:
+                    child = len(self.goto)
+                    self.goto[node][ch] = child
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append(())
+                node = child
+            self.out[node] += (pattern_id,)
+
+        # Breadth-first so every failure target is finished before its users
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self.goto[node].items():
+                queue.append(child)
+                target = self.fail[node]
+                while target and ch not in self.goto[target]:
+                    target = self.fail[target]
+                target = self.goto[target].get(ch, 0)
+                self.fail[child] = target if target != child else 0
+                self.out[child] += self.out[self.fail[child]]
+
+    def search(self, text: str):
+        """Yield (end_index, pattern_id) for every occurrence in `text`."""
+        goto, fail, out = self.goto, self.fail, self.out
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                for pattern_id in out[node]:
+                    yield i, pattern_id
+
+
+class Decision:
+    """The winning rule for a post and what it asks for."""
+
+    def __init__(self, rule: dict, keywords: list):
+        self.rule = rule
+        self.keywords = keywords
+
+    @property
+    def action(self) -> str:
+        return self.rule["action"]
+
+    def render(self, post: dict) -> str:
+        """Comment text for a `comment` rule."""
+        values = _TemplateValues(
+            author=(post.get('author') or {}).get('username', 'there'),
+            title=post.get('title', ''),
+            submolt=post.get('submolt', ''),
+            keyword=self.keywords[0],
+            rule=self.rule["name"],
+        )
+        return self.rule.get("template", "").format_map(values)
+
+    def describe(self) -> str:
+        return f"{self.action} (rule '{self.rule['name']}': {', '.join(self.keywords[:3])})"
+
+
+class _TemplateValues(dict):
+    def __missing__(self, key):
+        return "{" + key + "}"
+
+
+class RuleEngine:
+    """Match posts against all rules at once and pick an action."""
+
+    def __init__(self, rules: list):
+        self.rules = []
+        patterns = {}
+        # pattern id -> [(rule index, whole_word)]
+        self.owners = []
+
+        for index, rule in enumerate(rules):
+            if rule.get("action") not in ACTIONS:
+                raise ValueError(f"Rule {rule.get('name', index)}: action must be one of {', '.join(ACTIONS)}")
+            if rule["action"] == "comment" and not rule.get("template"):
+                raise ValueError(f"Rule {rule.get('name', index)}: comment rules need a template")
+            rule = dict(rule, name=rule.get("name", f"rule{index}"), priority=rule.get("priority", 0))
+            self.rules.append(rule)
+            for pattern in rule.get("patterns", []):
+                pattern = normalize(pattern)
+                if not pattern:
+                    continue
+                if pattern not in patterns:
+                    patterns[pattern] = len(self.owners)
+                    self.owners.append([])
+                self.owners[patterns[pattern]].append((index, rule.get("whole_word", True)))
+
+        self.automaton = KeywordAutomaton(list(patterns))
+
+    @classmethod
+    def from_file(cls, path: str) -> "RuleEngine":
+        """Load a rules file; `patterns_file` entries are resolved relative to it."""
+        path = Path(path)
+        with open(path, 'r') as f:
+            config = json.load(f)
+
+        rules = []
+        for rule in config.get("rules", []):
+            rule = dict(rule)
+            if rule.get("patterns_file"):
+                with open(path.parent / rule["patterns_file"], 'r') as f:
+                    extra = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+                rule["patterns"] = list(rule.get("patterns", [])) + extra
+            rules.append(rule)
+        return cls(rules)
+
+    @property
+    def pattern_count(self) -> int:
+        return len(self.automaton.patterns)
+
+    def matches(self, text: str) -> dict:
+        """Map rule index -> matched keywords for a piece of text."""
+        text = normalize(text)
+        found = {}
+        for end, pattern_id in self.automaton.search(text):
+            pattern = self.automaton.patterns[pattern_id]
+            start = end - len(pattern) + 1
+            bounded = ((start == 0 or not text[start - 1].isalnum()) and
+                       (end + 1 == len(text) or not text[end + 1].isalnum()))
+            for rule_index, whole_word in self.owners[pattern_id]:
+                if whole_word and not bounded:
+                    continue
+                keywords = found.setdefault(rule_index, [])
+                if pattern not in keywords:
+                    keywords.append(pattern)
+        return found
+
+    def evaluate(self, post: dict):
+        """Decision for a post, or None when no rule matches."""
+        text = f"{post.get('title') or ''}\n{post.get('content') or ''}"
+        found = self.matches(text)
+        if not found:
+            return None
+        # Ignore vetoes everything; otherwise highest priority, then file order
+        best = min(found, key=lambda i: (self.rules[i]["action"] != "ignore",
+                                         -self.rules[i]["priority"], i))
+        return Decision(self.rules[best], found[best])
+
+
+class RuleRunner:
+    """Evaluate posts and optionally carry out their actions, within a cap."""
+
+    def __init__(self, engine: RuleEngine, api_key: str = None, apply: bool = False,
+                 max_actions: int = 5, skip_author: str = None):
+        self.engine = engine
+        self.api_key = api_key
+        self.apply = apply
+        self.max_actions = max_actions
+        self.skip_author = skip_author
+        self.actions = 0
+        self.store = None
+        self.journal = None
+
+    def handle(self, post: dict):
+        """Return (decision, outcome) for a post; outcome describes what happened."""
+        decision = self.engine.evaluate(post)
+        if decision is None or decision.action == "ignore":
+            return decision, None
+        if self.skip_author and (post.get('author') or {}).get('username') == self.skip_author:
+            return decision, "skipped (own post)"
+        if not self.apply:
+            return decision, "dry run"
+        if self.actions >= self.max_actions:
+            return decision, "skipped (action cap reached)"
+
+        post_id = post.get('id')
+        if self.journal is None:
+            self.journal = ActionJournal()
+        if self.journal.has(decision.action, post_id):
+            done = "upvoted" if decision.action == "upvote" else "commented"
+            return decision, f"skipped (already {done})"
+        text = decision.render(post) if decision.action == "comment" else None
+        if text is not None:
+            # Templated comments drift towards spam; skip ones we've effectively said before
+            if self.store is None:
+                self.store = PostStore()
+            if self.store.find_similar(text):
+                return decision, "skipped (near-duplicate comment)"
+        try:
+            if decision.action == "upvote":
+                api_request("POST", f"/posts/{post_id}/upvote", self.api_key)
+            else:
+                # Sent once: a retried comment could be published twice
+                result = api_request("POST", f"/posts/{post_id}/comments", self.api_key,
+                                     payload={"content": text}, max_retries=1)
+                self.store.add("comment", text, result.get('id'), post_id=post_id,
+                               author=(result.get('author') or {}).get('username'),
+                               post_author=(post.get('author') or {}).get('username'))
+                self.journal.record("comment", post_id, result.get('id'))
+        except urllib.error.HTTPError as e:
+            if e.code == 400 and decision.action == "upvote":
+                # Upvoted before the journal existed; remember it so we never ask again
+                self.journal.record("upvote", post_id)
+                return decision, "skipped (already upvoted)"
+            return decision, f"failed ({e.code})"
+        except urllib.error.URLError as e:
+            return decision, f"failed ({e.reason})"
+        if decision.action == "upvote":
+            self.journal.record("upvote", post_id)
+        self.actions += 1
+        return decision, "done"
+
+
+def load_runner(rules_path: str, api_key: str, apply: bool = False, max_actions: int = 5) -> RuleRunner:
+    """Build a RuleRunner for a CLI, exiting with a message on a bad rules file."""
+    try:
+        engine = RuleEngine.from_file(rules_path)
+    except (OSError, ValueError) as e:
+        print(f"✗ Invalid rules: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    # Never engage with our own posts
+    own_name = None
+    if CREDENTIALS_PATH.exists():
+        with open(CREDENTIALS_PATH, 'r') as f:
+            own_name = json.load(f).get('agent_name')
+    return RuleRunner(engine, api_key, apply, max_actions, own_name)
+
+
+def apply_rules(runner: RuleRunner, posts: list):
+    """Run the rules over posts before they are shown, storing each result as `post['rule']`.
+
+    The record is None when no rule matched. Renderers only format it, so
+    printing a post never carries out an action.
+    """
+    for post in posts:
+        decision, outcome = runner.handle(post)
+        post['rule'] = None if decision is None else {
+            "action": decision.action, "rule": decision.rule["name"],
+            "keywords": decision.keywords, "outcome": outcome}
+
+
+def describe_outcome(post: dict):
+    """One-line rule result recorded by apply_rules, or None when no rule matched."""
+    record = post.get('rule')
+    if not record:
+        return None
+    outcome = record["outcome"]
+    return (f"→ {record['action']} (rule '{record['rule']}': {', '.join(record['keywords'][:3])})"
+            f"{f' [{outcome}]' if outcome else ''}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test keyword rules against text")
+    parser.add_argument("rules", help="Rules file (JSON)")
+    parser.add_argument("text", nargs="?", help="Text to match (default: read stdin)")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    start_profiling(args)
+
+    if not Path(args.rules).exists():
+        print(f"✗ Rules file not found: {args.rules}", file=sys.stderr)
+        sys.exit(1)
+
+    start = time.perf_counter()
+    try:
+        engine = RuleEngine.from_file(args.rules)
+    except (OSError, ValueError) as e:
+        print(f"✗ Invalid rules: {e}", file=sys.stderr)
+        sys.exit(1)
+    compiled = time.perf_counter() - start
+    print(f"✓ Compiled {engine.pattern_count} patterns from {len(engine.rules)} rules "
+          f"in {compiled * 1000:.1f}ms")
+
+    text = args.text if args.text is not None else sys.stdin.read()
+    start = time.perf_counter()
+    decision = engine.evaluate({"content": text})
+    matched = time.perf_counter() - start
+
+    if decision is None:
+        print(f"  No rule matched ({matched * 1000:.2f}ms)")
+    else:
+        print(f"  → {decision.describe()} ({matched * 1000:.2f}ms)")
+        if decision.action == "comment":
+            print(f"  Comment: {decision.render({'content': text})}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Priority-aware request scheduling for the Moltbook scripts.
+
+Every API request takes a token from its API key's budget, below the
+API's 100 requests/minute per key, before it is sent. Each agent (API
+key) has its own budget, so one agent's crawl never slows another's.
+An agent's waiting requests are granted in priority order:
+
+    WRITE       posts, comments, upvotes
+    READ        feeds, searches and profiles someone is waiting to see
+    BACKGROUND  watch polling, syncs and other crawling
+
+Background requests are preemptable: they go last whenever anything else
+is waiting, and they leave a few tokens of headroom in the bucket, so an
+interactive post or comment goes out immediately instead of queueing
+behind hundreds of feed requests.
+
+The token counts are shared by every process on the host (see
+rate_store.py), so the host as a whole stays under each key's limit and
+the background headroom holds across processes. The priority queues are
+per process: one process's waiting posts do not jump ahead of another
+process's feed requests, which simply take tokens as they come.
+
+Environment:
+    MOLTBOOK_RATE_LIMIT    requests/minute per API key for the host (default: 90, 0 disables)
+    MOLTBOOK_RATE_STORE    shared bucket database, or "none" (see rate_store.py)
+"""
+
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+
+from rate_store import RATE_STORE_ENV, RATE_STORE_PATH, SharedTokenBucket
+
+WRITE, READ, BACKGROUND = 0, 1, 2
+PRIORITY_NAMES = ("write", "read", "background")
+
+RATE_LIMIT_ENV = "MOLTBOOK_RATE_LIMIT"
+DEFAULT_RATE = 90
+DEFAULT_BURST = 10
+BACKGROUND_RESERVE = 3
+
+
+class TokenBucket:
+    """Requests-per-minute budget with a small burst allowance."""
+
+    def __init__(self, per_minute: float, burst: int = 5, clock=time.monotonic):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.clock = clock
+        self.updated = clock()
+        # The scheduler calls in without holding its own lock
+        self.lock = threading.Lock()
+
+    def wait_time(self, tokens: float = 1) -> float:
+        """Seconds until `tokens` are available (0 if they are now)."""
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return 0.0 if self.tokens >= tokens else (tokens - self.tokens) / self.rate
+
+    def take(self):
+        self.tokens -= 1
+
+    def peek(self) -> float:
+        """Tokens available now (may be negative after a drain)."""
+        with self.lock:
+            self.wait_time(0)
+            return self.tokens
+
+    def try_take(self, tokens: float = 1) -> float:
+        """Take a token if `tokens` are available; otherwise seconds to wait before retrying."""
+        with self.lock:
+            wait = self.wait_time(tokens)
+            if wait <= 0:
+                self.take()
+            return wait
+
+    def drain(self):
+        with self.lock:
+            self.tokens = min(self.tokens, 0.0)
+
+
+def default_priority(method: str) -> int:
+    return READ if method.upper() in ("GET", "HEAD") else WRITE
+
+
+class Scheduler:
+    """Grant request slots by priority, from a separate budget per agent (API key)."""
+
+    def __init__(self, per_minute: float = DEFAULT_RATE, burst: int = DEFAULT_BURST,
+                 reserve: int = BACKGROUND_RESERVE, clock=time.monotonic, bucket_factory=None):
+        # agent -> bucket, made on first use
+        self.bucket_factory = bucket_factory or (lambda agent: TokenBucket(per_minute, burst, clock))
+        self.buckets = {}
+        self.rate = per_minute / 60.0
+        self.reserve = max(0, min(reserve, burst - 1))
+        self.clock = clock
+        self.cond = threading.Condition()
+        # One queue per priority: agent -> waiting tickets, oldest first
+        self.queues = [{} for _ in PRIORITY_NAMES]
+        self.stats = {name: {"granted": 0, "waited_s": 0.0} for name in PRIORITY_NAMES}
+
+    def _bucket(self, agent: str):
+        bucket = self.buckets.get(agent)
+        if bucket is None:
+            bucket = self.buckets[agent] = self.bucket_factory(agent)
+        return bucket
+
+    def _head(self, agent: str):
+        """The agent's next request: its oldest at the highest waiting priority."""
+        for queue in self.queues:
+            tickets = queue.get(agent)
+            if tickets:
+                return tickets[0]
+        return None
+
+    def acquire(self, priority: int = READ, agent: str = ""):
+        """Block until this request may be sent."""
+        ticket = object()
+        with self.cond:
+            queue = self.queues[priority]
+            queue.setdefault(agent, deque()).append(ticket)
+            bucket = self._bucket(agent)
+            start = self.clock()
+            while True:
+                timeout = None
+                if self._head(agent) is ticket:
+                    needed = 1 + (self.reserve if priority == BACKGROUND else 0)
+                    # A shared bucket can wait seconds on the database lock;
+                    # other agents' requests must not queue behind that
+                    self.cond.release()
+                    try:
+                        timeout = bucket.try_take(needed)
+                    finally:
+                        self.cond.acquire()
+                    if timeout <= 0:
+                        break
+                self.cond.wait(timeout)
+
+            tickets = queue[agent]
+            tickets.popleft()
+            if not tickets:
+                del queue[agent]
+            stats = self.stats[PRIORITY_NAMES[priority]]
+            stats["granted"] += 1
+            stats["waited_s"] += self.clock() - start
+            self.cond.notify_all()
+
+    def available(self, priority: int = READ, within: float = 0.0, agent: str = "") -> int:
+        """How many more requests of `priority` `agent` could be granted within `within` seconds.
+
+        The agent's requests already waiting at the same or a higher priority
+        are served first, so they count against it. Lets a caller with many
+        optional requests (profile enrichment) send only what the budget
+        allows instead of queueing the rest behind it.
+        """
+        with self.cond:
+            bucket = self._bucket(agent)
+            ahead = sum(len(queue.get(agent, ())) for queue in self.queues[:priority + 1])
+        tokens = bucket.peek()
+        reserve = self.reserve if priority == BACKGROUND else 0
+        return max(0, int(tokens - reserve + within * self.rate) - ahead)
+
+    def throttled(self, agent: str = ""):
+        """The server answered 429: something else is using this agent's budget, so slow it down."""
+        with self.cond:
+            bucket = self._bucket(agent)
+        bucket.drain()
+
+    def waiting(self) -> dict:
+        with self.cond:
+            return {name: sum(len(tickets) for tickets in queue.values())
+                    for name, queue in zip(PRIORITY_NAMES, self.queues)}
+
+
+def scheduler_from_env():
+    """Scheduler at MOLTBOOK_RATE_LIMIT requests/minute per API key, or None when set to 0."""
+    per_minute = float(os.environ.get(RATE_LIMIT_ENV, DEFAULT_RATE))
+    if per_minute <= 0:
+        return None
+    store = os.environ.get(RATE_STORE_ENV, str(RATE_STORE_PATH))
+    if store.lower() in ("", "none", "off"):
+        return Scheduler(per_minute)
+
+    def shared_bucket(agent):
+        try:
+            return SharedTokenBucket(store, per_minute, DEFAULT_BURST, api_key=agent)
+        except (OSError, sqlite3.Error) as e:
+            print(f"⚠ Shared rate limit store unavailable ({e}); pacing this process only", file=sys.stderr)
+            return TokenBucket(per_minute, DEFAULT_BURST)
+
+    return Scheduler(per_minute, bucket_factory=shared_bucket)
@@ -6,129 +6,50 @@ Usage:
     python scripts/search.py "search query"
     python scripts/search.py "ai agents" --submolt general
     python scripts/search.py "OpenClaw" --limit 20
+    python scripts/search.py "OpenClaw" --limit 50 --format ndjson
+    python scripts/search.py "OpenClaw" --sort influence
+    python scripts/search.py --queries topics.txt --limit 50 --depth 100
     
 Environment:
     MOLTBOOK_API_KEY: Your Moltbook API key (from credentials.json)
 """
 
 import argparse
-import json
+import heapq
+import itertools
 import sys
-from pathlib import Path
-import urllib.request
 import urllib.error
-import urllib.parse
-import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
 
-MOLTBOOK_API = "https://moltbook-api.simeon-garratt.workers.dev/v1"
-CREDENTIALS_PATH = Path.home() / ".config" / "moltbook" / "credentials.json"
+from moltbook_api import api_request, resolve_api_key
+from output import add_format_argument, status, write_json, write_ndjson, write_text
+from profile_cache import enrich_posts
+from profiling import add_profile_arguments, start_profiling
+from rules import apply_rules, describe_outcome, load_runner
 
+MAX_SEARCH_WORKERS = 8
+DEFAULT_PAGE_SIZE = 25
 
-def load_credentials() -> dict:
-    """Load Moltbook credentials."""
-    if not CREDENTIALS_PATH.exists():
-        print(f"✗ Credentials not found at {CREDENTIALS_PATH}", file=sys.stderr)
-        print("Run register.py first to create an account", file=sys.stderr)
-        sys.exit(1)
-    
-    with open(CREDENTIALS_PATH, 'r') as f:
-        return json.load(f)
-
-
-def retry_request(func, max_retries=3, backoff=2):
-    """Retry request with exponential backoff."""
-    for attempt in range(max_retries):
-        try:
-            return func()
-        except urllib.error.HTTPError as e:
-            if e.code == 429:
-                if attempt < max_retries - 1:
-                    wait = backoff ** attempt
-                    print(f"⏳ Rate limited. Waiting {wait}s...", file=sys.stderr)
-                    time.sleep(wait)
-                    continue
-                else:
-                    raise
-            else:
-                raise
-        except urllib.error.URLError as e:
-            if attempt < max_retries - 1:
-                wait = backoff ** attempt
-                print(f"⏳ Connection error. Retrying in {wait}s...", file=sys.stderr)
-                time.sleep(wait)
-                continue
-            else:
-                raise
-    raise Exception("Max retries exceeded")
-
-
-def search_posts(query: str, submolt: str = None, limit: int = 10, api_key: str = None) -> dict:
-    """Search posts on Moltbook."""
-    
-    if not api_key:
-        creds = load_credentials()
-        api_key = creds.get('api_key')
-    
-    if not api_key:
-        print("✗ No API key found. Register first with register.py", file=sys.stderr)
-        sys.exit(1)
-    
-    # Build query parameters
-    params = {
-        'q': query,
-        'limit': limit
-    }
+
+def search_params(query: str, submolt: str = None, limit: int = 10, cursor: str = None) -> dict:
+    params = {'q': query, 'limit': limit}
     if submolt:
         params['submolt'] = submolt if submolt.startswith('m/') else f'm/{submolt}'
+    if cursor:
+        params['cursor'] = cursor
+    return params
+
+
+def search_posts(query: str, submolt: str = None, limit: int = 10, api_key: str = None,
+                 with_profiles: bool = False, rules=None, fmt: str = "text", sort: str = "relevance",
+                 track: bool = False) -> dict:
+    """Search posts on Moltbook."""
     
-    query_string = urllib.parse.urlencode(params)
-    url = f"{MOLTBOOK_API}/search?{query_string}"
-    
-    def make_request():
-        req = urllib.request.Request(
-            url,
-            headers={
-                "Authorization": f"Bearer {api_key}",
-                "User-Agent": "moltbook-skill"
-            }
-        )
-        
-        with urllib.request.urlopen(req, timeout=10) as response:
-            return json.loads(response.read().decode('utf-8'))
+    api_key = resolve_api_key(api_key)
     
     try:
-        result = retry_request(make_request)
-        
-        posts = result.get('posts', [])
-        total = result.get('total', len(posts))
-        
-        # Pretty print results
-        print("=" * 70)
-        print(f"Search: '{query}' {f'in {submolt}' if submolt else ''}")
-        print(f"Found: {total} results (showing {len(posts)})")
-        print("=" * 70 + "\n")
-        
-        if not posts:
-            print("No results found.")
-            return result
-        
-        for i, post in enumerate(posts, 1):
-            author = post.get('author', {}).get('username', 'unknown')
-            title = post.get('title', '')
-            content = post.get('content', '')[:150]
-            upvotes = post.get('upvotes', 0)
-            comments = post.get('comment_count', 0)
-            post_url = post.get('url', '')
-            submolt_name = post.get('submolt', '')
-            
-            print(f"{i}. u/{author} • {submolt_name} • ⬆ {upvotes} • 💬 {comments}")
-            if title:
-                print(f"   {title}")
-            print(f"   {content}{'...' if len(post.get('content', '')) > 150 else ''}")
-            print(f"   {post_url}\n")
-        
-        return result
-        
+        result = api_request("GET", "/search", api_key, search_params(query, submolt, limit))
     except urllib.error.HTTPError as e:
         error_msg = e.read().decode('utf-8')
         print(f"✗ Search failed: {e.code} - {error_msg}", file=sys.stderr)
@@ -136,17 +57,235 @@ def search_posts(query: str, submolt: str = None, limit: int = 10, api_key: str
     except Exception as e:
         print(f"✗ Search failed: {str(e)}", file=sys.stderr)
         sys.exit(1)
+    
+    posts = result.get('posts', [])
+    total = result.get('total', len(posts))
+    
+    if track:
+        # Imported here, as they pull in numpy
+        from engagement import record_snapshot
+        record_snapshot(posts)
+    if with_profiles and posts:
+        enrich_posts(posts, api_key)
+    if sort == "influence":
+        from influence import rank_by_influence
+        rank_by_influence(posts)
+    
+    header = (f"{'=' * 70}\nSearch: '{query}' {f'in {submolt}' if submolt else ''}\n"
+              f"Found: {total} results (showing {len(posts)})\n{'=' * 70}\n\n")
+    if rules:
+        apply_rules(rules, posts)
+    print_results(header, posts, fmt, result)
+    return result
+
+
+def print_results(header: str, posts: list, fmt: str = "text", document: dict = None):
+    """Write results as text under `header`, as NDJSON, or as the JSON `document`."""
+    if fmt != "text":
+        if fmt == "ndjson":
+            write_ndjson(posts)
+        else:
+            write_json(document)
+        return
+    
+    if not posts:
+        write_text([header, "No results found.\n"])
+        return
+    
+    write_text(itertools.chain([header], (render_result(i, post) for i, post in enumerate(posts, 1))))
+
+
+def load_queries(path: str) -> list:
+    """Queries from a file, one per line; blank lines and `#` comments are skipped."""
+    with open(path, 'r') as f:
+        lines = (line.strip() for line in f)
+        return list(dict.fromkeys(line for line in lines if line and not line.startswith('#')))
+
+
+def batch_search(queries: list, api_key: str, submolt: str = None, top: int = 10, depth: int = None,
+                 page_size: int = DEFAULT_PAGE_SIZE) -> tuple:
+    """Best `top` posts across many queries, deduplicated; returns (posts, stats).
+
+    Queries are searched concurrently and each is paged lazily, up to
+    `depth` results: its next page is requested as soon as the previous one
+    arrives. A post ranks by its best position in any query, ties going to
+    posts more queries found. Once a query's next position is worse than
+    the current top-`top` cut-off, none of its later results can make it
+    in, so it stops paging.
+
+    A query whose first page fails is listed in `failed`; one whose later
+    page fails keeps the results it already has and is listed in
+    `truncated`.
+    """
+    depth = depth or top
+    stats = {"pages": 0, "failed": [], "truncated": [], "stopped_early": 0}
+    # post key -> [best rank, post, queries that found it]
+    found = {}
+
+    def fetch(query, cursor, seen):
+        params = search_params(query, submolt, min(page_size, depth - seen), cursor)
+        result = api_request("GET", "/search", api_key, params)
+        return result.get('posts', []), (result.get('pagination') or {}).get('next')
+
+    def cutoff():
+        if len(found) < top:
+            return None
+        return heapq.nsmallest(top, (entry[0] for entry in found.values()))[-1]
+
+    with ThreadPoolExecutor(max_workers=min(MAX_SEARCH_WORKERS, len(queries) or 1)) as pool:
+        pending = {pool.submit(fetch, query, None, 0): (query, 0) for query in queries}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                query, seen = pending.pop(future)
+                try:
+                    posts, cursor = future.result()
+                except (urllib.error.URLError, ValueError) as e:
+                    if seen:
+                        print(f"⚠ Search '{query}' stopped after {seen} results: {e}", file=sys.stderr)
+                        stats["truncated"].append(query)
+                    else:
+                        print(f"⚠ Search '{query}' failed: {e}", file=sys.stderr)
+                        stats["failed"].append(query)
+                    continue
+                stats["pages"] += 1
+                for rank, post in enumerate(posts, seen + 1):
+                    key = post.get('id') or post.get('url') or id(post)
+                    entry = found.get(key)
+                    if entry is None:
+                        found[key] = [rank, post, [query]]
+                    elif query not in entry[2]:
+                        entry[0] = min(entry[0], rank)
+                        entry[2].append(query)
+                seen += len(posts)
+                if not posts or not cursor or seen >= depth:
+                    continue
+                # The cut-off only tightens, so a query stopped here never needs resuming
+                limit = cutoff()
+                if limit is not None and seen + 1 > limit:
+                    stats["stopped_early"] += 1
+                    continue
+                pending[pool.submit(fetch, query, cursor, seen)] = (query, seen)
+
+    best = heapq.nsmallest(top, found.values(), key=lambda entry: (entry[0], -len(entry[2])))
+    posts = [dict(post, best_rank=rank, queries=matched) for rank, post, matched in best]
+    stats["unique"] = len(found)
+    return posts, stats
+
+
+def search_many(queries: list, submolt: str = None, limit: int = 10, api_key: str = None, depth: int = None,
+                page_size: int = DEFAULT_PAGE_SIZE, with_profiles: bool = False, rules=None, fmt: str = "text",
+                sort: str = "relevance", track: bool = False) -> dict:
+    """Run many searches as one deduplicated, merged result set."""
+    api_key = resolve_api_key(api_key)
+    posts, stats = batch_search(queries, api_key, submolt, limit, depth, page_size)
+    if stats["pages"] == 0:
+        print("✗ Search failed for every query", file=sys.stderr)
+        sys.exit(1)
+    if stats["truncated"]:
+        print(f"⚠ Partial results for {len(stats['truncated'])} of {len(queries)} queries "
+              f"(a later page failed): {', '.join(repr(query) for query in stats['truncated'])}", file=sys.stderr)
+    
+    if track:
+        from engagement import record_snapshot
+        record_snapshot(posts)
+    if with_profiles and posts:
+        enrich_posts(posts, api_key)
+    if sort == "influence":
+        from influence import rank_by_influence
+        rank_by_influence(posts)
+    
+    result = {"posts": posts, "queries": len(queries), "unique": stats["unique"],
+              "pages_fetched": stats["pages"], "failed": stats["failed"], "truncated": stats["truncated"]}
+    header = (f"{'=' * 70}\n{len(queries)} searches {f'in {submolt}' if submolt else ''}\n"
+              f"Found: {stats['unique']} unique posts (showing {len(posts)})\n{'=' * 70}\n\n")
+    if rules:
+        apply_rules(rules, posts)
+    print_results(header, posts, fmt, result)
+    status(f"✓ {len(queries)} queries in {stats['pages']} page requests "
+           f"({stats['stopped_early']} stopped early, {len(stats['truncated'])} truncated, "
+           f"{len(stats['failed'])} failed)", fmt)
+    return result
+
+
+def render_result(i: int, post: dict) -> str:
+    """One search result as a text block."""
+    author = post.get('author', {}).get('username', 'unknown')
+    title = post.get('title', '')
+    content = post.get('content', '')[:150]
+    upvotes = post.get('upvotes', 0)
+    comments = post.get('comment_count', 0)
+    post_url = post.get('url', '')
+    submolt_name = post.get('submolt', '')
+    
+    profile = post.get('author_profile')
+    karma = f" (karma {profile.get('karma', 0)})" if profile else ""
+    influence = f" • influence {post['author_influence']:.2f}" if 'author_influence' in post else ""
+    lines = [f"{i}. u/{author}{karma}{influence} • {submolt_name} • ⬆ {upvotes} • 💬 {comments}"]
+    if title:
+        lines.append(f"   {title}")
+    lines.append(f"   {content}{'...' if len(post.get('content', '')) > 150 else ''}")
+    matched = post.get('queries')
+    if matched:
+        more = f" +{len(matched) - 3}" if len(matched) > 3 else ""
+        lines.append(f"   Matched: {', '.join(repr(query) for query in matched[:3])}{more}")
+    outcome = describe_outcome(post)
+    if outcome:
+        lines.append(f"   {outcome}")
+    lines.append(f"   {post_url}\n\n")
+    return "\n".join(lines)
 
 
 def main():
     parser = argparse.ArgumentParser(description="Search posts on Moltbook")
-    parser.add_argument("query", help="Search query")
+    parser.add_argument("query", nargs="?", help="Search query")
+    parser.add_argument("--queries", help="File of queries, one per line: search them all as one result set")
     parser.add_argument("--submolt", help="Limit search to specific submolt")
     parser.add_argument("--limit", type=int, default=10, help="Number of results (default: 10)")
+    parser.add_argument("--depth", type=int,
+                        help="With --queries: results to page through per query (default: --limit)")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE,
+                        help=f"With --queries: results per request (default: {DEFAULT_PAGE_SIZE})")
+    parser.add_argument("--with-profiles", action="store_true",
+                        help="Fetch author profiles (karma) for the results, via the profile cache")
+    parser.add_argument("--sort", choices=("relevance", "influence"), default="relevance",
+                        help="Order results by relevance (default) or by author influence")
+    parser.add_argument("--track", action="store_true",
+                        help="Record the results' upvote/comment counts for engagement.py")
     parser.add_argument("--api-key", help="API key (defaults to credentials.json)")
+    parser.add_argument("--rules", help="Keyword rules file: show each result's matching action")
+    parser.add_argument("--apply-rules", action="store_true", help="Carry out matched upvote/comment actions")
+    parser.add_argument("--max-actions", type=int, default=5,
+                        help="Most rule actions to carry out per run (default: 5)")
+    add_format_argument(parser)
+    add_profile_arguments(parser)
     args = parser.parse_args()
+    start_profiling(args)
+    
+    if bool(args.query) == bool(args.queries):
+        print("Error: Provide a search query or --queries FILE", file=sys.stderr)
+        sys.exit(1)
+    if args.queries and not Path(args.queries).exists():
+        print(f"✗ File not found: {args.queries}", file=sys.stderr)
+        sys.exit(1)
+    
+    rules = None
+    if args.rules:
+        rules = load_runner(args.rules, resolve_api_key(args.api_key), args.apply_rules, args.max_actions)
+    elif args.apply_rules:
+        print("Error: --apply-rules needs --rules", file=sys.stderr)
+        sys.exit(1)
     
-    search_posts(args.query, args.submolt, args.limit, args.api_key)
+    if args.queries:
+        queries = load_queries(args.queries)
+        if not queries:
+            print(f"Error: No queries in {args.queries}", file=sys.stderr)
+            sys.exit(1)
+        search_many(queries, args.submolt, args.limit, args.api_key, args.depth, args.page_size,
+                    args.with_profiles, rules, args.format, args.sort, args.track)
+    else:
+        search_posts(args.query, args.submolt, args.limit, args.api_key, args.with_profiles, rules, args.format,
+                     args.sort, args.track)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Generate synthetic Moltbook corpora for testing at scale.
+
+Posts, authors, submolts and comments follow the shapes in
+references/api_reference.md. Popularity is skewed the way real feeds are.
+Authors and submolts are drawn from Zipf distributions, so a few authors
+write much of the content and a few submolts are hot. Post text uses
+Zipf-distributed words, and upvotes are heavy-tailed and grow with the
+author's standing. Output is deterministic for a given seed and streamed,
+so corpora of millions of posts are written in constant memory.
+
+Usage:
+    python scripts/synthetic_data.py --posts 100000 --out corpus/
+    python scripts/synthetic_data.py --posts 1000000 --out corpus/ --comments --gzip
+    python scripts/synthetic_data.py --posts 10000 --author-skew 1.4 --submolt-skew 1.6 --out corpus/
+"""
+
+import argparse
+import gzip
+import itertools
+import json
+import random
+import sys
+import uuid
+from bisect import bisect
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from profiling import add_profile_arguments, start_profiling
+
+SUBMOLTS = ("general", "agentskills", "showandtell", "shipping", "shitposts", "thecoalition",
+            "freeminds", "askagents", "builds", "tooling")
+TOPICS = ("openclaw", "agent skill", "web hunt", "moltbook", "mcp server", "eval harness",
+          "vector store", "rate limit", "prompt cache", "tool use", "sandbox", "worker")
+SYLLABLES = ("ka", "lo", "mi", "ne", "ru", "ta", "vo", "shi", "zen", "qua", "bel", "dor",
+             "fin", "gra", "hol", "jun", "mar", "pix", "sol", "tek")
+COMMON_WORDS = ("the", "a", "to", "and", "of", "is", "in", "it", "for", "this", "that", "with",
+                "on", "my", "we", "you", "just", "agent", "build", "post", "new", "today", "why",
+                "how", "shipped", "working", "anyone", "tried", "finally", "thoughts")
+EPOCH = datetime(2026, 1, 15, tzinfo=timezone.utc)
+WORD_STREAM = 1 << 20
+MAX_WORDS = 400
+
+
+def zipf_weights(n: int, skew: float) -> list:
+    """Cumulative Zipf weights for ranks 1..n, for use with bisect."""
+    total = 0.0
+    cumulative = []
+    for rank in range(1, n + 1):
+        total += 1.0 / rank ** skew
+        cumulative.append(total)
+    return cumulative
+
+
+class ZipfSampler:
+    def __init__(self, items: list, skew: float, rng: random.Random):
+        self.items = items
+        self.cumulative = zipf_weights(len(items), skew)
+        self.total = self.cumulative[-1]
+        self.rng = rng
+
+    def __call__(self):
+        return self.items[bisect(self.cumulative, self.rng.random() * self.total)]
+
+
+def stamp(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class SyntheticCorpus:
+    """A reproducible Moltbook-like corpus, generated lazily."""
+
+    def __init__(self, posts: int, authors: int = None, submolts: int = None, vocabulary: int = 20000,
+                 author_skew: float = 1.1, submolt_skew: float = 1.3, word_skew: float = 1.05,
+                 posts_per_hour: float = 400, seed: int = 42):
+        self.post_count = posts
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.posts_per_hour = posts_per_hour
+        rng = self.rng
+
+        self.authors = [self._author(rank) for rank in range(authors or max(50, posts // 25))]
+        submolt_names = list(SUBMOLTS) + [f"{self._word(rng, 2)}{i}" for i in range((submolts or 40) - len(SUBMOLTS))]
+        self.submolts = [self._submolt(name, rank) for rank, name in enumerate(submolt_names[:submolts or 40])]
+
+        words = list(dict.fromkeys(COMMON_WORDS + tuple(self._word(rng) for _ in range(vocabulary))))
+        self.pick_author = ZipfSampler(self.authors, author_skew, rng)
+        self.pick_submolt = ZipfSampler(self.submolts, submolt_skew, rng)
+        # Texts are windows into one long Zipf-sampled word stream: one random
+        # offset per text instead of one weighted draw per word
+        pick_word = ZipfSampler(words, word_skew, rng)
+        self.word_stream = [pick_word() for _ in range(WORD_STREAM)]
+
+    @staticmethod
+    def _word(rng: random.Random, syllables: int = None) -> str:
+        return "".join(rng.choice(SYLLABLES) for _ in range(syllables or rng.randint(1, 4)))
+
+    def _uuid(self) -> str:
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def _author(self, rank: int) -> dict:
+        rng = self.rng
+        username = f"{self._word(rng, 2).capitalize()}{rng.choice(('Bot', 'Agent', 'AI', 'Claw', ''))}{rank}"
+        # Popular authors (low rank) have more karma and followers
+        standing = 1.0 / (rank + 1) ** 0.7
+        return {
+            "id": self._uuid(),
+            "username": username,
+            "profile_url": f"https://moltbook.com/u/{username}",
+            "karma": int(rng.paretovariate(1.5) * 2000 * standing),
+            "followers": int(rng.paretovariate(1.3) * 500 * standing),
+            "following": rng.randint(0, 300),
+            "verified": rng.random() < 0.2 + 0.6 * standing,
+            "bio": " ".join(self._word(rng) for _ in range(rng.randint(3, 12))).capitalize(),
+            "created_at": stamp(EPOCH - timedelta(days=rng.randint(0, 30))),
+            "_standing": standing,
+        }
+
+    def _submolt(self, name: str, rank: int) -> dict:
+        return {
+            "name": f"m/{name}",
+            "display_name": name.capitalize(),
+            "description": f"The place for {name}.",
+            "members": int(5000 / (rank + 1) ** 0.9) + self.rng.randint(0, 50),
+            "created_at": stamp(EPOCH),
+        }
+
+    def _text(self, words: int) -> str:
+        rng = self.rng
+        start = rng.randrange(WORD_STREAM - words)
+        picked = self.word_stream[start:start + words]
+        # About one post in three mentions a topic, so search and rules have something to find
+        if rng.random() < 0.35:
+            picked.insert(rng.randrange(len(picked) + 1), rng.choice(TOPICS))
+        return " ".join(picked)
+
+    def public_author(self, author: dict) -> dict:
+        """Profile as `GET /users/{username}` returns it."""
+        return {key: value for key, value in author.items() if not key.startswith("_")}
+
+    def iter_posts(self):
+        """Yield posts newest first, as feed pages list them."""
+        rng = self.rng
+        moment = EPOCH + timedelta(hours=self.post_count / self.posts_per_hour)
+        gap = 3600.0 / self.posts_per_hour
+        for _ in range(self.post_count):
+            moment -= timedelta(seconds=rng.expovariate(1.0 / gap))
+            author = self.pick_author()
+            post_id = self._uuid()
+            words = min(MAX_WORDS, max(3, int(rng.lognormvariate(3.4, 0.7))))
+            # Heavy-tailed: most posts get a handful, popular authors' posts occasionally thousands
+            upvotes = min(20000, int((rng.paretovariate(1.5) - 1) * 4 * (1 + 10 * author["_standing"])))
+            post = {
+                "id": post_id,
+                "url": f"https://moltbook.com/post/{post_id}",
+                "author": {"username": author["username"], "id": author["id"]},
+                "content": self._text(words),
+                "title": self._text(rng.randint(3, 10)).capitalize() if rng.random() < 0.8 else None,
+                "submolt": self.pick_submolt()["name"],
+                "upvotes": upvotes,
+                "comment_count": min(500, int(upvotes * rng.uniform(0.05, 0.6))),
+                "created_at": stamp(moment),
+            }
+            if post["title"] is None:
+                del post["title"]
+            yield post
+
+    def iter_comments(self, post: dict):
+        """Comments for a post, as `POST /posts/{id}/comments` returns them."""
+        rng = self.rng
+        created = datetime.strptime(post["created_at"], "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+        for _ in range(post.get("comment_count", 0)):
+            author = self.pick_author()
+            created += timedelta(seconds=rng.expovariate(1 / 600))
+            yield {
+                "id": self._uuid(),
+                "post_id": post["id"],
+                "content": self._text(min(MAX_WORDS, max(2, int(rng.lognormvariate(2.5, 0.6))))),
+                "author": {"username": author["username"], "id": author["id"]},
+                "created_at": stamp(created),
+            }
+
+    def iter_pages(self, page_size: int = 25):
+        """Feed pages shaped like `GET /feed` responses."""
+        posts = self.iter_posts()
+        page_number = 0
+        while True:
+            page = list(itertools.islice(posts, page_size))
+            if not page:
+                return
+            page_number += 1
+            more = page_number * page_size < self.post_count
+            yield {"posts": page, "pagination": {"next": f"cursor{page_number}" if more else None}}
+
+
+def open_output(path: Path, compress: bool):
+    if compress:
+        return gzip.open(f"{path}.gz", "wt", encoding="utf-8", compresslevel=5)
+    return open(path, "w", encoding="utf-8")
+
+
+def write_corpus(corpus: SyntheticCorpus, out_dir: str, comments: bool = False, compress: bool = False) -> dict:
+    """Write posts.ndjson, authors.ndjson, submolts.json and optionally comments.ndjson."""
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    counts = {"posts": 0, "comments": 0, "authors": len(corpus.authors), "submolts": len(corpus.submolts)}
+
+    with open_output(out / "authors.ndjson", compress) as f:
+        for author in corpus.authors:
+            f.write(json.dumps(corpus.public_author(author)) + "\n")
+    with open(out / "submolts.json", "w") as f:
+        json.dump({"submolts": corpus.submolts}, f, indent=2)
+
+    comment_file = open_output(out / "comments.ndjson", compress) if comments else None
+    try:
+        with open_output(out / "posts.ndjson", compress) as f:
+            for post in corpus.iter_posts():
+                f.write(json.dumps(post) + "\n")
+                counts["posts"] += 1
+                if comment_file:
+                    for comment in corpus.iter_comments(post):
+                        comment_file.write(json.dumps(comment) + "\n")
+                        counts["comments"] += 1
+    finally:
+        if comment_file:
+            comment_file.close()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic Moltbook corpus")
+    parser.add_argument("--posts", type=int, default=10000, help="Number of posts (default: 10000)")
+    parser.add_argument("--authors", type=int, help="Number of authors (default: posts / 25)")
+    parser.add_argument("--submolts", type=int, default=40, help="Number of submolts (default: 40)")
+    parser.add_argument("--author-skew", type=float, default=1.1, help="Zipf exponent for authors (default: 1.1)")
+    parser.add_argument("--submolt-skew", type=float, default=1.3, help="Zipf exponent for submolts (default: 1.3)")
+    parser.add_argument("--comments", action="store_true", help="Also write comments.ndjson")
+    parser.add_argument("--gzip", action="store_true", help="Gzip the NDJSON files")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (default: 42)")
+    parser.add_argument("--out", required=True, help="Output directory")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    start_profiling(args)
+
+    if args.posts <= 0 or args.submolts < 1:
+        print("Error: --posts and --submolts must be positive", file=sys.stderr)
+        sys.exit(1)
+
+    corpus = SyntheticCorpus(args.posts, args.authors, args.submolts, author_skew=args.author_skew,
+                             submolt_skew=args.submolt_skew, seed=args.seed)
+    counts = write_corpus(corpus, args.out, args.comments, args.gzip)
+    summary = f"✓ {counts['posts']:,} posts by {counts['authors']:,} authors in {counts['submolts']} submolts"
+    if args.comments:
+        summary += f", {counts['comments']:,} comments"
+    print(f"{summary} → {args.out}")
+
+
+if __name__ == "__main__":
+    main()
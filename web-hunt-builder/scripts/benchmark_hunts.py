@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Benchmark hunt solvability and solve cost across difficulty levels.
+
+Generates a batch of hunt pages per difficulty, serves them from a real
+multi-hunt Python backend built by generate_backend.py, and runs the
+reference agent solver against every page. --stub-backend serves them from
+an in-process stub of the backend contract (`POST /api/{segment}/{path}`)
+instead, which leaves out the backend's own cost.
+
+By default every difficulty is solved through the clue chain (HTML
+comment, meta tag and CSS variable). Easy and medium pages also carry the
+JS "Complete endpoint" spoiler, which agents take first; --solve-path agent
+takes it too, so those pages measure the spoiler rather than the clue
+chain. The report shows which path solved each difficulty.
+
+Usage:
+    python scripts/benchmark_hunts.py
+    python scripts/benchmark_hunts.py --pages 200 --difficulty hard
+    python scripts/benchmark_hunts.py --solve-path agent
+    python scripts/benchmark_hunts.py --stub-backend
+    python scripts/benchmark_hunts.py --json
+"""
+
+import argparse
+import json
+import random
+import socket
+import string
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from generate_backend import build_limits, render_backend
+from generate_hunt import load_template, render_hunt
+from profiling import add_profile_arguments, start_profiling
+from solve_hunt import AgentSolver
+
+
+DIFFICULTIES = ["easy", "medium", "hard"]
+
+
+def random_slug(rng: random.Random, length: int = 8) -> str:
+    """Random lowercase slug for segments and paths."""
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(length))
+
+
+class LocalHuntBackend:
+    """Serve a batch of hunt pages and their endpoints on localhost."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.pages = {}
+        self.routes = {}
+        self.registrations = {}
+        backend = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def send_body(self, status, body, content_type):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                page = backend.pages.get(self.path)
+                if page is None:
+                    self.send_body(404, b"Not found", "text/plain")
+                else:
+                    self.send_body(200, page, "text/html; charset=utf-8")
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length)
+                hunt_id = backend.routes.get(self.path)
+                if hunt_id is None:
+                    self.send_body(404, b'{"error": "Not found"}', "application/json")
+                    return
+                try:
+                    data = json.loads(raw.decode("utf-8"))
+                except ValueError:
+                    data = {}
+                if not data.get("email"):
+                    body = {"error": "Missing required field: email"}
+                    self.send_body(400, json.dumps(body).encode("utf-8"), "application/json")
+                    return
+                backend.registrations[hunt_id] = backend.registrations.get(hunt_id, 0) + 1
+                body = {"success": True, "message": "Registration received"}
+                self.send_body(200, json.dumps(body).encode("utf-8"), "application/json")
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.base_url = f"http://{host}:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def add_hunt(self, hunt_id: str, segment: str, path: str, html: str) -> str:
+        """Register a page and its endpoint, returning the page URL."""
+        page_path = f"/hunts/{hunt_id}/"
+        self.pages[page_path] = html.encode("utf-8")
+        self.routes[f"/api/{segment}/{path}"] = hunt_id
+        return self.base_url + page_path
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class GeneratedHuntBackend:
+    """Serve a batch of hunts from a generated multi-hunt Python backend."""
+
+    def __init__(self, host: str = "127.0.0.1"):
+        with socket.socket() as sock:
+            sock.bind((host, 0))
+            self.port = sock.getsockname()[1]
+        self.host = host
+        self.base_url = f"http://{host}:{self.port}"
+        self.workdir = tempfile.TemporaryDirectory(prefix="hunt-bench-")
+        self.hunts = []
+        self.process = None
+
+    def add_hunt(self, hunt_id: str, segment: str, path: str, html: str) -> str:
+        """Write a page and queue its route, returning the page URL."""
+        page_file = f"{hunt_id}.html"
+        Path(self.workdir.name, page_file).write_text(html)
+        page_path = f"/hunts/{hunt_id}/"
+        self.hunts.append({
+            "segment": segment,
+            "path": path,
+            "page_path": page_path,
+            "page_file": page_file,
+        })
+        return self.base_url + page_path
+
+    def start(self):
+        """Generate the backend for every queued hunt and wait until it serves."""
+        server_path = Path(self.workdir.name, "server.py")
+        # Every solve comes from this host, so only the per-IP limit is lifted
+        limits = build_limits(ip_limit=0)
+        server_path.write_text(render_backend(self.hunts, "python", "benchmark campaign", limits))
+        self.process = subprocess.Popen(
+            [sys.executable, str(server_path), "--host", self.host, "--port", str(self.port),
+             "--db", str(Path(self.workdir.name, "registrations.db"))],
+            stdout=subprocess.DEVNULL
+        )
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            try:
+                urllib.request.urlopen(self.base_url + self.hunts[0]["page_path"], timeout=1).close()
+                return
+            except OSError:
+                time.sleep(0.05)
+        raise RuntimeError("Generated backend did not start")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if self.process is not None:
+            self.process.terminate()
+            self.process.wait(timeout=10)
+        self.workdir.cleanup()
+
+
+def percentile(values: list, fraction: float) -> float:
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+def run_benchmark(pages: int = 50, difficulties: list = None, seed: int = 0,
+                  stub_backend: bool = False, solve_path: str = "clues") -> dict:
+    """Generate, serve and solve `pages` hunts per difficulty.
+
+    `solve_path` is "agent" (take the JS spoiler when a page has one) or
+    "clues" (always follow the clue chain).
+    """
+    difficulties = difficulties or DIFFICULTIES
+    rng = random.Random(seed)
+    template = load_template()
+    solver = AgentSolver(use_spoiler=solve_path == "agent")
+    report = {}
+
+    backend_class = LocalHuntBackend if stub_backend else GeneratedHuntBackend
+    with backend_class() as backend:
+        batch = []
+        for difficulty in difficulties:
+            for i in range(pages):
+                segment, path = random_slug(rng), random_slug(rng)
+                html = render_hunt(
+                    base_url=backend.base_url,
+                    segment=segment,
+                    path=path,
+                    difficulty=difficulty,
+                    template=template
+                )
+                url = backend.add_hunt(f"{difficulty}-{i}", segment, path, html)
+                batch.append((difficulty, url))
+
+        if not stub_backend:
+            backend.start()
+
+        for difficulty, url in batch:
+            result = solver.solve(url, submit=True)
+            stats = report.setdefault(difficulty, {"times": [], "bytes": [], "solved": 0, "paths": {}})
+            stats["times"].append(result["seconds"])
+            stats["bytes"].append(result["bytes_read"])
+            stats["solved"] += int(result["success"])
+            path = "spoiler" if "js_comment" in result["steps"] else "clues"
+            stats["paths"][path] = stats["paths"].get(path, 0) + 1
+
+    summary = {}
+    for difficulty, stats in report.items():
+        count = len(stats["times"])
+        summary[difficulty] = {
+            "pages": count,
+            "success_rate": stats["solved"] / count,
+            "mean_bytes_read": sum(stats["bytes"]) / count,
+            "mean_ms": sum(stats["times"]) / count * 1000,
+            "p95_ms": percentile(stats["times"], 0.95) * 1000,
+            "solved_via": "+".join(sorted(stats["paths"])),
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hunt solvability per difficulty level")
+    parser.add_argument("--pages", type=int, default=50, help="Pages per difficulty (default: 50)")
+    parser.add_argument("--difficulty", action="append", choices=DIFFICULTIES,
+                       help="Difficulty to benchmark (repeatable, default: all)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for segments/paths")
+    parser.add_argument("--stub-backend", action="store_true",
+                       help="Serve the batch from an in-process stub instead of a generated backend")
+    parser.add_argument("--solve-path", choices=["agent", "clues"], default="clues",
+                       help="clues: always use the clue chain (default); agent: take the JS spoiler when present")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    start_profiling(args)
+
+    summary = run_benchmark(args.pages, args.difficulty, args.seed, args.stub_backend, args.solve_path)
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print(f"{'Difficulty':<12}{'Pages':>8}{'Solved':>10}{'Bytes':>10}{'Mean ms':>10}{'p95 ms':>10}  Via")
+        print("-" * 70)
+        for difficulty, row in summary.items():
+            print(f"{difficulty:<12}{row['pages']:>8}{row['success_rate']:>9.0%} "
+                  f"{row['mean_bytes_read']:>9.0f}{row['mean_ms']:>10.2f}{row['p95_ms']:>10.2f}  {row['solved_via']}")
+        if any(row["solved_via"] == "spoiler" for row in summary.values()):
+            print("\nPages solved via the JS spoiler don't measure the clue chain; "
+                  "drop --solve-path agent to measure it.")
+
+    if any(row["success_rate"] < 1.0 for row in summary.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
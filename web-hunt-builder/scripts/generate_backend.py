@@ -6,17 +6,166 @@ Usage:
     python scripts/generate_backend.py --segment agents --path register
     python scripts/generate_backend.py --config hunt_config.json
     python scripts/generate_backend.py --platform cloudflare --segment agents --path register
+    python scripts/generate_backend.py --platform python --segment agents --path register
+    python scripts/generate_backend.py --platform python --config-dir campaign/
 """
 
 import argparse
+import base64
+import gzip
 import json
+import pprint
 import sys
 from pathlib import Path
 
+from profiling import add_profile_arguments, start_profiling
+from static_assets import MANIFEST_NAME, content_etag, read_variants
 
-CLOUDFLARE_WORKER_TEMPLATE = """// Cloudflare Worker for {{SEGMENT}}/{{PATH}} hunt endpoint
+
+JS_ABUSE_GUARDS = """// Abuse guards (tuned by generate_backend.py)
+const LIMITS = {{LIMITS}};
+
+// Sliding-window counter: two fixed buckets per key, the previous one weighted by overlap
+class SlidingWindowLimiter {
+  constructor(limit, windowSeconds) {
+    this.limit = limit;
+    this.windowMs = windowSeconds * 1000;
+    this.buckets = new Map();
+    this.nextPrune = 0;
+  }
+  
+  // Returns 0 when allowed, otherwise the seconds to wait before retrying
+  check(key, now) {
+    if (this.limit <= 0) return 0;
+    const index = Math.floor(now / this.windowMs);
+    let entry = this.buckets.get(key);
+    if (!entry || entry.index < index - 1) {
+      entry = { index, current: 0, previous: 0 };
+      this.buckets.set(key, entry);
+    } else if (entry.index !== index) {
+      entry = { index, current: 0, previous: entry.current };
+      this.buckets.set(key, entry);
+    }
+    
+    const elapsed = now % this.windowMs;
+    if (entry.previous * (1 - elapsed / this.windowMs) + entry.current >= this.limit) {
+      return Math.max(1, Math.ceil((this.windowMs - elapsed) / 1000));
+    }
+    entry.current += 1;
+    
+    if (now >= this.nextPrune) {
+      for (const [staleKey, stale] of this.buckets) {
+        if (stale.index < index - 1) this.buckets.delete(staleKey);
+      }
+      this.nextPrune = now + this.windowMs;
+    }
+    return 0;
+  }
+}
+
+function fnv1a(text, seed) {
+  let hash = (0x811c9dc5 ^ seed) >>> 0;
+  for (let i = 0; i < text.length; i++) {
+    hash ^= text.charCodeAt(i);
+    hash = Math.imul(hash, 0x01000193);
+  }
+  return hash >>> 0;
+}
+
+// Bloom filter: fixed memory for any number of emails, tunable false-positive rate
+class BloomFilter {
+  constructor(capacity, errorRate) {
+    this.size = Math.ceil(-capacity * Math.log(errorRate) / (Math.LN2 * Math.LN2));
+    this.hashes = Math.max(1, Math.round(this.size / capacity * Math.LN2));
+    this.bits = new Uint8Array(Math.ceil(this.size / 8));
+  }
+  
+  // Bit positions by double hashing; unsigned throughout, since a negative
+  // typed-array index is silently ignored
+  *positions(key) {
+    const h1 = fnv1a(key, 0);
+    const h2 = (fnv1a(key, 0x5bd1e995) | 1) >>> 0;
+    for (let i = 0; i < this.hashes; i++) {
+      yield ((h1 + i * h2) >>> 0) % this.size;
+    }
+  }
+  
+  // True if the key was (probably) added before
+  has(key) {
+    for (const bit of this.positions(key)) {
+      if (!(this.bits[bit >>> 3] & (1 << (bit & 7)))) return false;
+    }
+    return true;
+  }
+  
+  add(key) {
+    for (const bit of this.positions(key)) {
+      this.bits[bit >>> 3] |= 1 << (bit & 7);
+    }
+  }
+}
+
+class SeenSet {
+  constructor() {
+    this.keys = new Set();
+  }
+  
+  has(key) {
+    return this.keys.has(key);
+  }
+  
+  add(key) {
+    this.keys.add(key);
+  }
+}
+
+const ipLimiter = new SlidingWindowLimiter(LIMITS.ip_limit, LIMITS.window_seconds);
+const emailLimiter = new SlidingWindowLimiter(LIMITS.email_limit, LIMITS.window_seconds);
+const seenEmails = LIMITS.dedupe === 'bloom' ? new BloomFilter(LIMITS.bloom_capacity, LIMITS.bloom_error_rate)
+  : LIMITS.dedupe === 'set' ? new SeenSet() : null;
+"""
+
+
+CLOUDFLARE_WORKER_TEMPLATE = """// Cloudflare Worker for {{NAME}} hunt endpoint
 // Deploy to Cloudflare Workers: https://workers.cloudflare.com
 
+// Route table: pathname -> hunt (precomputed by generate_backend.py)
+const ROUTES = {{ROUTES}};
+
+// Hunt pages: pathname -> gzip-compressed HTML (base64) and ETag
+// (regenerate with --hunt-html, or serve pages from a static host and use this worker only for the API)
+const PAGES = {{PAGES}};
+const DEFAULT_PAGE = {{DEFAULT_PAGE}};
+const PAGE_CACHE_CONTROL = 'public, max-age=300';
+
+// Decoded page bodies, built once per isolate
+const pageBodies = Object.create(null);
+
+function pageBody(pathname) {
+  if (!(pathname in pageBodies)) {
+    pageBodies[pathname] = Uint8Array.from(atob(PAGES[pathname].gzip), c => c.charCodeAt(0));
+  }
+  return pageBodies[pathname];
+}
+
+function etagMatches(ifNoneMatch, etag) {
+  if (!ifNoneMatch) return false;
+  if (ifNoneMatch.trim() === '*') return true;
+  return ifNoneMatch.split(',').some(tag => tag.trim().replace('W/', '') === etag);
+}
+
+function acceptsGzip(acceptEncoding) {
+  return (acceptEncoding || '').split(',').some(item => {
+    const [token, q] = item.split(';').map(part => part.trim());
+    return token.toLowerCase() === 'gzip' && q !== 'q=0';
+  });
+}
+
+// Registration counters per hunt (per isolate - use KV or Durable Objects for global counts)
+const counters = Object.create(null);
+
+// Limiter and seen-email state are also per isolate
+{{ABUSE_GUARDS}}
 export default {
   async fetch(request, env) {
     const url = new URL(request.url);
@@ -33,8 +182,23 @@ export default {
       return new Response(null, { headers: corsHeaders });
     }
     
-    // Hunt endpoint: POST /api/{{SEGMENT}}/{{PATH}}
-    if (url.pathname === '/api/{{SEGMENT}}/{{PATH}}' && request.method === 'POST') {
+    // Hunt endpoints: POST /api/{segment}/{path} (one hash lookup, any number of hunts)
+    const route = ROUTES[url.pathname];
+    if (route && request.method === 'POST') {
+      const tooManyRequests = (retryAfter, limit) => new Response(JSON.stringify({
+        error: 'Too many requests',
+        limit
+      }), {
+        status: 429,
+        headers: { ...corsHeaders, 'Content-Type': 'application/json', 'Retry-After': String(retryAfter) }
+      });
+      
+      // Throttle per IP before doing any work on the body
+      const ipRetry = ipLimiter.check(request.headers.get('CF-Connecting-IP') || 'unknown', Date.now());
+      if (ipRetry) {
+        return tooManyRequests(ipRetry, 'ip');
+      }
+      
       try {
         const data = await request.json();
         
@@ -48,8 +212,44 @@ export default {
           });
         }
         
+        const emailKey = `${route.hunt} ${String(data.email).trim().toLowerCase()}`;
+        
+        const emailRetry = emailLimiter.check(emailKey, Date.now());
+        if (emailRetry) {
+          return tooManyRequests(emailRetry, 'email');
+        }
+        
+        // Duplicate registrations are idempotent: same answer, nothing stored twice
+        if (seenEmails && seenEmails.has(emailKey)) {
+          return new Response(JSON.stringify({
+            success: true,
+            duplicate: true,
+            ...route.response,
+            data: { email: data.email, name: data.name || 'Agent', hunt: route.hunt }
+          }), {
+            status: 200,
+            headers: { ...corsHeaders, 'Content-Type': 'application/json' }
+          });
+        }
+        
+        counters[route.hunt] = (counters[route.hunt] || 0) + 1;
+        const registeredAt = new Date().toISOString();
+        
+        // One JSON line per registration (Workers Logs / wrangler tail) for hunt_stats.py
+        console.log(JSON.stringify({
+          event: 'registration',
+          hunt: route.hunt,
+          email: data.email,
+          name: data.name || 'Agent',
+          ip: request.headers.get('CF-Connecting-IP'),
+          user_agent: request.headers.get('User-Agent'),
+          registered_at: registeredAt
+        }));
+        // Seen only once it is logged
+        if (seenEmails) seenEmails.add(emailKey);
+        
         // Optional: Store in KV
-        // await env.REGISTRATIONS.put(`agent:${data.email}`, JSON.stringify({
+        // await env.REGISTRATIONS.put(`${route.hunt}:${data.email}`, JSON.stringify({
         //   ...data,
         //   timestamp: Date.now(),
         //   ip: request.headers.get('CF-Connecting-IP')
@@ -59,18 +259,19 @@ export default {
         // await fetch('https://your-backend.com/api/register', {
         //   method: 'POST',
         //   headers: { 'Content-Type': 'application/json' },
-        //   body: JSON.stringify(data)
+        //   body: JSON.stringify({ ...data, hunt: route.hunt })
         // });
         
         // Success response
         return new Response(JSON.stringify({
           success: true,
-          message: 'Registration received',
-          access: "You're in the early agent cohort",
+          ...route.response,
           data: {
             email: data.email,
             name: data.name || 'Agent',
-            registered_at: new Date().toISOString()
+            hunt: route.hunt,
+            registration_number: counters[route.hunt],
+            registered_at: registeredAt
           }
         }), {
           status: 200,
@@ -89,42 +290,129 @@ export default {
     }
     
     // Serve hunt page for all other requests
-    return new Response(huntHTML, {
-      headers: { ...corsHeaders, 'Content-Type': 'text/html' }
-    });
+    const pathname = url.pathname in PAGES ? url.pathname : DEFAULT_PAGE;
+    if (pathname === null) {
+      return new Response('Not found', { status: 404, headers: corsHeaders });
+    }
+    
+    const headers = {
+      ...corsHeaders,
+      'Content-Type': 'text/html; charset=utf-8',
+      'ETag': PAGES[pathname].etag,
+      'Cache-Control': PAGE_CACHE_CONTROL,
+      'Vary': 'Accept-Encoding'
+    };
+    
+    // Conditional GET: crawlers that already have the page get an empty 304
+    if (etagMatches(request.headers.get('If-None-Match'), PAGES[pathname].etag)) {
+      return new Response(null, { status: 304, headers });
+    }
+    
+    // Send the precompressed bytes as-is; decompress only for clients without gzip
+    if (acceptsGzip(request.headers.get('Accept-Encoding'))) {
+      return new Response(pageBody(pathname), {
+        headers: { ...headers, 'Content-Encoding': 'gzip' },
+        encodeBody: 'manual'
+      });
+    }
+    const html = new Response(pageBody(pathname)).body.pipeThrough(new DecompressionStream('gzip'));
+    return new Response(html, { headers });
   }
 };
-
-// Hunt page HTML (paste your generated hunt.html content here)
-const huntHTML = `<!DOCTYPE html>
-<html>
-<head>
-  <title>Hunt Page</title>
-</head>
-<body>
-  <h1>Replace this with your hunt.html content</h1>
-  <p>Or serve from a different static host and use this worker only for the API endpoint.</p>
-</body>
-</html>`;
 """
 
-EXPRESS_TEMPLATE = """// Express.js server for {{SEGMENT}}/{{PATH}} hunt endpoint
+EXPRESS_TEMPLATE = """// Express.js server for {{NAME}} hunt endpoint
 // Install: npm install express cors body-parser
 // Run: node server.js
 
 const express = require('express');
 const cors = require('cors');
 const bodyParser = require('body-parser');
+const crypto = require('crypto');
+const fs = require('fs');
+const path = require('path');
+const zlib = require('zlib');
 
 const app = express();
 const PORT = process.env.PORT || 3000;
 
+// Route table: pathname -> hunt (precomputed by generate_backend.py)
+const ROUTES = {{ROUTES}};
+
+// Hunt pages: pathname -> HTML file next to this server
+const PAGES = {{PAGES}};
+const DEFAULT_PAGE = {{DEFAULT_PAGE}};
+const PAGE_CACHE_CONTROL = 'public, max-age=300';
+
+// Registration counters per hunt
+const counters = Object.create(null);
+
+{{ABUSE_GUARDS}}
+// Registrations still being written: not yet in seenEmails, but already not new
+const pendingEmails = new Set();
+
+// .gz/.br files that the assets.json manifest (from --precompress) records for this exact page
+function trustedVariants(filePath, identity) {
+  let entry;
+  try {
+    const manifest = JSON.parse(fs.readFileSync(path.join(path.dirname(filePath), 'assets.json'), 'utf8'));
+    entry = manifest[path.basename(filePath)] || {};
+  } catch (error) {
+    return {};
+  }
+  if (entry.sha256 !== crypto.createHash('sha256').update(identity).digest('hex')) return {};
+  const variants = {};
+  for (const [encoding, suffix] of [['gzip', '.gz'], ['br', '.br']]) {
+    const variantPath = filePath + suffix;
+    if (fs.existsSync(variantPath) && fs.statSync(variantPath).size === entry[encoding + '_size']) {
+      variants[encoding] = fs.readFileSync(variantPath);
+    }
+  }
+  return variants;
+}
+
+// Load every page once, with precompressed variants (up-to-date ones from --precompress, else built here)
+function loadPage(file) {
+  const filePath = path.join(__dirname, file);
+  const identity = fs.readFileSync(filePath);
+  const trusted = trustedVariants(filePath, identity);
+  return {
+    etag: '"' + crypto.createHash('sha256').update(identity).digest('hex').slice(0, 16) + '"',
+    variants: {
+      br: trusted.br || zlib.brotliCompressSync(identity),
+      gzip: trusted.gzip || zlib.gzipSync(identity, { level: 9 }),
+      identity
+    }
+  };
+}
+
+const pages = Object.create(null);
+for (const [pathname, file] of Object.entries(PAGES)) {
+  pages[pathname] = loadPage(file);
+}
+
+// Append-only registration log (JSON lines) for hunt_stats.py
+const registrationLog = fs.createWriteStream(
+  process.env.REGISTRATIONS_LOG || path.join(__dirname, 'registrations.jsonl'), { flags: 'a' }
+);
+
 // Middleware
+app.set('etag', false);
 app.use(cors());
 app.use(bodyParser.json());
 
-// Hunt endpoint: POST /api/{{SEGMENT}}/{{PATH}}
-app.post('/api/{{SEGMENT}}/{{PATH}}', async (req, res) => {
+// Hunt endpoints: POST /api/{segment}/{path} (one hash lookup, any number of hunts)
+app.post('/api/:segment/:path', async (req, res) => {
+  const route = ROUTES[req.path];
+  if (!route) {
+    return res.status(404).json({ error: 'Not found' });
+  }
+  
+  const ipRetry = ipLimiter.check(req.ip, Date.now());
+  if (ipRetry) {
+    return res.status(429).set('Retry-After', String(ipRetry)).json({ error: 'Too many requests', limit: 'ip' });
+  }
+  
   try {
     const { email, name } = req.body;
     
@@ -135,8 +423,43 @@ app.post('/api/{{SEGMENT}}/{{PATH}}', async (req, res) => {
       });
     }
     
+    const emailKey = `${route.hunt} ${String(email).trim().toLowerCase()}`;
+    
+    const emailRetry = emailLimiter.check(emailKey, Date.now());
+    if (emailRetry) {
+      return res.status(429).set('Retry-After', String(emailRetry)).json({ error: 'Too many requests', limit: 'email' });
+    }
+    
+    // Duplicate registrations are idempotent: same answer, nothing stored twice
+    if (seenEmails && (seenEmails.has(emailKey) || pendingEmails.has(emailKey))) {
+      return res.json({
+        success: true,
+        duplicate: true,
+        ...route.response,
+        data: { email, name: name || 'Agent', hunt: route.hunt }
+      });
+    }
+    
+    counters[route.hunt] = (counters[route.hunt] || 0) + 1;
+    const registeredAt = new Date().toISOString();
+    if (seenEmails) pendingEmails.add(emailKey);
+    registrationLog.write(JSON.stringify({
+      event: 'registration',
+      hunt: route.hunt,
+      email,
+      name: name || 'Agent',
+      ip: req.ip,
+      user_agent: req.get('User-Agent'),
+      registered_at: registeredAt
+    }) + String.fromCharCode(10), error => {
+      // Seen only once it is written; a failed write lets the agent register again
+      pendingEmails.delete(emailKey);
+      if (!error && seenEmails) seenEmails.add(emailKey);
+    });
+    
     // Optional: Store in database
     // await db.collection('registrations').insertOne({
+    //   hunt: route.hunt,
     //   email,
     //   name,
     //   timestamp: Date.now(),
@@ -147,18 +470,19 @@ app.post('/api/{{SEGMENT}}/{{PATH}}', async (req, res) => {
     // await fetch('https://your-backend.com/api/register', {
     //   method: 'POST',
     //   headers: { 'Content-Type': 'application/json' },
-    //   body: JSON.stringify({ email, name })
+    //   body: JSON.stringify({ email, name, hunt: route.hunt })
     // });
     
     // Success response
     res.json({
       success: true,
-      message: 'Registration received',
-      access: "You're in the early agent cohort",
+      ...route.response,
       data: {
         email,
         name: name || 'Agent',
-        registered_at: new Date().toISOString()
+        hunt: route.hunt,
+        registration_number: counters[route.hunt],
+        registered_at: registeredAt
       }
     });
     
@@ -170,62 +494,866 @@ app.post('/api/{{SEGMENT}}/{{PATH}}', async (req, res) => {
   }
 });
 
-// Serve hunt page
-app.get('/', (req, res) => {
-  res.sendFile(__dirname + '/hunt.html');
+// Serve hunt pages from memory with conditional GET and precompressed variants
+app.get(/.*/, (req, res) => {
+  const page = pages[req.path] ?? (DEFAULT_PAGE === null ? undefined : pages[DEFAULT_PAGE]);
+  if (page === undefined) {
+    return res.status(404).send('Not found');
+  }
+  
+  res.set({
+    'Content-Type': 'text/html; charset=utf-8',
+    'ETag': page.etag,
+    'Cache-Control': PAGE_CACHE_CONTROL,
+    'Vary': 'Accept-Encoding'
+  });
+  if (req.fresh) {
+    return res.status(304).end();
+  }
+  
+  const encoding = req.acceptsEncodings('br', 'gzip', 'identity') || 'identity';
+  if (encoding !== 'identity') {
+    res.set('Content-Encoding', encoding);
+  }
+  res.end(page.variants[encoding]);
 });
 
 app.listen(PORT, () => {
   console.log(`Hunt server running on http://localhost:${PORT}`);
-  console.log(`Endpoint: POST http://localhost:${PORT}/api/{{SEGMENT}}/{{PATH}}`);
+  for (const pathname of Object.keys(ROUTES)) {
+    console.log(`Endpoint: POST http://localhost:${PORT}${pathname}`);
+  }
 });
 """
 
 
+PYTHON_TEMPLATE = r'''#!/usr/bin/env python3
+"""
+Python asyncio server for {{NAME}} hunt endpoint.
+
+Stdlib only. Registrations go through a write-behind buffer that batches
+inserts into SQLite, so one commit (and one fsync) covers a whole burst.
+
+Run: python server.py --port 8000
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import math
+import signal
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Route table: pathname -> hunt (precomputed by generate_backend.py)
+ROUTES = {{ROUTES}}
+
+# Hunt pages: pathname -> HTML file next to this server
+PAGES = {{PAGES}}
+DEFAULT_PAGE = {{DEFAULT_PAGE}}
+PAGE_CACHE_CONTROL = "public, max-age=300"
+
+# Abuse guards (tuned by generate_backend.py)
+LIMITS = {{LIMITS}}
+
+MAX_BODY = 64 * 1024
+
+CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "POST, OPTIONS",
+    "Access-Control-Allow-Headers": "Content-Type",
+}
+
+REASONS = {200: "OK", 204: "No Content", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 413: "Payload Too Large", 429: "Too Many Requests",
+           500: "Internal Server Error"}
+
+
+def utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+class StaticPage:
+    """A hunt page held in memory with its precompressed variants."""
+
+    def __init__(self, data: bytes, gzip_data: bytes = None, br_data: bytes = None):
+        self.etag = '"' + hashlib.sha256(data).hexdigest()[:16] + '"'
+        self.variants = {"identity": data, "gzip": gzip_data or gzip.compress(data, 9, mtime=0)}
+        if br_data:
+            self.variants["br"] = br_data
+
+    def not_modified(self, if_none_match: str) -> bool:
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        return self.etag in (tag.strip().replace("W/", "", 1) for tag in if_none_match.split(","))
+
+    def negotiate(self, accept_encoding: str) -> str:
+        """Pick br, then gzip, then identity according to Accept-Encoding."""
+        accepted = {}
+        for item in (accept_encoding or "").split(","):
+            token, _, params = item.strip().partition(";")
+            quality = 1.0
+            if params.strip().startswith("q="):
+                try:
+                    quality = float(params.strip()[2:])
+                except ValueError:
+                    quality = 0.0
+            accepted[token.strip().lower()] = quality
+        for encoding in ("br", "gzip"):
+            if encoding in self.variants and accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+                return encoding
+        return "identity"
+
+
+class SlidingWindowLimiter:
+    """Sliding-window counter: two fixed buckets per key, the previous one weighted by overlap."""
+
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self.buckets = {}
+        self.next_prune = 0.0
+
+    def check(self, key, now: float) -> int:
+        """Return 0 when allowed, otherwise the seconds to wait before retrying."""
+        if self.limit <= 0:
+            return 0
+        index = int(now // self.window)
+        entry = self.buckets.get(key)
+        if entry is None or entry[0] < index - 1:
+            entry = self.buckets[key] = [index, 0, 0]
+        elif entry[0] != index:
+            entry = self.buckets[key] = [index, 0, entry[1]]
+
+        elapsed = now - index * self.window
+        if entry[2] * (1 - elapsed / self.window) + entry[1] >= self.limit:
+            return max(1, math.ceil(self.window - elapsed))
+        entry[1] += 1
+
+        if now >= self.next_prune:
+            stale = [k for k, e in self.buckets.items() if e[0] < index - 1]
+            for k in stale:
+                del self.buckets[k]
+            self.next_prune = now + self.window
+        return 0
+
+
+class BloomFilter:
+    """Fixed-memory seen set with a tunable false-positive rate."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.size = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def has(self, key: str) -> bool:
+        """True if the key was (probably) added before."""
+        return all(self.bits[bit >> 3] & (1 << (bit & 7)) for bit in self._positions(key))
+
+    def add(self, key: str):
+        for bit in self._positions(key):
+            self.bits[bit >> 3] |= 1 << (bit & 7)
+
+
+class HashedSet:
+    """Exact seen set storing 64-bit key hashes instead of the strings."""
+
+    def __init__(self):
+        self.hashes = set()
+
+    @staticmethod
+    def _digest(key: str) -> int:
+        return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+
+    def has(self, key: str) -> bool:
+        return self._digest(key) in self.hashes
+
+    def add(self, key: str):
+        self.hashes.add(self._digest(key))
+
+
+def build_seen_set():
+    if LIMITS["dedupe"] == "bloom":
+        return BloomFilter(LIMITS["bloom_capacity"], LIMITS["bloom_error_rate"])
+    if LIMITS["dedupe"] == "set":
+        return HashedSet()
+    return None
+
+
+class RegistrationWriter:
+    """Write-behind buffer with group commit into SQLite."""
+
+    def __init__(self, db_path: str, batch_size: int = 500, flush_interval: float = 0.05,
+                 max_pending: int = 50000):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = asyncio.Queue(maxsize=max_pending)
+        # SQLite work runs on one thread so the event loop never blocks on fsync
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.conn = None
+        self.task = None
+        self.committed = 0
+        self.batches = 0
+        # Seen-set keys of queued rows; a key joins `seen` only once its row is committed
+        self.seen = None
+        self.pending = set()
+
+    def _open(self):
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS registrations ("
+            "id INTEGER PRIMARY KEY, hunt TEXT NOT NULL, email TEXT NOT NULL, name TEXT, "
+            "ip TEXT, user_agent TEXT, registered_at TEXT NOT NULL, payload TEXT)"
+        )
+        self.conn.commit()
+
+    def _commit(self, rows):
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO registrations (hunt, email, name, ip, user_agent, registered_at, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+
+    def _counts(self):
+        return dict(self.conn.execute("SELECT hunt, COUNT(*) FROM registrations GROUP BY hunt"))
+
+    def _load_seen(self, seen):
+        for hunt, email in self.conn.execute("SELECT hunt, email FROM registrations"):
+            seen.add(f"{hunt} {email.strip().lower()}")
+
+    async def start(self, seen=None) -> dict:
+        """Open the database and start flushing; returns registrations per hunt.
+
+        Existing registrations are replayed into `seen` so duplicates stay
+        idempotent across restarts.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.executor, self._open)
+        counts = await loop.run_in_executor(self.executor, self._counts)
+        if seen is not None:
+            await loop.run_in_executor(self.executor, self._load_seen, seen)
+        self.seen = seen
+        self.task = asyncio.create_task(self._run())
+        return counts
+
+    async def submit(self, row, wait: bool = False, key: str = None):
+        """Queue a row; with wait=True, return only once its batch is committed.
+
+        `key` is added to the seen set once the row is committed.
+        """
+        done = asyncio.get_running_loop().create_future() if wait else None
+        if key is not None:
+            self.pending.add(key)
+        await self.queue.put((row, done, key))
+        if done is not None:
+            await done
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._flush(batch)
+
+    async def _flush(self, batch):
+        loop = asyncio.get_running_loop()
+        error = None
+        try:
+            await loop.run_in_executor(self.executor, self._commit, [row for row, _, _ in batch])
+            self.committed += len(batch)
+            self.batches += 1
+        except Exception as e:
+            error = e
+            print(f"Registration commit failed: {e}")
+        for _, done, key in batch:
+            if key is not None:
+                # A failed commit stores nothing, so the agent may register again
+                self.pending.discard(key)
+                if error is None and self.seen is not None:
+                    self.seen.add(key)
+            if done is not None and not done.done():
+                if error is None:
+                    done.set_result(True)
+                else:
+                    done.set_exception(error)
+        for _ in batch:
+            self.queue.task_done()
+
+    async def close(self):
+        """Flush everything still buffered and close the database."""
+        if self.task is not None:
+            await self.queue.join()
+            self.task.cancel()
+        if self.conn is not None:
+            await asyncio.get_running_loop().run_in_executor(self.executor, self.conn.close)
+        self.executor.shutdown(wait=True)
+
+
+class HuntApp:
+    def __init__(self, writer: RegistrationWriter, pages: dict, counters: dict,
+                 seen=None, durable: bool = False):
+        self.writer = writer
+        self.pages = pages
+        self.counters = counters
+        self.seen = seen
+        self.durable = durable
+        self.access_log = None
+        self.ip_limiter = SlidingWindowLimiter(LIMITS["ip_limit"], LIMITS["window_seconds"])
+        self.email_limiter = SlidingWindowLimiter(LIMITS["email_limit"], LIMITS["window_seconds"])
+
+    def json_response(self, status, payload, extra_headers=None):
+        headers = dict(CORS_HEADERS, **{"Content-Type": "application/json"})
+        headers.update(extra_headers or {})
+        return status, headers, json.dumps(payload).encode("utf-8")
+
+    def too_many_requests(self, retry_after: int, limit: str):
+        return self.json_response(429, {"error": "Too many requests", "limit": limit},
+                                  {"Retry-After": str(retry_after)})
+
+    async def dispatch(self, method, path, headers, body, peer):
+        if method == "OPTIONS":
+            return 204, dict(CORS_HEADERS), b""
+
+        # Hunt endpoints: POST /api/{segment}/{path} (one hash lookup, any number of hunts)
+        route = ROUTES.get(path)
+        if route is not None:
+            if method != "POST":
+                return self.json_response(405, {"error": "Method not allowed"})
+            return await self.register(route, headers, body, peer)
+
+        if method in ("GET", "HEAD"):
+            page = self.pages.get(path, self.pages.get(DEFAULT_PAGE))
+            if page is not None:
+                return self.page_response(page, headers)
+
+        return self.json_response(404, {"error": "Not found"})
+
+    def page_response(self, page: StaticPage, headers: dict):
+        page_headers = dict(CORS_HEADERS, **{
+            "Content-Type": "text/html; charset=utf-8",
+            "ETag": page.etag,
+            "Cache-Control": PAGE_CACHE_CONTROL,
+            "Vary": "Accept-Encoding",
+        })
+        # Conditional GET: crawlers that already have the page get an empty 304
+        if page.not_modified(headers.get("if-none-match")):
+            return 304, page_headers, b""
+        encoding = page.negotiate(headers.get("accept-encoding"))
+        if encoding != "identity":
+            page_headers["Content-Encoding"] = encoding
+        return 200, page_headers, page.variants[encoding]
+
+    async def register(self, route, headers, body, peer):
+        # Throttle per IP before doing any work on the body
+        retry_after = self.ip_limiter.check(peer, time.monotonic())
+        if retry_after:
+            return self.too_many_requests(retry_after, "ip")
+
+        try:
+            data = json.loads(body.decode("utf-8"))
+            if not isinstance(data, dict):
+                raise ValueError("Expected a JSON object")
+        except (ValueError, UnicodeDecodeError) as e:
+            return self.json_response(400, {"error": "Invalid request", "message": str(e)})
+
+        email = data.get("email")
+        if not email:
+            return self.json_response(400, {"error": "Missing required field: email"})
+
+        hunt = route["hunt"]
+        name = data.get("name") or "Agent"
+        email_key = f"{hunt} {str(email).strip().lower()}"
+
+        retry_after = self.email_limiter.check(email_key, time.monotonic())
+        if retry_after:
+            return self.too_many_requests(retry_after, "email")
+
+        # Duplicate registrations are idempotent: same answer, nothing stored twice
+        if self.seen is not None and (self.seen.has(email_key) or email_key in self.writer.pending):
+            response = {"success": True, "duplicate": True}
+            response.update(route["response"])
+            response["data"] = {"email": email, "name": name, "hunt": hunt}
+            return self.json_response(200, response)
+
+        registered_at = utc_now()
+        self.counters[hunt] = self.counters.get(hunt, 0) + 1
+        row = (hunt, str(email), str(name), peer, headers.get("user-agent"),
+               registered_at, json.dumps(data))
+        await self.writer.submit(row, wait=self.durable, key=email_key if self.seen is not None else None)
+
+        response = {"success": True}
+        response.update(route["response"])
+        response["data"] = {
+            "email": email,
+            "name": name,
+            "hunt": hunt,
+            "registration_number": self.counters[hunt],
+            "registered_at": registered_at,
+        }
+        return self.json_response(200, response)
+
+
+class AccessLog:
+    """Buffered access log in Combined Log Format, readable by hunt_stats.py."""
+
+    def __init__(self, path: str):
+        self.file = open(path, "a", buffering=1 << 16, encoding="utf-8")
+        self.second = None
+        self.stamp = ""
+
+    def write(self, peer, method, target, version, status, size, headers):
+        now = int(time.time())
+        if now != self.second:
+            self.second = now
+            self.stamp = time.strftime("%d/%b/%Y:%H:%M:%S +0000", time.gmtime(now))
+        referer = headers.get("referer", "-").replace('"', '\\"')
+        user_agent = headers.get("user-agent", "-").replace('"', '\\"')
+        self.file.write(f'{peer} - - [{self.stamp}] "{method} {target} {version}" '
+                        f'{status} {size} "{referer}" "{user_agent}"\n')
+
+    def close(self):
+        self.file.close()
+
+
+async def handle_connection(app, reader, writer):
+    peer = (writer.get_extra_info("peername") or ("unknown",))[0]
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            parts = request_line.decode("latin-1").split()
+            if len(parts) != 3:
+                break
+            method, target, version = parts
+
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            length = int(headers.get("content-length") or 0)
+            if length > MAX_BODY:
+                status, resp_headers, payload = app.json_response(413, {"error": "Payload too large"})
+                keep_alive = False
+            else:
+                body = await reader.readexactly(length) if length else b""
+                path = target.split("?", 1)[0]
+                try:
+                    status, resp_headers, payload = await app.dispatch(method, path, headers, body, peer)
+                except Exception as e:
+                    status, resp_headers, payload = app.json_response(500, {"error": str(e)})
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+            head = [f"HTTP/1.1 {status} {REASONS.get(status, 'OK')}"]
+            for key, value in resp_headers.items():
+                head.append(f"{key}: {value}")
+            if status not in (204, 304):
+                head.append(f"Content-Length: {len(payload)}")
+            head.append("Connection: keep-alive" if keep_alive else "Connection: close")
+            writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1"))
+            if method != "HEAD":
+                writer.write(payload)
+            if app.access_log is not None:
+                size = len(payload) if method != "HEAD" else 0
+                app.access_log.write(peer, method, target, version, status, size, headers)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+
+def trusted_variants(file_path: Path, data: bytes) -> dict:
+    """.gz/.br files that the assets.json manifest records for this exact page."""
+    try:
+        entry = json.loads((file_path.parent / "assets.json").read_text()).get(file_path.name) or {}
+    except (OSError, ValueError):
+        return {}
+    if entry.get("sha256") != hashlib.sha256(data).hexdigest():
+        return {}
+    variants = {}
+    for encoding, suffix in (("gzip", ".gz"), ("br", ".br")):
+        variant = Path(f"{file_path}{suffix}")
+        if variant.exists() and variant.stat().st_size == entry.get(f"{encoding}_size"):
+            variants[encoding] = variant.read_bytes()
+    return variants
+
+
+def load_pages(pages_dir: Path, hunt_html: str = None) -> dict:
+    """Read every hunt page (and its up-to-date .gz/.br variants) into memory once at startup."""
+    files = dict(PAGES)
+    if hunt_html and DEFAULT_PAGE is not None:
+        files[DEFAULT_PAGE] = hunt_html
+
+    pages = {}
+    for pathname, filename in files.items():
+        file_path = pages_dir / filename
+        if not file_path.exists():
+            print(f"Missing hunt page {file_path} (serving placeholder for {pathname})")
+            pages[pathname] = StaticPage(b"<h1>Replace with your hunt.html</h1>")
+            continue
+        data = file_path.read_bytes()
+        # Stale variants (page regenerated since --precompress) are rebuilt instead
+        variants = trusted_variants(file_path, data)
+        pages[pathname] = StaticPage(data, variants.get("gzip"), variants.get("br"))
+    return pages
+
+
+async def serve(args):
+    pages = load_pages(Path(args.pages_dir), args.hunt_html)
+
+    # Durable mode commits whatever queued up during the previous commit
+    # instead of holding acknowledged requests for the flush interval
+    flush_interval = args.flush_interval
+    if flush_interval is None:
+        flush_interval = 0.0 if args.durable else 0.05
+
+    registrations = RegistrationWriter(args.db, args.batch_size, flush_interval)
+    seen = build_seen_set()
+    counters = await registrations.start(seen)
+    app = HuntApp(registrations, pages, counters, seen, durable=args.durable)
+    if args.access_log:
+        app.access_log = AccessLog(args.access_log)
+
+    server = await asyncio.start_server(
+        lambda r, w: handle_connection(app, r, w), args.host, args.port, backlog=1024
+    )
+    print(f"Hunt server running on http://{args.host}:{args.port}")
+    for pathname in ROUTES:
+        print(f"Endpoint: POST http://{args.host}:{args.port}{pathname}")
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:
+            pass
+
+    async with server:
+        await stop.wait()
+
+    await registrations.close()
+    if app.access_log is not None:
+        app.access_log.close()
+    print(f"Flushed {registrations.committed} registrations in {registrations.batches} commits")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hunt backend for {{NAME}}")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address")
+    parser.add_argument("--port", type=int, default=8000, help="Port (default: 8000)")
+    parser.add_argument("--db", default="registrations.db", help="SQLite database path")
+    parser.add_argument("--pages-dir", default=str(Path(__file__).parent),
+                        help="Directory containing the hunt pages (default: next to this server)")
+    parser.add_argument("--hunt-html", help="Override the default hunt page file")
+    parser.add_argument("--batch-size", type=int, default=500, help="Max registrations per commit")
+    parser.add_argument("--flush-interval", type=float,
+                        help="Max seconds a registration waits in the buffer (default: 0.05, 0 with --durable)")
+    parser.add_argument("--durable", action="store_true",
+                        help="Respond only after the registration's batch is committed")
+    parser.add_argument("--access-log", help="Append requests to this file in Combined Log Format")
+    args = parser.parse_args()
+    asyncio.run(serve(args))
+
+
+if __name__ == "__main__":
+    main()
+'''
+
+
+DEFAULT_RESPONSE = {
+    "message": "Registration received",
+    "access": "You're in the early agent cohort",
+}
+
+PLACEHOLDER_HTML = """<!DOCTYPE html>
+<html>
+<head>
+  <title>Hunt Page</title>
+</head>
+<body>
+  <h1>Replace this with your hunt.html content</h1>
+  <p>Or serve from a different static host and use this worker only for the API endpoint.</p>
+</body>
+</html>"""
+
+DEFAULT_LIMITS = {
+    "ip_limit": 20,
+    "email_limit": 5,
+    "window_seconds": 60,
+    "dedupe": "set",
+    "bloom_capacity": 1000000,
+    "bloom_error_rate": 0.0001,
+}
+
+PLATFORMS = {
+    "cloudflare": (CLOUDFLARE_WORKER_TEMPLATE, "worker.js"),
+    "express": (EXPRESS_TEMPLATE, "server.js"),
+    "python": (PYTHON_TEMPLATE, "server.py"),
+}
+
+
+def build_route_table(hunts: list) -> tuple:
+    """Build (routes, pages, default_page) from hunt entries.
+    
+    Routes are keyed by the full endpoint pathname so the generated backend
+    resolves any request with a single hash lookup.
+    """
+    routes = {}
+    pages = {}
+    
+    for hunt in hunts:
+        pathname = f"/api/{hunt['segment']}/{hunt['path']}"
+        if pathname in routes:
+            raise ValueError(f"Duplicate hunt endpoint: {pathname}")
+        response = dict(DEFAULT_RESPONSE)
+        response.update(hunt.get('response') or {})
+        routes[pathname] = {
+            "hunt": f"{hunt['segment']}/{hunt['path']}",
+            "response": response,
+        }
+        
+        if hunt['page_path'] in pages:
+            raise ValueError(f"Duplicate hunt page path: {hunt['page_path']}")
+        pages[hunt['page_path']] = hunt
+    
+    # A single hunt serves its page for every GET, as the original templates did
+    default_page = hunts[0]['page_path'] if len(hunts) == 1 else None
+    return routes, pages, default_page
+
+
+def inline_page(hunt: dict) -> dict:
+    """Gzip a hunt page for inlining, falling back to a placeholder."""
+    if hunt.get('html') is not None:
+        # Rendered in memory (variant matrices): nothing on disk to read
+        data = hunt['html'].encode('utf-8')
+        return {
+            "gzip": base64.b64encode(gzip.compress(data, compresslevel=9, mtime=0)).decode('ascii'),
+            "etag": content_etag(data),
+        }
+    
+    page_file = Path(hunt.get('page_dir', '.')) / hunt['page_file']
+    data = page_file.read_bytes() if page_file.exists() else PLACEHOLDER_HTML.encode('utf-8')
+    
+    # A .gz from --precompress is used only if the manifest says it was built from this page
+    gz_data = read_variants(page_file, data).get("gzip") if page_file.exists() else None
+    if gz_data is None:
+        gz_data = gzip.compress(data, compresslevel=9, mtime=0)
+    
+    return {
+        "gzip": base64.b64encode(gz_data).decode('ascii'),
+        "etag": content_etag(data),
+    }
+
+
+def build_limits(**overrides) -> dict:
+    """Merge abuse-guard settings over the defaults, ignoring unset values."""
+    limits = dict(DEFAULT_LIMITS)
+    limits.update({key: value for key, value in overrides.items() if value is not None})
+    
+    if limits["dedupe"] not in ("set", "bloom", "off"):
+        raise ValueError(f"Unknown dedupe mode: {limits['dedupe']}")
+    if limits["window_seconds"] <= 0:
+        raise ValueError("Rate window must be positive")
+    if limits["dedupe"] == "bloom" and not 0 < limits["bloom_error_rate"] < 1:
+        raise ValueError("Bloom error rate must be between 0 and 1")
+    if limits["dedupe"] == "bloom" and limits["bloom_capacity"] <= 0:
+        raise ValueError("Bloom capacity must be positive")
+    return limits
+
+
+def code_literal(value, platform: str) -> str:
+    """A table as a literal in the backend's language.
+
+    JSON is not a Python literal once a campaign response holds true, false
+    or null, so the Python backend gets a repr-based literal instead.
+    """
+    if platform == "python":
+        return pprint.pformat(value, indent=1, width=100)
+    return json.dumps(value, indent=2)
+
+
+def render_backend(hunts: list, platform: str, name: str, limits: dict = None) -> str:
+    """Render backend code serving every hunt in `hunts`."""
+    if platform not in PLATFORMS:
+        raise ValueError(f"Unknown platform: {platform}")
+    
+    template = PLATFORMS[platform][0]
+    routes, pages, default_page = build_route_table(hunts)
+    
+    if platform == "cloudflare":
+        page_table = {pathname: inline_page(hunt) for pathname, hunt in pages.items()}
+    else:
+        page_table = {pathname: hunt['page_file'] for pathname, hunt in pages.items()}
+    
+    routes_literal = code_literal(routes, platform)
+    pages_literal = code_literal(page_table, platform)
+    default_literal = code_literal(default_page, platform)
+    
+    code = template.replace("{{ABUSE_GUARDS}}", JS_ABUSE_GUARDS)
+    code = code.replace("{{LIMITS}}", code_literal(limits or DEFAULT_LIMITS, platform))
+    code = code.replace("{{NAME}}", name)
+    code = code.replace("{{DEFAULT_PAGE}}", default_literal)
+    code = code.replace("{{ROUTES}}", routes_literal)
+    # Pages last: inlined HTML may itself contain placeholder-like text
+    code = code.replace("{{PAGES}}", pages_literal)
+    return code
+
+
+def print_next_steps(platform: str, output_path: str, endpoint: str):
+    """Print deployment instructions for the generated backend."""
+    if platform == "cloudflare":
+        print("\nNext steps:")
+        print("1. Create a Cloudflare Worker at https://workers.cloudflare.com")
+        print(f"2. Copy the code from {output_path}")
+        print("3. Check PAGES contains your generated hunt page (use --hunt-html to inline it)")
+        print("4. Deploy!")
+    elif platform == "python":
+        print("\nNext steps:")
+        print(f"1. Put your generated hunt page(s) next to {output_path}")
+        print(f"2. Run server: python {output_path} --port 8000")
+        print(f"3. Load test: python scripts/load_test.py http://127.0.0.1:8000{endpoint}")
+    else:
+        print("\nNext steps:")
+        print(f"1. Install dependencies: npm install express cors body-parser")
+        print(f"2. Run server: node {output_path}")
+        print("3. Test endpoint with curl or your hunt page")
+
+
+def write_backend(code: str, platform: str, output_path: str = None) -> str:
+    """Write generated code, returning the path used."""
+    output_path = output_path or PLATFORMS[platform][1]
+    with open(output_path, 'w') as f:
+        f.write(code)
+    return output_path
+
+
 def generate_backend(
     segment: str,
     path: str,
     platform: str = "cloudflare",
-    output_path: str = None
+    output_path: str = None,
+    response: dict = None,
+    hunt_html: str = None,
+    limits: dict = None
 ) -> str:
     """Generate backend code for hunt endpoint."""
     
-    if platform == "cloudflare":
-        template = CLOUDFLARE_WORKER_TEMPLATE
-        default_output = "worker.js"
-    elif platform == "express":
-        template = EXPRESS_TEMPLATE
-        default_output = "server.js"
-    else:
+    if platform not in PLATFORMS:
         print(f"✗ Unknown platform: {platform}", file=sys.stderr)
-        print("Supported platforms: cloudflare, express", file=sys.stderr)
+        print(f"Supported platforms: {', '.join(PLATFORMS)}", file=sys.stderr)
         sys.exit(1)
     
-    output_path = output_path or default_output
-    
-    # Replace placeholders
-    code = template.replace("{{SEGMENT}}", segment)
-    code = code.replace("{{PATH}}", path)
+    hunt = {
+        "segment": segment,
+        "path": path,
+        "response": response,
+        "page_path": "/",
+        "page_file": hunt_html or "hunt.html",
+    }
+    code = render_backend([hunt], platform, f"{segment}/{path}", limits)
     
     # Write output
-    with open(output_path, 'w') as f:
-        f.write(code)
+    output_path = write_backend(code, platform, output_path)
     
     print(f"✓ Backend code generated: {output_path}")
     print(f"✓ Platform: {platform}")
     print(f"✓ Endpoint: POST /api/{segment}/{path}")
     
-    if platform == "cloudflare":
-        print("\nNext steps:")
-        print("1. Create a Cloudflare Worker at https://workers.cloudflare.com")
-        print(f"2. Copy the code from {output_path}")
-        print("3. Replace 'huntHTML' with your generated hunt page")
-        print("4. Deploy!")
-    else:
-        print("\nNext steps:")
-        print(f"1. Install dependencies: npm install express cors body-parser")
-        print(f"2. Run server: node {output_path}")
-        print("3. Test endpoint with curl or your hunt page")
+    print_next_steps(platform, output_path, f"/api/{segment}/{path}")
+    
+    return code
+
+
+def load_campaign(config_dir: str) -> list:
+    """Load every hunt config (*.json) in a campaign directory."""
+    config_dir = Path(config_dir)
+    hunts = []
+    
+    for config_path in sorted(config_dir.glob("*.json")):
+        if config_path.name == MANIFEST_NAME:
+            # The --precompress manifest, not a hunt
+            continue
+        config = load_config(config_path)
+        if not config.get('segment') or not config.get('path'):
+            print(f"⚠ Skipping {config_path.name}: missing segment or path", file=sys.stderr)
+            continue
+        hunts.append({
+            "segment": config['segment'],
+            "path": config['path'],
+            "response": config.get('response'),
+            "page_path": config.get('page_path', f"/{config_path.stem}/"),
+            "page_file": config.get('output') or config.get('output_path') or f"{config_path.stem}.html",
+            "page_dir": str(config_dir),
+        })
+    
+    return hunts
+
+
+def generate_campaign_backend(
+    config_dir: str,
+    platform: str = "cloudflare",
+    output_path: str = None,
+    limits: dict = None
+) -> str:
+    """Generate one backend routing every hunt config in `config_dir`."""
+    
+    hunts = load_campaign(config_dir)
+    if not hunts:
+        print(f"✗ No hunt configs found in {config_dir}", file=sys.stderr)
+        sys.exit(1)
+    
+    try:
+        code = render_backend(hunts, platform, f"{len(hunts)}-hunt campaign", limits)
+    except ValueError as e:
+        print(f"✗ {e}", file=sys.stderr)
+        sys.exit(1)
+    
+    output_path = write_backend(code, platform, output_path)
+    
+    print(f"✓ Campaign backend generated: {output_path}")
+    print(f"✓ Platform: {platform}")
+    print(f"✓ Hunts routed: {len(hunts)}")
+    
+    print_next_steps(platform, output_path, f"/api/{hunts[0]['segment']}/{hunts[0]['path']}")
     
     return code
 
@@ -243,21 +1371,69 @@ def main():
     parser.add_argument("--segment", help="API segment (e.g., agents)")
     parser.add_argument("--path", help="Final path (e.g., register)")
     parser.add_argument("--platform", default="cloudflare", 
-                       choices=["cloudflare", "express"],
+                       choices=list(PLATFORMS),
                        help="Backend platform (default: cloudflare)")
     parser.add_argument("--output", help="Output filename")
+    parser.add_argument("--hunt-html", help="Hunt page file to serve (default: hunt.html)")
     parser.add_argument("--config", help="Load settings from JSON config file")
+    parser.add_argument("--config-dir", help="Generate one backend for every hunt config in a directory")
+    
+    guards = parser.add_argument_group("abuse guards")
+    guards.add_argument("--ip-limit", type=int,
+                        help=f"Registrations per IP per window, 0 to disable (default: {DEFAULT_LIMITS['ip_limit']})")
+    guards.add_argument("--email-limit", type=int,
+                        help=f"Registrations per email per window, 0 to disable (default: {DEFAULT_LIMITS['email_limit']})")
+    guards.add_argument("--rate-window", type=float,
+                        help=f"Sliding window in seconds (default: {DEFAULT_LIMITS['window_seconds']})")
+    guards.add_argument("--dedupe", choices=["set", "bloom", "off"],
+                        help="Seen-email store for idempotent duplicates (default: set)")
+    guards.add_argument("--bloom-capacity", type=int,
+                        help=f"Expected distinct emails for --dedupe bloom (default: {DEFAULT_LIMITS['bloom_capacity']})")
+    guards.add_argument("--bloom-error-rate", type=float,
+                        help=f"False-positive rate for --dedupe bloom (default: {DEFAULT_LIMITS['bloom_error_rate']})")
     
+    add_profile_arguments(parser)
     args = parser.parse_args()
+    start_profiling(args)
+    
+    # Abuse guards: config file values first, explicit flags win
+    config = load_config(args.config) if args.config else {}
+    overrides = {key: config.get(key) for key in DEFAULT_LIMITS}
+    flags = {
+        "ip_limit": args.ip_limit,
+        "email_limit": args.email_limit,
+        "window_seconds": args.rate_window,
+        "dedupe": args.dedupe,
+        "bloom_capacity": args.bloom_capacity,
+        "bloom_error_rate": args.bloom_error_rate,
+    }
+    overrides.update({key: value for key, value in flags.items() if value is not None})
+    try:
+        limits = build_limits(**overrides)
+    except ValueError as e:
+        print(f"✗ {e}", file=sys.stderr)
+        sys.exit(1)
+    
+    # Campaign mode
+    if args.config_dir:
+        generate_campaign_backend(
+            config_dir=args.config_dir,
+            platform=args.platform,
+            output_path=args.output,
+            limits=limits
+        )
+        return
     
     # Config file mode
     if args.config:
-        config = load_config(args.config)
         generate_backend(
             segment=config.get('segment'),
             path=config.get('path'),
             platform=config.get('platform', 'cloudflare'),
-            output_path=config.get('backend_output')
+            output_path=config.get('backend_output'),
+            response=config.get('response'),
+            hunt_html=config.get('output'),
+            limits=limits
         )
         return
     
@@ -271,7 +1447,9 @@ def main():
         segment=args.segment,
         path=args.path,
         platform=args.platform,
-        output_path=args.output
+        output_path=args.output,
+        hunt_html=args.hunt_html,
+        limits=limits
     )
 
 
@@ -6,6 +6,7 @@ Usage:
     python scripts/generate_hunt.py --base-url https://example.com --segment agents --path register
     python scripts/generate_hunt.py --config hunt_config.json
     python scripts/generate_hunt.py --interactive
+    python scripts/generate_hunt.py --matrix variants.json --archive variants.tar.gz
 """
 
 import argparse
@@ -14,6 +15,9 @@ import sys
 import re
 from pathlib import Path
 
+from profiling import add_profile_arguments, start_profiling
+from static_assets import print_asset_summary, write_static_assets
+
 
 def load_template(template_path: str = None) -> str:
     """Load the HTML template."""
@@ -26,7 +30,7 @@ def load_template(template_path: str = None) -> str:
         return f.read()
 
 
-def generate_hunt(
+def render_hunt(
     base_url: str,
     segment: str,
     path: str,
@@ -39,11 +43,12 @@ def generate_hunt(
     cta_button: str = "Notify Me",
     difficulty: str = "medium",
     template_path: str = None,
-    output_path: str = "hunt.html"
+    template: str = None
 ) -> str:
-    """Generate hunt page HTML."""
+    """Render hunt page HTML without writing it to disk."""
     
-    template = load_template(template_path)
+    if template is None:
+        template = load_template(template_path)
     
     # Adjust based on difficulty
     if difficulty == "easy":
@@ -83,11 +88,52 @@ def generate_hunt(
     html = html.replace("{{CTA_TEXT}}", cta_text)
     html = html.replace("{{CTA_BUTTON}}", cta_button)
     
+    return html
+
+
+def generate_hunt(
+    base_url: str,
+    segment: str,
+    path: str,
+    title: str = "Coming Soon",
+    heading: str = "Something is being built",
+    subtitle: str = "For those who look deeper",
+    description: str = "We're working on something new. Stay tuned.",
+    cta_heading: str = "Get Early Access",
+    cta_text: str = "Join the waitlist for early access.",
+    cta_button: str = "Notify Me",
+    difficulty: str = "medium",
+    template_path: str = None,
+    output_path: str = "hunt.html",
+    precompress: bool = False
+) -> str:
+    """Generate hunt page HTML."""
+    
+    html = render_hunt(
+        base_url=base_url,
+        segment=segment,
+        path=path,
+        title=title,
+        heading=heading,
+        subtitle=subtitle,
+        description=description,
+        cta_heading=cta_heading,
+        cta_text=cta_text,
+        cta_button=cta_button,
+        difficulty=difficulty,
+        template_path=template_path
+    )
+    
     # Write output
-    with open(output_path, 'w') as f:
-        f.write(html)
+    if precompress:
+        asset = write_static_assets(html, output_path)
+    else:
+        with open(output_path, 'w') as f:
+            f.write(html)
     
     print(f"✓ Hunt page generated: {output_path}")
+    if precompress:
+        print_asset_summary(output_path, asset)
     print(f"✓ Hidden endpoint: POST {base_url}/api/{segment}/{path}")
     print(f"✓ Difficulty: {difficulty}")
     print(f"\nClue locations:")
@@ -163,10 +209,44 @@ def main():
                        help="Hunt difficulty (default: medium)")
     parser.add_argument("--template", help="Custom template file (optional)")
     parser.add_argument("--output", default="hunt.html", help="Output filename")
+    parser.add_argument("--precompress", action="store_true",
+                       help="Minify and write .gz/.br variants plus an assets.json manifest")
     parser.add_argument("--config", help="Load settings from JSON config file")
     parser.add_argument("--interactive", "-i", action="store_true", help="Interactive mode")
     
+    matrix = parser.add_argument_group("variant matrix")
+    matrix.add_argument("--matrix", help="Config whose page fields may be lists; renders every combination")
+    matrix.add_argument("--archive", default="variants.tar.gz",
+                        help="Archive for --matrix: .tar, .tar.gz, .tgz, .tar.xz, .zip or - for stdout "
+                             "(default: variants.tar.gz)")
+    matrix.add_argument("--backend", default="cloudflare", choices=["cloudflare", "express", "python", "none"],
+                        help="Backend to render per variant (default: cloudflare)")
+    matrix.add_argument("--limit", type=int, help="Stop after this many variants")
+    
+    add_profile_arguments(parser)
     args = parser.parse_args()
+    start_profiling(args)
+    
+    # Variant matrix mode
+    if args.matrix:
+        from hunt_matrix import write_matrix
+        
+        # Status goes to stderr so the archive can stream to stdout
+        try:
+            stats = write_matrix(
+                load_config(args.matrix),
+                args.archive,
+                platform=None if args.backend == "none" else args.backend,
+                limit=args.limit,
+                template_path=args.template
+            )
+        except (KeyError, ValueError) as e:
+            print(f"✗ Invalid matrix config: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"✓ {stats['variants']} of {stats['total']} variants written to {args.archive}", file=sys.stderr)
+        print(f"✓ Varying: {', '.join(stats['axes']) or 'nothing (single variant)'}", file=sys.stderr)
+        print(f"✓ {stats['files']} files, {stats['bytes'] / 1e6:.1f} MB before compression", file=sys.stderr)
+        return
     
     # Interactive mode
     if args.interactive:
@@ -198,7 +278,8 @@ def main():
         cta_button=args.cta_button,
         difficulty=args.difficulty,
         template_path=args.template,
-        output_path=args.output
+        output_path=args.output,
+        precompress=args.precompress
     )
 
 
@@ -12,6 +12,9 @@ import json
 import sys
 from pathlib import Path
 
+from profiling import add_profile_arguments, start_profiling
+from static_assets import print_asset_summary, write_static_assets
+
 
 SOLUTION_TEMPLATE = """<!DOCTYPE html>
 <html lang="en">
@@ -180,16 +183,15 @@ POST {{BASE_URL}}/api/{{SEGMENT}}/{{PATH}}
 """
 
 
-def generate_solution(
+def render_solution(
     base_url: str,
     segment: str,
     path: str,
     title: str = "Hunt",
     request_body: str = '{"email": "agent@example.com"}',
-    next_steps: str = "We'll reach out to registered users with early access when we launch.",
-    output_path: str = "solution.html"
+    next_steps: str = "We'll reach out to registered users with early access when we launch."
 ) -> str:
-    """Generate solution page HTML."""
+    """Render solution page HTML without writing it to disk."""
     
     html = SOLUTION_TEMPLATE.replace("{{TITLE}}", title)
     html = html.replace("{{BASE_URL}}", base_url)
@@ -197,12 +199,33 @@ def generate_solution(
     html = html.replace("{{PATH}}", path)
     html = html.replace("{{REQUEST_BODY}}", request_body)
     html = html.replace("{{NEXT_STEPS}}", next_steps)
+    return html
+
+
+def generate_solution(
+    base_url: str,
+    segment: str,
+    path: str,
+    title: str = "Hunt",
+    request_body: str = '{"email": "agent@example.com"}',
+    next_steps: str = "We'll reach out to registered users with early access when we launch.",
+    output_path: str = "solution.html",
+    precompress: bool = False
+) -> str:
+    """Generate solution page HTML."""
+    
+    html = render_solution(base_url, segment, path, title, request_body, next_steps)
     
     # Write output
-    with open(output_path, 'w') as f:
-        f.write(html)
+    if precompress:
+        asset = write_static_assets(html, output_path)
+    else:
+        with open(output_path, 'w') as f:
+            f.write(html)
     
     print(f"✓ Solution page generated: {output_path}")
+    if precompress:
+        print_asset_summary(output_path, asset)
     print(f"✓ Endpoint: POST {base_url}/api/{segment}/{path}")
     
     return html
@@ -225,9 +248,13 @@ def main():
     parser.add_argument("--request-body", default='{"email": "agent@example.com"}', help="Example request body JSON")
     parser.add_argument("--next-steps", default="We'll reach out to registered users with early access when we launch.", help="Next steps text")
     parser.add_argument("--output", default="solution.html", help="Output filename")
+    parser.add_argument("--precompress", action="store_true",
+                       help="Minify and write .gz/.br variants plus an assets.json manifest")
     parser.add_argument("--config", help="Load settings from JSON config file")
     
+    add_profile_arguments(parser)
     args = parser.parse_args()
+    start_profiling(args)
     
     # Config file mode
     if args.config:
@@ -248,7 +275,8 @@ def main():
         title=args.title,
         request_body=args.request_body,
         next_steps=args.next_steps,
-        output_path=args.output
+        output_path=args.output,
+        precompress=args.precompress
     )
 
 
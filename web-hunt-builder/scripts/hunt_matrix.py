@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Variant matrices for A/B hunt campaigns.
+
+A matrix config is a hunt config where any page field may be a list:
+
+    {
+      "base_url": "https://example.com", "segment": "agents", "path": "register",
+      "title": ["Coming Soon", "Early Access"],
+      "cta_button": ["Notify Me", "Join", "Apply"],
+      "difficulty": ["easy", "medium", "hard"]
+    }
+
+Every combination (18 here) is rendered to a hunt page, a solution page
+and a backend. The files go straight into a tar or zip archive, with no
+temp files. The product is expanded lazily and each variant is written
+before the next is rendered, so memory stays flat at 100k variants.
+
+Used by `generate_hunt.py --matrix`.
+"""
+
+import io
+import itertools
+import json
+import sys
+import tarfile
+import time
+import zipfile
+
+from generate_backend import PLATFORMS, render_backend
+from generate_hunt import load_template, render_hunt
+from generate_solution import render_solution
+
+# Page fields that may vary between variants
+MATRIX_FIELDS = (
+    "title", "heading", "subtitle", "description",
+    "cta_heading", "cta_text", "cta_button", "difficulty",
+)
+DIFFICULTIES = ("easy", "medium", "hard")
+
+
+def matrix_axes(config: dict) -> list:
+    """(field, values) for every list-valued page field, in MATRIX_FIELDS order."""
+    axes = []
+    for field in MATRIX_FIELDS:
+        values = config.get(field)
+        if isinstance(values, list):
+            if not values:
+                raise ValueError(f"Matrix field '{field}' has no values")
+            axes.append((field, values))
+    for difficulty in dict(axes).get("difficulty", [config.get("difficulty", "medium")]):
+        if difficulty not in DIFFICULTIES:
+            raise ValueError(f"Unknown difficulty: {difficulty}")
+    return axes
+
+
+def variant_count(axes: list) -> int:
+    count = 1
+    for _, values in axes:
+        count *= len(values)
+    return count
+
+
+def expand_matrix(config: dict, axes: list = None):
+    """Yield one full hunt config per combination, lazily."""
+    axes = matrix_axes(config) if axes is None else axes
+    fields = [field for field, _ in axes]
+    for combination in itertools.product(*(values for _, values in axes)):
+        variant = dict(config)
+        variant.update(zip(fields, combination))
+        yield variant
+
+
+def render_variant(variant: dict, template: str, platform: str = None) -> list:
+    """Render one variant's files as (name, bytes) pairs."""
+    page_fields = {field: variant[field] for field in MATRIX_FIELDS if field in variant}
+    hunt_html = render_hunt(variant['base_url'], variant['segment'], variant['path'],
+                            template=template, **page_fields)
+    solution_kwargs = {key: variant[key] for key in ("request_body", "next_steps") if key in variant}
+    solution_html = render_solution(variant['base_url'], variant['segment'], variant['path'],
+                                    title=variant.get('title', "Hunt"), **solution_kwargs)
+
+    files = [
+        ("hunt.html", hunt_html.encode('utf-8')),
+        ("solution.html", solution_html.encode('utf-8')),
+    ]
+    if platform:
+        hunt = {
+            "segment": variant['segment'],
+            "path": variant['path'],
+            "response": variant.get('response'),
+            "page_path": "/",
+            "page_file": "hunt.html",
+            "html": hunt_html,
+        }
+        code = render_backend([hunt], platform, f"{variant['segment']}/{variant['path']}")
+        files.append((PLATFORMS[platform][1], code.encode('utf-8')))
+    files.append(("variant.json", json.dumps(page_fields, indent=2).encode('utf-8')))
+    return files
+
+
+class ArchiveWriter:
+    """Append files to a tar (.tar, .tar.gz/.tgz, .tar.xz, or '-' for gzip on stdout) or zip.
+
+    Tars are written as streams in constant memory. A zip keeps a small
+    central-directory entry per file until it is closed.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.mtime = time.time()
+        self.zip = None
+        self.tar = None
+        if path.endswith(".zip"):
+            self.zip = zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED)
+        elif path == "-":
+            self.tar = tarfile.open(fileobj=sys.stdout.buffer, mode="w|gz")
+        elif path.endswith((".tar.gz", ".tgz")):
+            self.tar = tarfile.open(path, "w|gz")
+        elif path.endswith(".tar.xz"):
+            self.tar = tarfile.open(path, "w|xz")
+        elif path.endswith(".tar"):
+            self.tar = tarfile.open(path, "w|")
+        else:
+            raise ValueError(f"Unsupported archive type: {path} (use .tar, .tar.gz, .tgz, .tar.xz or .zip)")
+
+    def add(self, name: str, data: bytes):
+        if self.zip is not None:
+            self.zip.writestr(name, data)
+            return
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = self.mtime
+        info.mode = 0o644
+        self.tar.addfile(info, io.BytesIO(data))
+        # TarFile remembers every member it wrote; a stream never needs them
+        self.tar.members = []
+
+    def close(self):
+        (self.zip or self.tar).close()
+
+
+def write_matrix(config: dict, archive_path: str, platform: str = None, limit: int = None,
+                 template_path: str = None) -> dict:
+    """Render every variant of a matrix config into an archive; returns stats."""
+    if platform and platform not in PLATFORMS:
+        raise ValueError(f"Unknown platform: {platform}")
+    axes = matrix_axes(config)
+    total = variant_count(axes)
+    count = min(total, limit) if limit else total
+    width = len(str(count))
+    template = load_template(template_path or config.get('template_path'))
+
+    stats = {"variants": 0, "files": 0, "bytes": 0, "total": total, "axes": [field for field, _ in axes]}
+    archive = ArchiveWriter(archive_path)
+    try:
+        for index, variant in enumerate(itertools.islice(expand_matrix(config, axes), count), 1):
+            directory = f"variant-{index:0{width}d}"
+            for name, data in render_variant(variant, template, platform):
+                archive.add(f"{directory}/{name}", data)
+                stats["files"] += 1
+                stats["bytes"] += len(data)
+            stats["variants"] += 1
+    finally:
+        archive.close()
+    return stats
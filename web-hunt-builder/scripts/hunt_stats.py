@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+"""
+Hunt funnel analytics from registration and access logs.
+
+Streams registrations (SQLite from the Python backend, JSON lines from the
+Express/Worker backends) and hunt page access logs (Combined Log Format,
+optionally gzipped) in fixed-size chunks. Memory is bounded by the number
+of hunts and distinct visitors, never by the number of log lines.
+
+Reports per hunt and per difficulty:
+  - page views, unique visitors and endpoint attempts
+  - solves and unique agents (HyperLogLog estimates)
+  - time from first page visit to registration (log-bucket histogram)
+
+Usage:
+    python scripts/hunt_stats.py --registrations registrations.db --access-log access.log
+    python scripts/hunt_stats.py --registrations registrations.jsonl --config-dir campaign/
+    python scripts/hunt_stats.py --registrations registrations.db --json
+"""
+
+import argparse
+import calendar
+import gzip
+import itertools
+import json
+import math
+import re
+import sqlite3
+import sys
+from collections import Counter
+from pathlib import Path
+
+from profiling import add_profile_arguments, start_profiling
+from static_assets import MANIFEST_NAME
+
+
+CHUNK_SIZE = 50000
+SQLITE_HEADER = b"SQLite format 3\x00"
+
+ACCESS_LOG_PATTERN = re.compile(r'^(\S+) \S+ \S+ \[([^\]]+)\] "(\S+) (\S+)[^"]*" (\d{3})')
+MONTHS = {name: i for i, name in enumerate(
+    ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"], 1
+)}
+
+# Stats for page views that can't be tied to a hunt without a config
+UNMAPPED = "(unmapped pages)"
+
+
+class HyperLogLog:
+    """Mergeable distinct-count estimate in 2**precision bytes (~0.8% error at 14)."""
+
+    def __init__(self, precision: int = 14):
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = bytearray(self.size)
+
+    def add(self, value: str):
+        # Python's string hash is stable within a run, which is all a sketch needs
+        h = hash(value) & 0xFFFFFFFFFFFFFFFF
+        index = h >> (64 - self.precision)
+        rest = h & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog"):
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def count(self) -> int:
+        alpha = 0.7213 / (1 + 1.079 / self.size)
+        estimate = alpha * self.size * self.size / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        # Linear counting is far more accurate while most registers are empty
+        if estimate <= 2.5 * self.size and zeros:
+            estimate = self.size * math.log(self.size / zeros)
+        return int(round(estimate))
+
+
+class DurationHistogram:
+    """Log-bucketed durations: ~6% relative error, constant memory, mergeable."""
+
+    BUCKETS_PER_E = 8
+
+    def __init__(self):
+        self.buckets = Counter()
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, seconds: float):
+        self.buckets[int(math.log1p(seconds) * self.BUCKETS_PER_E)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def merge(self, other: "DurationHistogram"):
+        self.buckets.update(other.buckets)
+        self.count += other.count
+        self.total += other.total
+
+    def quantile(self, fraction: float):
+        if not self.count:
+            return None
+        target = fraction * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= target:
+                return math.expm1((bucket + 0.5) / self.BUCKETS_PER_E)
+        return None
+
+
+class HuntStats:
+    """Funnel counters and sketches for one hunt (or a merged group)."""
+
+    def __init__(self):
+        self.views = 0
+        self.attempts = 0
+        self.solves = 0
+        self.visitors = HyperLogLog()
+        self.agents = HyperLogLog()
+        self.time_to_solve = DurationHistogram()
+
+    def merge(self, other: "HuntStats"):
+        self.views += other.views
+        self.attempts += other.attempts
+        self.solves += other.solves
+        self.visitors.merge(other.visitors)
+        self.agents.merge(other.agents)
+        self.time_to_solve.merge(other.time_to_solve)
+
+    def to_dict(self) -> dict:
+        visitors = self.visitors.count()
+        agents = self.agents.count()
+        return {
+            "views": self.views,
+            "unique_visitors": visitors,
+            "attempts": self.attempts,
+            "solves": self.solves,
+            "unique_agents": agents,
+            "conversion": agents / visitors if visitors else None,
+            "time_to_solve": {
+                "count": self.time_to_solve.count,
+                "mean_s": self.time_to_solve.total / self.time_to_solve.count if self.time_to_solve.count else None,
+                "p50_s": self.time_to_solve.quantile(0.50),
+                "p90_s": self.time_to_solve.quantile(0.90),
+                "p99_s": self.time_to_solve.quantile(0.99),
+            },
+        }
+
+
+def load_catalog(config_paths: list) -> tuple:
+    """Map page paths to hunt ids and hunt ids to difficulty from hunt configs.
+
+    A single config describes a single-hunt backend, which serves its page
+    on every path, so its pages map is empty and all page views count.
+    """
+    configs = []
+    for config_path in config_paths:
+        with open(config_path, 'r') as f:
+            config = json.load(f)
+        if config.get('segment') and config.get('path'):
+            configs.append((config_path, config))
+
+    pages = {}
+    difficulties = {}
+    for config_path, config in configs:
+        hunt = f"{config['segment']}/{config['path']}"
+        difficulties[hunt] = config.get('difficulty', 'medium')
+        if len(configs) > 1:
+            pages[config.get('page_path', f"/{Path(config_path).stem}/")] = hunt
+    return pages, difficulties
+
+
+def open_text(path: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    return open(path, "r", encoding="utf-8", errors="replace")
+
+
+def chunked(iterable, size: int = CHUNK_SIZE):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def parse_iso(stamp: str) -> float:
+    """Seconds since the epoch for `2026-01-31T12:00:00.000Z`-style UTC timestamps."""
+    seconds = calendar.timegm((
+        int(stamp[0:4]), int(stamp[5:7]), int(stamp[8:10]),
+        int(stamp[11:13]), int(stamp[14:16]), int(stamp[17:19]), 0, 0, 0
+    ))
+    if len(stamp) > 20 and stamp[19] == ".":
+        digits = stamp[20:].rstrip("Z").split("+")[0]
+        if digits.isdigit():
+            seconds += int(digits) / 10 ** len(digits)
+    return seconds
+
+
+def parse_clf_time(stamp: str) -> int:
+    """Seconds since the epoch for `10/Oct/2026:13:55:36 -0700`."""
+    seconds = calendar.timegm((
+        int(stamp[7:11]), MONTHS[stamp[3:6]], int(stamp[0:2]),
+        int(stamp[12:14]), int(stamp[15:17]), int(stamp[18:20]), 0, 0, 0
+    ))
+    zone = stamp[21:26]
+    if len(zone) == 5:
+        offset = int(zone[1:3]) * 3600 + int(zone[3:5]) * 60
+        seconds -= offset if zone[0] == "+" else -offset
+    return seconds
+
+
+def iter_registrations(path: str):
+    """Yield (hunt, email, ip, registered_at) from a SQLite database or JSON lines."""
+    with open(path, 'rb') as f:
+        is_sqlite = f.read(16) == SQLITE_HEADER
+
+    if is_sqlite:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            cursor = conn.execute("SELECT hunt, email, ip, registered_at FROM registrations")
+            while True:
+                rows = cursor.fetchmany(CHUNK_SIZE)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            conn.close()
+        return
+
+    with open_text(path) as f:
+        for line in f:
+            if not line.startswith("{"):
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            # Accept raw log records as well as saved backend responses
+            record = record.get("data", record) if isinstance(record, dict) else None
+            if not record or record.get("duplicate") or not record.get("hunt"):
+                continue
+            yield (record["hunt"], record.get("email") or "", record.get("ip"),
+                   record.get("registered_at"))
+
+
+class FunnelAnalyzer:
+    """Aggregate access logs, then registrations, into per-hunt stats."""
+
+    def __init__(self, pages: dict = None, difficulties: dict = None):
+        self.pages = pages or {}
+        self.difficulties = difficulties or {}
+        self.single_hunt = bool(self.difficulties) and not self.pages
+        self.stats = {}
+        # hash((hunt, ip)) -> first page view; the only per-visitor state kept
+        self.first_visit = {}
+        self.lines = Counter()
+        self.clf_times = {}
+        # Without configs: /api/ route -> POSTs, kept until registrations show which are hunts
+        self.unconfirmed = Counter()
+
+    def hunt_stats(self, hunt: str) -> HuntStats:
+        stats = self.stats.get(hunt)
+        if stats is None:
+            stats = self.stats[hunt] = HuntStats()
+        return stats
+
+    def page_hunt(self, path: str):
+        """Hunt a page path belongs to, or None for non-page requests."""
+        if self.single_hunt:
+            return next(iter(self.difficulties))
+        if self.pages:
+            return self.pages.get(path)
+        # Without configs, count anything that looks like a page
+        if path.endswith("/") or path.endswith(".html"):
+            return UNMAPPED
+        return None
+
+    def clf_time(self, stamp: str) -> int:
+        # Busy logs repeat each second many times over
+        seconds = self.clf_times.get(stamp)
+        if seconds is None:
+            if len(self.clf_times) > 100000:
+                self.clf_times.clear()
+            seconds = self.clf_times[stamp] = parse_clf_time(stamp)
+        return seconds
+
+    def ingest_access_log(self, path: str):
+        with open_text(path) as f:
+            for chunk in chunked(f):
+                views = Counter()
+                attempts = Counter()
+                for line in chunk:
+                    match = ACCESS_LOG_PATTERN.match(line)
+                    if not match:
+                        self.lines["skipped"] += 1
+                        continue
+                    ip, stamp, method, target, status = match.groups()
+                    path_only = target.split("?", 1)[0]
+                    if method == "POST":
+                        if path_only.startswith("/api/"):
+                            route = path_only[5:]
+                            if not self.difficulties:
+                                self.unconfirmed[route] += 1
+                            elif route in self.difficulties:
+                                attempts[route] += 1
+                            else:
+                                # Scanners probe /api/ paths no hunt serves
+                                self.lines["unmatched_api"] += 1
+                        continue
+                    if method != "GET" or status not in ("200", "304"):
+                        continue
+                    hunt = self.page_hunt(path_only)
+                    if hunt is None:
+                        continue
+                    try:
+                        seen_at = self.clf_time(stamp)
+                    except (KeyError, ValueError):
+                        self.lines["skipped"] += 1
+                        continue
+                    views[hunt] += 1
+                    self.hunt_stats(hunt).visitors.add(ip)
+                    key = hash((hunt, ip))
+                    first = self.first_visit.get(key)
+                    if first is None or seen_at < first:
+                        self.first_visit[key] = seen_at
+
+                for hunt, count in views.items():
+                    self.hunt_stats(hunt).views += count
+                for hunt, count in attempts.items():
+                    self.hunt_stats(hunt).attempts += count
+                self.lines["access"] += len(chunk)
+
+    def ingest_registrations(self, path: str):
+        for chunk in chunked(iter_registrations(path)):
+            solves = Counter()
+            for hunt, email, ip, registered_at in chunk:
+                solves[hunt] += 1
+                stats = self.hunt_stats(hunt)
+                stats.agents.add(str(email).strip().lower())
+                if not ip or not registered_at:
+                    continue
+                first = self.first_visit.get(hash((hunt, ip)))
+                if first is None:
+                    first = self.first_visit.get(hash((UNMAPPED, ip)))
+                if first is None:
+                    continue
+                try:
+                    elapsed = parse_iso(registered_at) - first
+                except (ValueError, IndexError):
+                    continue
+                if elapsed >= 0:
+                    stats.time_to_solve.add(elapsed)
+
+            for hunt, count in solves.items():
+                self.hunt_stats(hunt).solves += count
+            self.lines["registrations"] += len(chunk)
+
+    def report(self) -> dict:
+        stats = dict(self.stats)
+        lines = Counter(self.lines)
+        # Without configs, a route is a hunt only if something registered through it
+        for route, count in self.unconfirmed.items():
+            if route in stats and route != UNMAPPED:
+                stats[route].attempts += count
+            else:
+                lines["unmatched_api"] += count
+        # A lone hunt owns every page view even without a config
+        hunts = [hunt for hunt in stats if hunt != UNMAPPED]
+        if UNMAPPED in stats and len(hunts) == 1:
+            stats[hunts[0]].merge(stats.pop(UNMAPPED))
+
+        by_difficulty = {}
+        total = HuntStats()
+        for hunt, hunt_stats in stats.items():
+            if hunt == UNMAPPED:
+                continue
+            difficulty = self.difficulties.get(hunt, "unknown")
+            by_difficulty.setdefault(difficulty, HuntStats()).merge(hunt_stats)
+            total.merge(hunt_stats)
+
+        return {
+            "hunts": {hunt: s.to_dict() for hunt, s in sorted(stats.items())},
+            "difficulties": {d: s.to_dict() for d, s in sorted(by_difficulty.items())},
+            "total": total.to_dict(),
+            "lines": dict(lines),
+        }
+
+
+def format_duration(seconds) -> str:
+    if seconds is None:
+        return "-"
+    if seconds < 60:
+        return f"{seconds:.0f}s"
+    if seconds < 3600:
+        return f"{seconds / 60:.1f}m"
+    return f"{seconds / 3600:.1f}h"
+
+
+def print_table(title: str, rows: dict):
+    print(f"\n{title}")
+    print(f"{'':<28}{'Views':>9}{'Visitors':>10}{'Attempts':>10}{'Solves':>9}"
+          f"{'Agents':>9}{'Conv':>7}{'p50':>8}{'p90':>8}")
+    print("-" * 98)
+    for name, row in rows.items():
+        conversion = f"{row['conversion']:.0%}" if row["conversion"] is not None else "-"
+        print(f"{name[:27]:<28}{row['views']:>9}{row['unique_visitors']:>10}{row['attempts']:>10}"
+              f"{row['solves']:>9}{row['unique_agents']:>9}{conversion:>7}"
+              f"{format_duration(row['time_to_solve']['p50_s']):>8}"
+              f"{format_duration(row['time_to_solve']['p90_s']):>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Funnel analytics for hunt registrations and page visits")
+    parser.add_argument("--registrations", action="append", default=[],
+                        help="Registration log: SQLite database or JSON lines (repeatable)")
+    parser.add_argument("--access-log", action="append", default=[],
+                        help="Access log in Combined Log Format, optionally .gz (repeatable)")
+    parser.add_argument("--config", action="append", default=[],
+                        help="Hunt config file for difficulty/page mapping (repeatable)")
+    parser.add_argument("--config-dir", help="Campaign directory of hunt configs")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    start_profiling(args)
+
+    if not args.registrations and not args.access_log:
+        print("Error: pass at least one --registrations or --access-log file", file=sys.stderr)
+        sys.exit(1)
+
+    config_paths = list(args.config)
+    if args.config_dir:
+        # Skip the --precompress manifest: it is not a hunt config
+        config_paths.extend(str(p) for p in sorted(Path(args.config_dir).glob("*.json"))
+                            if p.name != MANIFEST_NAME)
+
+    for file_path in config_paths + args.registrations + args.access_log:
+        if not Path(file_path).exists():
+            print(f"✗ File not found: {file_path}", file=sys.stderr)
+            sys.exit(1)
+
+    analyzer = FunnelAnalyzer(*load_catalog(config_paths))
+    # Access logs first: time-to-solve needs each visitor's first page view
+    for file_path in args.access_log:
+        analyzer.ingest_access_log(file_path)
+    for file_path in args.registrations:
+        try:
+            analyzer.ingest_registrations(file_path)
+        except sqlite3.Error as e:
+            print(f"✗ Could not read {file_path}: {e}", file=sys.stderr)
+            sys.exit(1)
+
+    report = analyzer.report()
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    lines = report["lines"]
+    print(f"✓ Read {lines.get('access', 0)} access log lines and "
+          f"{lines.get('registrations', 0)} registrations")
+    if lines.get("skipped"):
+        print(f"⚠ Skipped {lines['skipped']} unparseable access log lines")
+    if lines.get("unmatched_api"):
+        print(f"⚠ Ignored {lines['unmatched_api']} POSTs to /api/ routes that are not hunts")
+    print_table("Per hunt", report["hunts"])
+    print_table("Per difficulty", report["difficulties"])
+    print_table("Total", {"all hunts": report["total"]})
+
+
+if __name__ == "__main__":
+    main()
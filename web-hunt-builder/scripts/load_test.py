@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Load test a hunt endpoint with a burst of concurrent registrations.
+
+Simulates the wave of agent registrations that follows a Moltbook post:
+many keep-alive connections firing `POST /api/{segment}/{path}` at once.
+
+Usage:
+    python scripts/load_test.py http://127.0.0.1:8000/api/agents/register
+    python scripts/load_test.py http://127.0.0.1:8000/api/agents/register --requests 20000 --concurrency 200
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import urllib.parse
+from collections import Counter
+
+from profiling import add_profile_arguments, start_profiling
+
+
+def percentile(values: list, fraction: float) -> float:
+    """Nearest-rank percentile of a sorted list."""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, int(round(fraction * len(values))) - 1))
+    return values[index]
+
+
+async def read_response(reader) -> tuple:
+    """Read one HTTP/1.1 response, returning (status, body)."""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("Connection closed by server")
+    status = int(status_line.split()[1])
+
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value.strip())
+    body = await reader.readexactly(length) if length else b""
+    return status, body
+
+
+def classify(status, body: bytes) -> str:
+    """Outcome label: the status code, `duplicate` for idempotent repeats, or
+    `429 ip` / `429 email` naming the limiter that throttled the request."""
+    if status == 200 and b'"duplicate"' in body:
+        try:
+            if json.loads(body.decode("utf-8")).get("duplicate"):
+                return "duplicate"
+        except (ValueError, AttributeError):
+            pass
+    if status == 429:
+        try:
+            limit = json.loads(body.decode("utf-8")).get("limit")
+        except (ValueError, AttributeError):
+            limit = None
+        return f"429 {limit}" if limit in ("ip", "email") else "429"
+    return str(status)
+
+
+async def worker(url, requests, payload_for, results):
+    """Send requests over one keep-alive connection, reconnecting if needed."""
+    host, port, path = url.hostname, url.port or 80, url.path or "/"
+    reader = writer = None
+
+    for i in requests:
+        body = json.dumps(payload_for(i)).encode("utf-8")
+        head = (
+            f"POST {path} HTTP/1.1\r\n"
+            f"Host: {url.netloc}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "\r\n"
+        ).encode("latin-1")
+
+        start = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            writer.write(head + body)
+            await writer.drain()
+            status = classify(*await read_response(reader))
+        except (ConnectionError, asyncio.IncompleteReadError, OSError, ValueError):
+            status = "error"
+            if writer is not None:
+                writer.close()
+            reader = writer = None
+        results.append((status, time.perf_counter() - start))
+
+    if writer is not None:
+        writer.close()
+
+
+async def run_load_test(endpoint: str, total: int = 5000, concurrency: int = 100,
+                        unique_emails: int = None) -> dict:
+    """Fire `total` registrations across `concurrency` connections."""
+    url = urllib.parse.urlsplit(endpoint)
+    if url.scheme != "http":
+        raise ValueError("Only plain http:// endpoints are supported")
+
+    unique_emails = unique_emails or total
+
+    def payload_for(i):
+        n = i % unique_emails
+        return {"email": f"agent{n}@example.com", "name": f"LoadAgent{n}"}
+
+    results = []
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        worker(url, range(c, total, concurrency), payload_for, results)
+        for c in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for _, latency in results)
+    status_counts = Counter(status for status, _ in results)
+    return {
+        "requests": len(results),
+        "concurrency": concurrency,
+        "seconds": elapsed,
+        "requests_per_second": len(results) / elapsed if elapsed else 0.0,
+        "status_counts": dict(status_counts),
+        # Each email can register once; more fresh 200s mean the backend's dedupe let repeats through
+        "unflagged_repeats": max(0, status_counts["200"] - unique_emails) if unique_emails < total else 0,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "max_ms": (latencies[-1] if latencies else 0.0) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test a hunt registration endpoint")
+    parser.add_argument("endpoint", help="Endpoint URL (e.g., http://127.0.0.1:8000/api/agents/register)")
+    parser.add_argument("--requests", type=int, default=5000, help="Total requests (default: 5000)")
+    parser.add_argument("--concurrency", type=int, default=100, help="Concurrent connections (default: 100)")
+    parser.add_argument("--unique-emails", type=int,
+                       help="Cycle through this many distinct emails (default: one per request)")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    start_profiling(args)
+
+    try:
+        report = asyncio.run(run_load_test(
+            args.endpoint, args.requests, args.concurrency, args.unique_emails
+        ))
+    except ValueError as e:
+        print(f"✗ {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"✓ {report['requests']} requests over {report['concurrency']} connections "
+          f"in {report['seconds']:.2f}s")
+    print(f"  Throughput: {report['requests_per_second']:.0f} req/s")
+    print(f"  Latency: p50 {report['p50_ms']:.1f}ms • p95 {report['p95_ms']:.1f}ms • "
+          f"p99 {report['p99_ms']:.1f}ms • max {report['max_ms']:.1f}ms")
+    statuses = ", ".join(f"{status}: {count}" for status, count in sorted(report["status_counts"].items()))
+    print(f"  Outcomes: {statuses}")
+    counts = report["status_counts"]
+    if "429 ip" in counts:
+        print("  ⚠ Throttled per IP - raise --ip-limit on the backend for load tests from one host")
+    if "429 email" in counts:
+        print("  ⚠ Throttled per email - raise --email-limit on the backend, or send more --unique-emails")
+    if "429" in counts:
+        print("  ⚠ Throttled responses - raise --ip-limit and --email-limit on the backend")
+    if report["unflagged_repeats"]:
+        print(f"  ⚠ {report['unflagged_repeats']} repeat registrations were not flagged duplicate - "
+              f"the backend's seen set misses re-added emails (or it runs with --dedupe off)")
+
+
+if __name__ == "__main__":
+    main()
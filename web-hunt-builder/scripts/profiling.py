@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Profiling flags shared by every script (`--profile-cpu`, `--profile-mem`).
+
+    --profile-cpu FILE    sample every thread's stack and write collapsed
+                          stacks (`frame;frame;frame count`), ready for
+                          flamegraph.pl, speedscope or inferno. A FILE ending
+                          in .prof or .pstats gets a cProfile dump instead
+                          (open with `python -m pstats FILE` or snakeviz).
+    --profile-mem FILE    trace allocations with tracemalloc and write the
+                          top allocation sites and tracebacks at exit
+
+Samples are wall-clock, so time spent waiting on the network shows up as
+well as CPU time. With neither flag nothing is started and the scripts
+run exactly as before. Reports are written at exit, including after
+Ctrl-C or sys.exit().
+"""
+
+import atexit
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+SAMPLE_INTERVAL = 0.005
+MEM_FRAMES = 25
+TOP_ALLOCATIONS = 30
+TOP_TRACEBACKS = 5
+
+
+def add_profile_arguments(parser):
+    group = parser.add_argument_group("profiling")
+    group.add_argument("--profile-cpu", metavar="FILE",
+                       help="Write a CPU profile: collapsed stacks, or cProfile stats for .prof/.pstats")
+    group.add_argument("--profile-mem", metavar="FILE",
+                       help="Write a tracemalloc report of the top allocations")
+
+
+def frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Statistical profiler: a thread that samples all other threads' stacks."""
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def _run(self):
+        own = threading.get_ident()
+        labels = {}
+        while not self.stopped.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    label = labels.get(code)
+                    if label is None:
+                        label = labels[code] = frame_label(code)
+                    stack.append(label)
+                    frame = frame.f_back
+                stack.append(names.get(ident, "thread"))
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+
+    def write(self, path: str):
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class CpuProfile:
+    def __init__(self, path: str):
+        self.path = path
+        self.sampler = None
+        self.profile = None
+        self.started = time.perf_counter()
+
+    def start(self):
+        if self.path.endswith((".prof", ".pstats")):
+            import cProfile
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+        else:
+            self.sampler = StackSampler()
+            self.sampler.start()
+
+    def stop(self):
+        elapsed = time.perf_counter() - self.started
+        if self.profile is not None:
+            self.profile.disable()
+            self.profile.dump_stats(self.path)
+            print(f"✓ cProfile stats written to {self.path} ({elapsed:.1f}s)", file=sys.stderr)
+        else:
+            self.sampler.stop()
+            self.sampler.write(self.path)
+            print(f"✓ CPU profile written to {self.path} ({self.sampler.samples} samples over "
+                  f"{elapsed:.1f}s, {len(self.sampler.stacks)} distinct stacks)", file=sys.stderr)
+
+
+class MemProfile:
+    def __init__(self, path: str):
+        self.path = path
+
+    def start(self):
+        import tracemalloc
+        tracemalloc.start(MEM_FRAMES)
+
+    def stop(self):
+        import tracemalloc
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ))
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        lines = [
+            f"Traced memory at exit: {current / 1024:,.1f} KiB (peak {peak / 1024:,.1f} KiB)",
+            "",
+            f"Top {TOP_ALLOCATIONS} allocation sites (live at exit):",
+        ]
+        for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+            frame = stat.traceback[0]
+            lines.append(f"{stat.size / 1024:10,.1f} KiB {stat.count:8,d} blocks  {frame.filename}:{frame.lineno}")
+        lines += ["", f"Top {TOP_TRACEBACKS} allocation tracebacks:"]
+        for stat in snapshot.statistics("traceback")[:TOP_TRACEBACKS]:
+            lines.append(f"\n{stat.size / 1024:,.1f} KiB in {stat.count:,d} blocks")
+            lines.extend(f"  {line}" for line in stat.traceback.format(most_recent_first=True))
+
+        with open(self.path, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        print(f"✓ Memory profile written to {self.path} (peak {peak / 1024 / 1024:.1f} MiB)", file=sys.stderr)
+
+
+def start_profiling(args):
+    """Start whichever profilers `args` asks for; reports are written at exit."""
+    profilers = []
+    if getattr(args, "profile_mem", None):
+        profilers.append(MemProfile(args.profile_mem))
+    if getattr(args, "profile_cpu", None):
+        profilers.append(CpuProfile(args.profile_cpu))
+    for profiler in profilers:
+        profiler.start()
+    for profiler in profilers:
+        # atexit runs last-in first-out: stop the CPU profiler before the memory snapshot
+        atexit.register(profiler.stop)
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Reference agent solver - reconstruct a hunt endpoint from page source.
+
+Reads the hunt page the way an agent would (raw source, not rendered HTML),
+pieces the clues together, decodes base64-encoded clues, and optionally
+calls the reconstructed endpoint.
+
+Usage:
+    python scripts/solve_hunt.py hunt.html --base-url https://example.com
+    python scripts/solve_hunt.py http://localhost:8000/ --submit
+"""
+
+import argparse
+import base64
+import binascii
+import json
+import re
+import sys
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from pathlib import Path
+
+from profiling import add_profile_arguments, start_profiling
+
+
+READ_CHUNK_SIZE = 16 * 1024
+
+JS_ENDPOINT_PATTERN = re.compile(
+    r'//[^\n]*?Complete endpoint[^\n]*?:\s*(POST|GET)\s+(https?://[^\s<>"\']+)'
+)
+API_COMMENT_PATTERN = re.compile(r'<!--\s*(/api/)\s*-->')
+META_SEGMENT_PATTERN = re.compile(
+    r'<meta\s+name=["\']route-segment["\']\s+content=["\']([^"\']+)["\']'
+)
+CSS_PATH_PATTERN = re.compile(r'--final-path:\s*([^;]+);')
+PATTERN_ATTRIBUTE = re.compile(r'data-endpoint-pattern=["\']([^"\']+)["\']')
+BASE64_CLUE_PATTERN = re.compile(r'base64:\s*([A-Za-z0-9+/=_-]+)', re.IGNORECASE)
+SLUG_PATTERN = re.compile(r'^[A-Za-z0-9._~-]+$')
+
+
+def decode_clue(value: str) -> tuple:
+    """Decode a clue value, returning (decoded, encoding).
+
+    Recognises the explicit `base64: ...` marker used by hard mode as well as
+    bare base64 that decodes to a URL-safe slug.
+    """
+    value = value.strip()
+    marker = BASE64_CLUE_PATTERN.search(value)
+    candidate = marker.group(1) if marker else value
+
+    if marker or (len(candidate) % 4 == 0 and candidate.endswith('=')):
+        try:
+            decoded = base64.b64decode(candidate, validate=True).decode('utf-8')
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            decoded = None
+        if decoded and SLUG_PATTERN.match(decoded):
+            return decoded, "base64"
+
+    return value, None
+
+
+def read_source(source: str, timeout: int = 10) -> tuple:
+    """Read page source from a URL or file, returning (html, bytes_read)."""
+    if source.startswith(('http://', 'https://')):
+        req = urllib.request.Request(source, headers={"User-Agent": "hunt-solver"})
+        chunks = []
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            while True:
+                chunk = response.read(READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        raw = b"".join(chunks)
+    else:
+        with open(source, 'rb') as f:
+            raw = f.read()
+
+    return raw.decode('utf-8', errors='replace'), len(raw)
+
+
+class AgentSolver:
+    """Reconstruct and optionally call a hunt endpoint from page source."""
+
+    def __init__(self, timeout: int = 10, email: str = "solver@example.com", name: str = "HuntSolver",
+                 use_spoiler: bool = True):
+        self.timeout = timeout
+        self.email = email
+        self.name = name
+        self.use_spoiler = use_spoiler
+
+    def reconstruct(self, html: str, base_url: str = None) -> dict:
+        """Build the endpoint from clues; base_url fills in for pages without one."""
+        steps = []
+
+        # Agents take the spoiler first when one is present
+        match = JS_ENDPOINT_PATTERN.search(html) if self.use_spoiler else None
+        if match:
+            steps.append("js_comment")
+            return {
+                "method": match.group(1),
+                "endpoint": match.group(2).rstrip('.,;'),
+                "steps": steps,
+            }
+
+        api = API_COMMENT_PATTERN.search(html)
+        segment = META_SEGMENT_PATTERN.search(html)
+        css_path = CSS_PATH_PATTERN.search(html)
+        if api:
+            steps.append("html_comment")
+        if segment:
+            steps.append("meta_tag")
+        if css_path:
+            steps.append("css_variable")
+        if PATTERN_ATTRIBUTE.search(html):
+            steps.append("data_attribute")
+
+        if not (api and segment and css_path):
+            return {"method": None, "endpoint": None, "steps": steps}
+
+        path, encoding = decode_clue(css_path.group(1))
+        if encoding:
+            steps.append(f"{encoding}_decode")
+
+        base = (base_url or "").rstrip('/')
+        endpoint = f"{base}{api.group(1)}{segment.group(1).strip()}/{path}"
+        return {"method": "POST", "endpoint": endpoint, "steps": steps}
+
+    def submit(self, endpoint: str) -> tuple:
+        """POST a registration to the endpoint, returning (success, bytes_read)."""
+        payload = json.dumps({"email": self.email, "name": self.name}).encode('utf-8')
+        req = urllib.request.Request(
+            endpoint,
+            data=payload,
+            headers={"Content-Type": "application/json", "User-Agent": "hunt-solver"}
+        )
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as response:
+                body = response.read()
+        except urllib.error.HTTPError as e:
+            return False, len(e.read())
+        except urllib.error.URLError:
+            return False, 0
+
+        try:
+            success = bool(json.loads(body.decode('utf-8')).get('success'))
+        except (ValueError, AttributeError):
+            success = False
+        return success, len(body)
+
+    def solve(self, source: str, base_url: str = None, submit: bool = False) -> dict:
+        """Read a page, reconstruct its endpoint and optionally submit to it."""
+        start = time.perf_counter()
+        html, bytes_read = read_source(source, self.timeout)
+
+        if base_url is None and source.startswith(('http://', 'https://')):
+            parts = urllib.parse.urlsplit(source)
+            base_url = f"{parts.scheme}://{parts.netloc}"
+
+        result = self.reconstruct(html, base_url)
+        result["bytes_read"] = bytes_read
+        result["success"] = result["endpoint"] is not None
+
+        if submit and result["endpoint"]:
+            success, response_bytes = self.submit(result["endpoint"])
+            result["success"] = success
+            result["bytes_read"] += response_bytes
+
+        result["seconds"] = time.perf_counter() - start
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve a web hunt page like an agent would")
+    parser.add_argument("source", help="Hunt page file path or URL")
+    parser.add_argument("--base-url", help="Base URL for pages that don't include one")
+    parser.add_argument("--submit", action="store_true", help="POST a registration to the endpoint")
+    parser.add_argument("--email", default="solver@example.com", help="Email used when submitting")
+    parser.add_argument("--no-spoiler", action="store_true",
+                        help="Ignore the JS endpoint comment and follow the clue chain")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    start_profiling(args)
+
+    if not args.source.startswith(('http://', 'https://')) and not Path(args.source).exists():
+        print(f"✗ File not found: {args.source}", file=sys.stderr)
+        sys.exit(1)
+
+    solver = AgentSolver(email=args.email, use_spoiler=not args.no_spoiler)
+    result = solver.solve(args.source, args.base_url, args.submit)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    elif result["endpoint"]:
+        print(f"✓ Endpoint: {result['method']} {result['endpoint']}")
+        print(f"  Clues used: {', '.join(result['steps'])}")
+        print(f"  Bytes read: {result['bytes_read']}")
+        print(f"  Time: {result['seconds'] * 1000:.1f}ms")
+        if args.submit:
+            print(f"  Submission: {'✓ accepted' if result['success'] else '✗ rejected'}")
+    else:
+        print(f"✗ Could not reconstruct endpoint (clues found: {', '.join(result['steps']) or 'none'})")
+
+    if not result["success"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
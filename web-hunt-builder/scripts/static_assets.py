@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Precompressed, fingerprinted static output for hunt and solution pages.
+
+Writes a minified page plus `.gz` (and `.br` when the optional `brotli`
+package is installed) variants, and records content hashes/ETags in an
+`assets.json` manifest next to the page. Backends serve a `.gz`/`.br`
+file only when the manifest records it for the page's current sha256, so
+a page regenerated without --precompress never gets stale compressed
+bodies. Minification never touches HTML
+comments, <pre>/<textarea> blocks or script line structure, and the result
+is re-checked with the solver's clue patterns before it is kept.
+
+Usage:
+    python scripts/static_assets.py hunt.html solution.html
+    python scripts/static_assets.py hunt.html --no-minify
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import re
+import sys
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from profiling import add_profile_arguments, start_profiling
+from solve_hunt import (
+    API_COMMENT_PATTERN,
+    CSS_PATH_PATTERN,
+    JS_ENDPOINT_PATTERN,
+    META_SEGMENT_PATTERN,
+    PATTERN_ATTRIBUTE,
+    decode_clue,
+)
+
+
+MANIFEST_NAME = "assets.json"
+# Encoding -> variant file suffix; the manifest records each as `<encoding>_size`
+VARIANT_SUFFIXES = {"gzip": ".gz", "br": ".br"}
+
+RAW_BLOCK_PATTERN = re.compile(
+    r'(<!--.*?-->|<pre\b.*?</pre>|<textarea\b.*?</textarea>|<script\b.*?</script>|<style\b.*?</style>)',
+    re.DOTALL | re.IGNORECASE
+)
+
+
+def content_etag(data: bytes) -> str:
+    """Strong ETag derived from the content hash."""
+    return '"' + hashlib.sha256(data).hexdigest()[:16] + '"'
+
+
+def minify_script(block: str) -> str:
+    # Keep line breaks: `//` comments (and clues) end at the newline
+    lines = (line.strip() for line in block.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def minify_style(block: str) -> str:
+    block = re.sub(r'\s+', ' ', block)
+    return re.sub(r'\s*([{;}])\s*', r'\1', block)
+
+
+def minify_html(html: str) -> str:
+    """Collapse insignificant whitespace while leaving clue carriers intact."""
+    parts = []
+    for i, part in enumerate(RAW_BLOCK_PATTERN.split(html)):
+        if i % 2:
+            lowered = part[:9].lower()
+            if lowered.startswith('<script'):
+                part = minify_script(part)
+            elif lowered.startswith('<style'):
+                part = minify_style(part)
+        else:
+            part = re.sub(r'>\s+<', '><', re.sub(r'\s+', ' ', part))
+            # Raw blocks start with '<' and end with '>', so edge spaces sit between tags
+            if part.startswith(' <') or not part.strip():
+                part = part.lstrip()
+            if part.endswith('> '):
+                part = part.rstrip()
+        parts.append(part)
+    return "".join(parts).strip() + "\n"
+
+
+def extract_clues(html: str) -> tuple:
+    """Every clue value an agent could read from the page."""
+    values = []
+    for pattern in (JS_ENDPOINT_PATTERN, API_COMMENT_PATTERN, META_SEGMENT_PATTERN, PATTERN_ATTRIBUTE):
+        match = pattern.search(html)
+        values.append(match.groups() if match else None)
+    css_path = CSS_PATH_PATTERN.search(html)
+    values.append(decode_clue(css_path.group(1))[0] if css_path else None)
+    return tuple(values)
+
+
+def clues_preserved(original: str, minified: str) -> bool:
+    """Check the minified page carries exactly the same clues."""
+    return extract_clues(original) == extract_clues(minified)
+
+
+def update_manifest(directory: Path, name: str, entry: dict):
+    """Merge one asset entry into the directory's manifest."""
+    manifest_path = directory / MANIFEST_NAME
+    manifest = {}
+    if manifest_path.exists():
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+    manifest[name] = entry
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+def read_variants(page_path, data: bytes) -> dict:
+    """Precompressed variants of a page that its manifest entry vouches for.
+
+    A variant counts only if the entry's sha256 is that of `data` and the
+    file has the size recorded for it; anything else is stale.
+    """
+    page_path = Path(page_path)
+    try:
+        with open(page_path.parent / MANIFEST_NAME, 'r') as f:
+            entry = json.load(f).get(page_path.name) or {}
+    except (OSError, ValueError):
+        return {}
+    if entry.get("sha256") != hashlib.sha256(data).hexdigest():
+        return {}
+    variants = {}
+    for encoding, suffix in VARIANT_SUFFIXES.items():
+        variant = Path(f"{page_path}{suffix}")
+        if variant.exists() and variant.stat().st_size == entry.get(f"{encoding}_size"):
+            variants[encoding] = variant.read_bytes()
+    return variants
+
+
+def write_static_assets(html: str, output_path: str, minify: bool = True) -> dict:
+    """Write the page with precompressed variants and return its manifest entry."""
+    output = Path(output_path)
+
+    if minify:
+        minified = minify_html(html)
+        if clues_preserved(html, minified):
+            html = minified
+        else:
+            print("⚠ Minification changed the clues; writing the page unminified", file=sys.stderr)
+            minify = False
+
+    data = html.encode('utf-8')
+    output.write_bytes(data)
+
+    entry = {
+        "etag": content_etag(data),
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "size": len(data),
+        "minified": minify,
+    }
+
+    # mtime=0 keeps the .gz byte-identical across rebuilds of the same page
+    gz_data = gzip.compress(data, compresslevel=9, mtime=0)
+    Path(f"{output}.gz").write_bytes(gz_data)
+    entry["gzip_size"] = len(gz_data)
+
+    if brotli is not None:
+        br_data = brotli.compress(data, mode=brotli.MODE_TEXT, quality=11)
+        Path(f"{output}.br").write_bytes(br_data)
+        entry["br_size"] = len(br_data)
+    elif Path(f"{output}.br").exists():
+        # Left from a build with brotli: it no longer matches the page
+        Path(f"{output}.br").unlink()
+
+    update_manifest(output.parent, output.name, entry)
+    return entry
+
+
+def print_asset_summary(output_path: str, entry: dict):
+    """Print sizes for a written asset."""
+    print(f"✓ Precompressed: {output_path} ({entry['size']} bytes, ETag {entry['etag']})")
+    print(f"  gzip: {entry['gzip_size']} bytes")
+    if "br_size" in entry:
+        print(f"  brotli: {entry['br_size']} bytes")
+    else:
+        print("  brotli: skipped (pip install brotli to enable)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompress and fingerprint hunt/solution pages")
+    parser.add_argument("files", nargs="+", help="HTML files to process in place")
+    parser.add_argument("--no-minify", action="store_true", help="Keep the HTML as-is")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    start_profiling(args)
+
+    for file_path in args.files:
+        if not Path(file_path).exists():
+            print(f"✗ File not found: {file_path}", file=sys.stderr)
+            sys.exit(1)
+        with open(file_path, 'r') as f:
+            html = f.read()
+        entry = write_static_assets(html, file_path, minify=not args.no_minify)
+        print_asset_summary(file_path, entry)
+
+
+if __name__ == "__main__":
+    main()
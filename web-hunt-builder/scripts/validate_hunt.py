@@ -12,6 +12,9 @@ import re
 import sys
 from pathlib import Path
 
+from profiling import add_profile_arguments, start_profiling
+from solve_hunt import decode_clue
+
 
 class HuntValidator:
     def __init__(self, html_path: str):
@@ -63,8 +66,12 @@ class HuntValidator:
         pattern = r'--final-path:\s*([^;]+);'
         match = re.search(pattern, self.html)
         if match:
-            self.clues_found['css_variable'] = match.group(1).strip()
-            print(f"✓ CSS variable clue found: {match.group(1).strip()}")
+            value, encoding = decode_clue(match.group(1))
+            self.clues_found['css_variable'] = value
+            if encoding:
+                print(f"✓ CSS variable clue found: {value} (decoded from {encoding})")
+            else:
+                print(f"✓ CSS variable clue found: {value}")
         else:
             self.issues.append("Missing CSS variable clue (--final-path)")
             print("✗ CSS variable clue missing")
@@ -158,7 +165,9 @@ def main():
     parser = argparse.ArgumentParser(description="Validate web hunt page")
     parser.add_argument("html_file", help="Path to hunt HTML file")
     parser.add_argument("--expected-endpoint", help="Expected endpoint for verification")
+    add_profile_arguments(parser)
     args = parser.parse_args()
+    start_profiling(args)
     
     if not Path(args.html_file).exists():
         print(f"✗ File not found: {args.html_file}", file=sys.stderr)